@@ -1,10 +1,34 @@
-from .models import Base, DayLog, MentorshipSession, init_db, get_db, get_engine
+from .models import (
+    Base,
+    DayLog,
+    MentorshipSession,
+    DayTotal,
+    DayCategoryTotal,
+    AppliedOperation,
+    init_db,
+    get_db,
+    get_engine,
+    configure_engine,
+    default_url,
+    dispose_engine,
+    session_scope
+)
 from .crud import (
+    DaySummary,
     get_day_log,
     create_day_log,
     update_day_log_notes,
     add_mentorship_session,
+    add_mentorship_sessions_bulk,
     get_sessions_for_day,
+    get_range_summary,
+    get_month_summary,
     delete_session,
+    delete_sessions_bulk,
     update_mentorship_session
 )
+from .cache import LRUCache, month_cache
+from .rollup import rebuild_day_totals, check_day_totals
+from .migrations import MIGRATIONS, SCHEMA_VERSION, current_version, migrate
+from .search import SEARCH_PAGE_SIZE, SearchResult, search
+from .journal import FailedEntry, Journal, JournalEntry, configure_journal, get_journal
@@ -0,0 +1,141 @@
+"""
+Async database access for the Daily Planner App.
+
+Provides a process-wide AsyncEngine and awaitable versions of the CRUD and
+search functions, for use from Flet's event loop. Each async function runs
+its synchronous counterpart through AsyncSession.run_sync(), so the rollup,
+cache and validation logic is shared while the database I/O is awaited
+instead of blocking the loop.
+
+PostgreSQL URLs use the asyncpg driver and SQLite URLs use aiosqlite.
+"""
+from contextlib import asynccontextmanager
+from functools import wraps
+from typing import AsyncIterator, Callable
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from . import crud
+from .search import search as _search
+from .models import _engine_options, get_engine, install_connection_hooks
+
+# Async DBAPI driver per database backend
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+def async_url(url) -> URL:
+    """
+    Rewrites a database URL to use the backend's async driver.
+
+    Args:
+        url (str | URL): A database URL, e.g. "postgresql://..." or "sqlite:///planner.db".
+
+    Returns:
+        URL: The same URL with the async driver, e.g. "postgresql+asyncpg://...".
+
+    Raises:
+        ValueError: If there is no async driver for the backend.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases.")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+def configure_async_engine(url=None, **options) -> AsyncEngine:
+    """
+    Creates the process-wide async engine.
+
+    An existing async engine is replaced without closing its connections;
+    await dispose_async_engine() first to close them.
+
+    Args:
+        url (str | URL, optional): The database URL. Defaults to the URL of the
+                                   synchronous engine.
+        **options: Extra create_async_engine arguments, overriding the pool defaults.
+
+    Returns:
+        AsyncEngine: The newly configured engine.
+
+    Raises:
+        ValueError: If the backend has no async driver.
+    """
+    global _async_engine, _AsyncSessionLocal
+    url = async_url(url or get_engine().url)
+    if _async_engine is not None:
+        _async_engine.sync_engine.dispose(close=False)
+    _async_engine = create_async_engine(url, **{**_engine_options(url), **options})
+    install_connection_hooks(_async_engine.sync_engine)
+    # Objects stay usable after commit; reloading them would need awaited I/O
+    _AsyncSessionLocal = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Returns the process-wide async engine, creating it on first use.
+
+    Returns:
+        AsyncEngine: The async engine.
+    """
+    if _async_engine is None:
+        configure_async_engine()
+    return _async_engine
+
+async def dispose_async_engine():
+    """
+    Closes all pooled async connections and forgets the async engine.
+    """
+    global _async_engine, _AsyncSessionLocal
+    engine, _async_engine, _AsyncSessionLocal = _async_engine, None, None
+    if engine is not None:
+        await engine.dispose()
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    Async context manager that provides a pooled AsyncSession.
+
+    Like session_scope(), the session is rolled back if the block raises and
+    is always closed on exit.
+
+    Yields:
+        AsyncSession: SQLAlchemy async session.
+    """
+    get_async_engine()
+    db = _AsyncSessionLocal()
+    try:
+        yield db
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+def _awaitable(fn: Callable) -> Callable:
+    """
+    Wraps a function taking a Session as first argument into a coroutine
+    function taking an AsyncSession.
+    """
+    @wraps(fn)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(fn, *args, **kwargs)
+
+    wrapper.__doc__ = f"Awaitable version of {fn.__module__}.{fn.__name__}(); takes an AsyncSession.\n\n{fn.__doc__}"
+    return wrapper
+
+get_day_log = _awaitable(crud.get_day_log)
+create_day_log = _awaitable(crud.create_day_log)
+update_day_log_notes = _awaitable(crud.update_day_log_notes)
+add_mentorship_session = _awaitable(crud.add_mentorship_session)
+add_mentorship_sessions_bulk = _awaitable(crud.add_mentorship_sessions_bulk)
+get_sessions_for_day = _awaitable(crud.get_sessions_for_day)
+get_range_summary = _awaitable(crud.get_range_summary)
+get_month_summary = _awaitable(crud.get_month_summary)
+delete_session = _awaitable(crud.delete_session)
+delete_sessions_bulk = _awaitable(crud.delete_sessions_bulk)
+update_mentorship_session = _awaitable(crud.update_mentorship_session)
+search = _awaitable(_search)
@@ -0,0 +1,118 @@
+"""
+In-memory caching for the Daily Planner App.
+
+Holds a bounded LRU cache of calendar month summaries. Entries are
+invalidated by the CRUD write functions, so repeated month navigation
+does not re-query the database.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+MONTH_CACHE_SIZE = int(os.getenv("MONTH_CACHE_SIZE", "24"))
+
+class LRUCache:
+    """
+    A thread-safe, size-bounded least-recently-used cache with hit/miss counters.
+
+    Writers bump a generation token on invalidation; a value computed from a
+    read that started before the invalidation is discarded by put().
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that were not cached.
+    """
+    def __init__(self, maxsize: int = MONTH_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def token(self) -> int:
+        """
+        Returns the current generation, to be passed to put() after a read.
+
+        Returns:
+            int: The generation counter.
+        """
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Looks up a key, marking it as most recently used.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Optional[Any]: The cached value, or None on a miss.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, token: int = None):
+        """
+        Stores a value, evicting the least recently used entry when full.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to store.
+            token (int, optional): Generation from token() taken before the value
+                                   was read. If a write has happened since, the
+                                   value is stale and is not stored.
+        """
+        with self._lock:
+            if token is not None and token != self._generation:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """
+        Removes a single key from the cache.
+
+        Args:
+            key (Hashable): The cache key.
+        """
+        with self._lock:
+            self._generation += 1
+            self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Removes every entry and resets the hit/miss counters.
+        """
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: hits, misses, current size and maxsize.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+# Per-process cache of get_month_summary results, keyed by (year, month)
+month_cache = LRUCache()
@@ -3,23 +3,198 @@ CRUD operations for the Daily Planner App.
 
 Functions to Create, Read, Update, and Delete DayLogs and MentorshipSessions.
 """
+import calendar
 from datetime import date
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from .models import DayLog, MentorshipSession
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session, defer, selectinload
+from .models import DayLog, MentorshipSession, DayTotal, DayCategoryTotal
+from .cache import month_cache
+from .rollup import apply_deltas, dialect_insert, session_deltas
 
-def get_day_log(db: Session, log_date: date) -> Optional[DayLog]:
+class DaySummary(NamedTuple):
+    """
+    Aggregated totals for a single logged day.
+
+    Attributes:
+        session_count (int): Number of sessions logged on the day.
+        total_minutes (int): Combined duration of those sessions in minutes.
+    """
+    session_count: int
+    total_minutes: int
+
+def _invalidate_month(log_date: date):
+    """
+    Drops the cached month summary that contains the given date.
+
+    Args:
+        log_date (date): A date whose month's data has changed.
+    """
+    month_cache.invalidate((log_date.year, log_date.month))
+
+def _invalidate_months(dates: Iterable[date]):
+    """
+    Drops the cached month summaries for every month touched by the given dates.
+
+    Args:
+        dates (Iterable[date]): Dates whose months' data have changed.
+    """
+    for year, month in {(d.year, d.month) for d in dates}:
+        month_cache.invalidate((year, month))
+
+def _months_between(start_date: date, end_date: date) -> List[date]:
+    """
+    Returns the first day of every month from start_date to end_date.
+
+    Args:
+        start_date (date): The first date of the range.
+        end_date (date): The last date of the range (inclusive).
+
+    Returns:
+        List[date]: One date per month in the range.
+    """
+    months = []
+    current = start_date.replace(day=1)
+    while current <= end_date:
+        months.append(current)
+        current = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+    return months
+
+# Maximum number of values bound into a single IN (...) list
+BULK_CHUNK_SIZE = 500
+
+def _chunks(items: list, size: int = BULK_CHUNK_SIZE):
+    """
+    Yields successive slices of at most size items.
+    """
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _ensure_day_logs(db: Session, dates: Iterable[date]) -> Dict[date, int]:
+    """
+    Makes sure a DayLog exists for each date and returns their ids.
+
+    Missing logs are created with one INSERT ... ON CONFLICT DO NOTHING on
+    PostgreSQL and SQLite; other databases insert only the dates not found.
+    Does not commit.
+
+    Args:
+        db (Session): The database session.
+        dates (Iterable[date]): The dates that need a DayLog.
+
+    Returns:
+        Dict[date, int]: A mapping of date to DayLog id.
+    """
+    dates = sorted(set(dates))
+    if not dates:
+        return {}
+
+    stmt = dialect_insert(db, DayLog)
+    if stmt is not None:
+        db.execute(
+            stmt.on_conflict_do_nothing(index_elements=[DayLog.date]),
+            [{"date": d} for d in dates]
+        )
+        ids = {}
+    else:
+        ids = _day_log_ids(db, dates)
+        missing = [{"date": d} for d in dates if d not in ids]
+        if missing:
+            db.execute(insert(DayLog), missing)
+    ids.update(_day_log_ids(db, [d for d in dates if d not in ids]))
+    return ids
+
+def _day_log_id(db: Session, log_date: date) -> int:
+    """
+    Returns the id of the DayLog for a date, creating it if needed.
+
+    Safe against concurrent writers creating the same day: on PostgreSQL
+    and SQLite the insert is INSERT ... ON CONFLICT DO NOTHING RETURNING id,
+    and a lost race falls back to reading the winner's row. Does not commit.
+
+    Args:
+        db (Session): The database session.
+        log_date (date): The date that needs a DayLog.
+
+    Returns:
+        int: The DayLog id.
+    """
+    day_log_id = db.scalar(select(DayLog.id).where(DayLog.date == log_date))
+    if day_log_id is not None:
+        return day_log_id
+    stmt = dialect_insert(db, DayLog)
+    if stmt is None:
+        return _ensure_day_logs(db, [log_date])[log_date]
+    day_log_id = db.scalar(
+        stmt.values(date=log_date).on_conflict_do_nothing(index_elements=[DayLog.date]).returning(DayLog.id)
+    )
+    if day_log_id is None:
+        # Created by another writer since the first lookup
+        day_log_id = db.scalar(select(DayLog.id).where(DayLog.date == log_date))
+    return day_log_id
+
+def _commit_detached(db: Session, instance):
+    """
+    Commits the session and returns instance detached, with the values written.
+
+    Detaching before the commit keeps the attributes loaded, so callers can
+    read the result without the SELECT that refresh() or an expired
+    attribute would cost.
+    """
+    try:
+        db.flush()
+        db.expunge(instance)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return instance
+
+def _duration(hours: int, minutes: int) -> dict:
+    """
+    Returns the duration columns for a session, treating missing parts as zero.
+
+    duration_total_minutes is canonical; the hours/minutes split is kept
+    normalised so minutes stay below 60.
+
+    Raises:
+        ValueError: If the duration is negative.
+    """
+    total = (hours or 0) * 60 + (minutes or 0)
+    if total < 0:
+        raise ValueError("Session duration cannot be negative.")
+    hours, minutes = divmod(total, 60)
+    return {"duration_total_minutes": total, "duration_hours": hours, "duration_minutes": minutes}
+
+def _day_log_ids(db: Session, dates: List[date]) -> Dict[date, int]:
+    """
+    Returns the DayLog ids for the given dates that already exist.
+    """
+    ids = {}
+    for chunk in _chunks(dates):
+        ids.update(db.execute(select(DayLog.date, DayLog.id).where(DayLog.date.in_(chunk))).all())
+    return ids
+
+def get_day_log(db: Session, log_date: date, with_sessions: bool = False) -> Optional[DayLog]:
     """
     Retrieves a DayLog for a specific date.
 
+    Relationships are not lazy loaded; pass with_sessions to load the
+    day's sessions in the same call.
+
     Args:
         db (Session): The database session.
         log_date (date): The date to retrieve the log for.
+        with_sessions (bool, optional): Also load DayLog.sessions with one
+                                        SELECT ... IN query. Defaults to False.
 
     Returns:
         Optional[DayLog]: The DayLog object if found, else None.
     """
-    return db.query(DayLog).filter(DayLog.date == log_date).first()
+    query = db.query(DayLog).filter(DayLog.date == log_date)
+    if with_sessions:
+        query = query.options(selectinload(DayLog.sessions))
+    return query.first()
 
 def create_day_log(db: Session, log_date: date, notes: str = None) -> DayLog:
     """
@@ -31,13 +206,11 @@ def create_day_log(db: Session, log_date: date, notes: str = None) -> DayLog:
         notes (str, optional): Initial notes for the day. Defaults to None.
 
     Returns:
-        DayLog: The newly created DayLog object.
+        DayLog: The newly created DayLog object, detached from the session.
     """
     db_log = DayLog(date=log_date, notes=notes)
     db.add(db_log)
-    db.commit()
-    db.refresh(db_log)
-    return db_log
+    return _commit_detached(db, db_log)
 
 def update_day_log_notes(db: Session, log_date: date, notes: str) -> Optional[DayLog]:
     """
@@ -49,13 +222,13 @@ def update_day_log_notes(db: Session, log_date: date, notes: str) -> Optional[Da
         notes (str): The new notes content.
 
     Returns:
-        Optional[DayLog]: The updated DayLog object if found, else None.
+        Optional[DayLog]: The updated DayLog object, detached from the session, if found, else None.
     """
     db_log = get_day_log(db, log_date)
     if db_log:
         db_log.notes = notes
-        db.commit()
-        db.refresh(db_log)
+        _commit_detached(db, db_log)
+        _invalidate_month(log_date)
     return db_log
 
 def add_mentorship_session(
@@ -70,7 +243,9 @@ def add_mentorship_session(
     """
     Adds a new mentorship session to a day.
     
-    If the DayLog for the specified date doesn't exist, it is automatically created.
+    If the DayLog for the specified date doesn't exist, it is automatically
+    created. The day, the session and the rollups are written in one
+    transaction, and concurrent calls for the same new date do not conflict.
 
     Args:
         db (Session): The database session.
@@ -82,40 +257,173 @@ def add_mentorship_session(
         minutes (int): Duration of the session in minutes.
 
     Returns:
-        MentorshipSession: The newly created session object.
+        MentorshipSession: The newly created session object, detached from the session.
+
+    Raises:
+        ValueError: If the duration is negative.
     """
-    db_log = get_day_log(db, log_date)
-    if not db_log:
-        db_log = create_day_log(db, log_date)
-    
+    try:
+        session = _add_session(db, log_date, group_name, category, activity, hours, minutes)
+    except Exception:
+        db.rollback()
+        raise
+    _commit_detached(db, session)
+    _invalidate_month(log_date)
+    return session
+
+def _add_session(
+    db: Session, log_date: date, group_name: str, category: str, activity: str, hours: int, minutes: int
+) -> MentorshipSession:
+    """
+    Writes one session, creating its DayLog if needed, and its rollup deltas.
+
+    The write steps of add_mentorship_session; does not commit.
+    """
+    duration = _duration(hours, minutes)
+    day_log_id = _day_log_id(db, log_date)
     session = MentorshipSession(
-        day_log_id=db_log.id,
+        day_log_id=day_log_id,
         group_name=group_name,
         category=category,
         activity_description=activity,
-        duration_hours=hours,
-        duration_minutes=minutes
+        **duration
     )
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    apply_deltas(db, {(day_log_id, category): (1, duration["duration_total_minutes"])})
     return session
 
+def add_mentorship_sessions_bulk(db: Session, rows: Iterable[dict]) -> List[int]:
+    """
+    Adds many mentorship sessions in a single transaction.
+
+    All required DayLogs are resolved or created with set-based statements,
+    then the sessions are written with one executemany INSERT and the daily
+    rollups are updated with one upsert per rollup table.
+
+    Args:
+        db (Session): The database session.
+        rows (Iterable[dict]): The sessions to add. Each dict has the keys
+                               'log_date', 'group_name', 'category', 'activity',
+                               'hours' and 'minutes', matching the arguments
+                               of add_mentorship_session.
+
+    Returns:
+        List[int]: The ids of the new sessions, in the order of rows.
+
+    Raises:
+        ValueError: If any duration is negative.
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+    durations = [_duration(row.get("hours", 0), row.get("minutes", 0)) for row in rows]
+
+    try:
+        day_log_ids = _ensure_day_logs(db, (row["log_date"] for row in rows))
+        deltas = {}
+        for row, duration in zip(rows, durations):
+            key = (day_log_ids[row["log_date"]], row["category"])
+            count, minutes = deltas.get(key, (0, 0))
+            deltas[key] = (count + 1, minutes + duration["duration_total_minutes"])
+        result = db.execute(
+            insert(MentorshipSession).returning(MentorshipSession.id, sort_by_parameter_order=True),
+            [
+                {
+                    "day_log_id": day_log_ids[row["log_date"]],
+                    "group_name": row["group_name"],
+                    "category": row["category"],
+                    "activity_description": row.get("activity"),
+                    **duration,
+                }
+                for row, duration in zip(rows, durations)
+            ]
+        )
+        session_ids = list(result.scalars())
+        apply_deltas(db, deltas)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    _invalidate_months(day_log_ids)
+    return session_ids
+
 def get_sessions_for_day(db: Session, log_date: date) -> List[MentorshipSession]:
     """
     Returns all mentorship sessions for a specific date.
 
+    Uses a single query joining day_logs; the DayLog itself is not loaded,
+    so MentorshipSession.day_log is not available on the results.
+
     Args:
         db (Session): The database session.
         log_date (date): The date to retrieve sessions for.
 
     Returns:
-        List[MentorshipSession]: A list of MentorshipSession objects. Returns an empty list if no sessions found.
+        List[MentorshipSession]: The day's sessions in the order they were logged. Returns an empty list if no sessions found.
     """
-    db_log = get_day_log(db, log_date)
-    if db_log:
-        return db_log.sessions
-    return []
+    return db.scalars(
+        select(MentorshipSession)
+        .join(MentorshipSession.day_log)
+        .where(DayLog.date == log_date)
+        .order_by(MentorshipSession.id)
+    ).all()
+
+def get_range_summary(db: Session, start_date: date, end_date: date) -> Dict[date, DaySummary]:
+    """
+    Returns per-day session counts and total minutes for a date range.
+
+    Reads the day_totals rollup in a single query, so the cost grows with
+    the number of days rather than sessions. Days without any sessions are
+    omitted from the result.
+
+    Args:
+        db (Session): The database session.
+        start_date (date): The first date of the range.
+        end_date (date): The last date of the range (inclusive).
+
+    Returns:
+        Dict[date, DaySummary]: A mapping of date to that day's totals.
+    """
+    rows = (
+        db.query(DayLog.date, DayTotal.session_count, DayTotal.total_minutes)
+        .join(DayTotal)
+        .filter(DayLog.date >= start_date, DayLog.date <= end_date, DayTotal.session_count > 0)
+    )
+    return {row[0]: DaySummary(row[1], row[2]) for row in rows}
+
+def get_month_summary(db: Session, year: int, month: int) -> Dict[date, DaySummary]:
+    """
+    Returns per-day session counts and total minutes for a calendar month.
+
+    Results are served from the in-memory month cache when possible; the
+    CRUD write functions invalidate the affected month.
+
+    Args:
+        db (Session): The database session.
+        year (int): The year of the month.
+        month (int): The month number (1-12).
+
+    Returns:
+        Dict[date, DaySummary]: A mapping of date to that day's totals.
+    """
+    key = (year, month)
+    summary = month_cache.get(key)
+    if summary is None:
+        token = month_cache.token()
+        last_day = calendar.monthrange(year, month)[1]
+        summary = get_range_summary(db, date(year, month, 1), date(year, month, last_day))
+        month_cache.put(key, summary, token)
+    return dict(summary)
+
+def _session_with_date(session_id: int):
+    """
+    Builds a query for one session and its day's date, in a single SELECT.
+    """
+    return (
+        select(MentorshipSession, DayLog.date)
+        .join(MentorshipSession.day_log)
+        .where(MentorshipSession.id == session_id)
+    )
 
 def delete_session(db: Session, session_id: int) -> bool:
     """
@@ -128,13 +436,104 @@ def delete_session(db: Session, session_id: int) -> bool:
     Returns:
         bool: True if the session was found and deleted, False otherwise.
     """
-    session = db.query(MentorshipSession).filter(MentorshipSession.id == session_id).first()
-    if session:
-        db.delete(session)
+    log_date = _delete_session(db, session_id)
+    if log_date:
         db.commit()
+        _invalidate_month(log_date)
         return True
     return False
 
+def _delete_session(db: Session, session_id: int) -> Optional[date]:
+    """
+    Deletes one session and applies its rollup deltas. Does not commit.
+
+    Returns:
+        Optional[date]: The session's date, or None if it does not exist.
+    """
+    row = db.execute(
+        _session_with_date(session_id).options(defer(MentorshipSession.activity_description, raiseload=True))
+    ).first()
+    if not row:
+        return None
+    session, log_date = row
+    apply_deltas(db, {
+        (session.day_log_id, session.category): (-1, -session.duration_total_minutes)
+    })
+    db.delete(session)
+    return log_date
+
+def delete_sessions_bulk(
+    db: Session,
+    session_ids: Iterable[int] = None,
+    start_date: date = None,
+    end_date: date = None,
+    remove_day_logs: bool = False
+) -> int:
+    """
+    Deletes many mentorship sessions with set-based DELETE statements.
+
+    Sessions are selected either by id or by an inclusive date range.
+
+    Args:
+        db (Session): The database session.
+        session_ids (Iterable[int], optional): The ids of the sessions to delete.
+        start_date (date, optional): The first date of the range to clear.
+        end_date (date, optional): The last date of the range to clear (inclusive).
+        remove_day_logs (bool, optional): When clearing a date range, also delete
+                                          the DayLogs (and their notes) in it.
+                                          Defaults to False.
+
+    Returns:
+        int: The number of sessions deleted.
+
+    Raises:
+        ValueError: If neither session_ids nor both range dates are given.
+    """
+    if session_ids is not None:
+        session_ids = list(session_ids)
+        touched_dates = set()
+        deleted = 0
+        try:
+            for chunk in _chunks(session_ids):
+                touched_dates.update(db.scalars(
+                    select(DayLog.date).join(MentorshipSession).where(MentorshipSession.id.in_(chunk))
+                ))
+                deltas = session_deltas(db, MentorshipSession.id.in_(chunk))
+                deleted += db.execute(
+                    delete(MentorshipSession).where(MentorshipSession.id.in_(chunk))
+                ).rowcount
+                apply_deltas(db, deltas)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        _invalidate_months(touched_dates)
+        return deleted
+
+    if start_date is None or end_date is None:
+        raise ValueError("Provide session_ids or both start_date and end_date.")
+
+    day_logs_in_range = select(DayLog.id).where(DayLog.date >= start_date, DayLog.date <= end_date)
+    try:
+        deleted = db.execute(
+            delete(MentorshipSession).where(MentorshipSession.day_log_id.in_(day_logs_in_range))
+        ).rowcount
+        # Every session of these days is gone, so their rollups are too
+        for model in (DayCategoryTotal, DayTotal):
+            db.execute(
+                delete(model)
+                .where(model.day_log_id.in_(day_logs_in_range))
+                .execution_options(synchronize_session=False)
+            )
+        if remove_day_logs:
+            db.execute(delete(DayLog).where(DayLog.date >= start_date, DayLog.date <= end_date))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    _invalidate_months(_months_between(start_date, end_date))
+    return deleted
+
 def update_mentorship_session(
     db: Session,
     session_id: int,
@@ -157,15 +556,50 @@ def update_mentorship_session(
         minutes (int): The new duration minutes.
 
     Returns:
-        Optional[MentorshipSession]: The updated session object if found, else None.
+        Optional[MentorshipSession]: The updated session object, detached from the session, if found, else None.
+
+    Raises:
+        ValueError: If the duration is negative.
     """
-    session = db.query(MentorshipSession).filter(MentorshipSession.id == session_id).first()
-    if session:
-        session.group_name = group_name
-        session.category = category
-        session.activity_description = activity
-        session.duration_hours = hours
-        session.duration_minutes = minutes
-        db.commit()
-        db.refresh(session)
+    updated = _update_session(db, session_id, group_name, category, activity, hours, minutes)
+    if updated is None:
+        return None
+    session, log_date = updated
+    _commit_detached(db, session)
+    _invalidate_month(log_date)
     return session
+
+def _update_session(
+    db: Session, session_id: int, group_name: str, category: str, activity: str, hours: int, minutes: int
+) -> Optional[Tuple[MentorshipSession, date]]:
+    """
+    Updates one session and applies the rollup deltas. Does not commit.
+
+    Returns:
+        Optional[Tuple[MentorshipSession, date]]: The session and its date,
+                                                  or None if it does not exist.
+    """
+    duration = _duration(hours, minutes)
+    # The description is about to be replaced, so it is not loaded
+    row = db.execute(
+        _session_with_date(session_id).options(defer(MentorshipSession.activity_description))
+    ).first()
+    if not row:
+        return None
+    session, log_date = row
+    old_key = (session.day_log_id, session.category)
+    old_minutes = session.duration_total_minutes
+    new_key = (session.day_log_id, category)
+    new_minutes = duration["duration_total_minutes"]
+    if old_key == new_key:
+        deltas = {new_key: (0, new_minutes - old_minutes)}
+    else:
+        deltas = {old_key: (-1, -old_minutes), new_key: (1, new_minutes)}
+    apply_deltas(db, deltas)
+
+    session.group_name = group_name
+    session.category = category
+    session.activity_description = activity
+    for column, value in duration.items():
+        setattr(session, column, value)
+    return session, log_date
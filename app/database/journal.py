@@ -0,0 +1,368 @@
+"""
+Offline write-ahead journal for the Daily Planner App.
+
+Session writes are recorded in a local SQLite file first and applied to the
+main database by replay(), in batched transactions. Recording needs no
+network, so the GUI can accept a session while the database is unreachable
+and replay the journal once it is back.
+
+Every entry carries an idempotency key. The key is inserted into the
+applied_operations table in the same transaction as the write, so an entry
+that was applied but not yet removed from the journal (for example because
+the process stopped in between) is skipped on the next replay. Keys are
+deleted again once their entry has left the journal.
+
+An entry that fails for any reason other than the database being
+unreachable (say, an update of a session deleted meanwhile) would fail on
+every replay, so it is moved to a dead-letter table instead of blocking the
+entries behind it.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional
+from sqlalchemy import delete, select
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError, SQLAlchemyError, TimeoutError
+from sqlalchemy.orm import Session
+from .crud import _add_session, _duration, _invalidate_months, _update_session
+from .models import AppliedOperation, init_db, session_scope
+
+JOURNAL_PATH = os.getenv("JOURNAL_PATH", "planner_journal.db")
+# Entries applied per database transaction
+JOURNAL_BATCH_SIZE = int(os.getenv("JOURNAL_BATCH_SIZE", "100"))
+# applied_operations keys left behind (e.g. because pruning failed) are
+# deleted after this many days
+JOURNAL_KEY_RETENTION_DAYS = int(os.getenv("JOURNAL_KEY_RETENTION_DAYS", "30"))
+
+logger = logging.getLogger(__name__)
+
+class JournalEntry(NamedTuple):
+    """
+    One recorded write waiting to be applied.
+
+    Attributes:
+        seq (int): Position in the journal; entries are applied in this order.
+        key (str): Idempotency key.
+        op (str): The operation, one of OPERATIONS.
+        payload (dict): The operation's arguments, with dates as ISO strings.
+    """
+    seq: int
+    key: str
+    op: str
+    payload: dict
+
+class FailedEntry(NamedTuple):
+    """
+    An entry moved to the dead-letter table because it could not be applied.
+
+    Attributes:
+        seq (int): The entry's position in the journal.
+        key (str): Idempotency key.
+        op (str): The operation.
+        payload (dict): The operation's arguments.
+        error (str): The error it failed with.
+    """
+    seq: int
+    key: str
+    op: str
+    payload: dict
+    error: str
+
+def _is_connectivity_error(error: Exception) -> bool:
+    """
+    Returns True if the error means the database could not be reached,
+    rather than that the entry itself is bad.
+    """
+    if isinstance(error, (OperationalError, InterfaceError, TimeoutError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+def _apply_add(db: Session, payload: dict) -> date:
+    log_date = date.fromisoformat(payload["log_date"])
+    _add_session(
+        db, log_date, payload["group_name"], payload["category"], payload["activity"],
+        payload["hours"], payload["minutes"]
+    )
+    return log_date
+
+def _apply_update(db: Session, payload: dict) -> Optional[date]:
+    updated = _update_session(
+        db, payload["session_id"], payload["group_name"], payload["category"], payload["activity"],
+        payload["hours"], payload["minutes"]
+    )
+    return updated[1] if updated else None
+
+# Journaled operations. Each applies a payload without committing and returns
+# the date it changed, or None if its session no longer exists.
+OPERATIONS: Dict[str, Callable[[Session, dict], Optional[date]]] = {
+    "add": _apply_add,
+    "update": _apply_update,
+}
+
+class Journal:
+    """
+    Append-only local journal of session writes.
+
+    Thread-safe; one journal is shared by every page session of the process.
+
+    Attributes:
+        path (str): The journal's SQLite file.
+    """
+    def __init__(self, path: str = JOURNAL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        # Whether replay() has brought the schema up to date yet
+        self._schema_current = False
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS journal ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "key TEXT NOT NULL UNIQUE, "
+            "op TEXT NOT NULL, "
+            "payload TEXT NOT NULL, "
+            "recorded_at TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS failed ("
+            "seq INTEGER PRIMARY KEY, "
+            "key TEXT NOT NULL, "
+            "op TEXT NOT NULL, "
+            "payload TEXT NOT NULL, "
+            "recorded_at TEXT NOT NULL, "
+            "error TEXT NOT NULL, "
+            "failed_at TEXT NOT NULL)"
+        )
+
+    def record(self, op: str, **payload) -> str:
+        """
+        Appends a write to the journal. Never touches the main database.
+
+        Args:
+            op (str): "add" or "update".
+            **payload: The arguments of add_mentorship_session (add) or
+                       update_mentorship_session (update), without the
+                       database session.
+
+        Returns:
+            str: The entry's idempotency key.
+
+        Raises:
+            ValueError: If the operation is unknown or the duration is negative.
+        """
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown journal operation: {op}")
+        if "hours" in payload or "minutes" in payload:
+            # Rejected now rather than failing every replay later
+            _duration(payload.get("hours"), payload.get("minutes"))
+        key = uuid.uuid4().hex
+        encoded = json.dumps(payload, default=date.isoformat)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO journal (key, op, payload, recorded_at) VALUES (?, ?, ?, ?)",
+                (key, op, encoded, datetime.now(timezone.utc).isoformat())
+            )
+        return key
+
+    def pending(self, limit: int = None) -> List[JournalEntry]:
+        """
+        Returns the entries not yet applied, oldest first.
+
+        Args:
+            limit (int, optional): Maximum number of entries.
+
+        Returns:
+            List[JournalEntry]: The pending entries.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, key, op, payload FROM journal ORDER BY seq LIMIT ?",
+                (-1 if limit is None else limit,)
+            ).fetchall()
+        return [JournalEntry(seq, key, op, json.loads(payload)) for seq, key, op, payload in rows]
+
+    def pending_count(self) -> int:
+        """
+        int: Number of entries not yet applied.
+        """
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM journal").fetchone()[0]
+
+    def pending_sessions(self, log_date: date) -> List[dict]:
+        """
+        Returns the payloads of sessions added on a date that are not yet applied.
+
+        Args:
+            log_date (date): The day to look up.
+
+        Returns:
+            List[dict]: add payloads, oldest first.
+        """
+        day = log_date.isoformat()
+        return [entry.payload for entry in self.pending() if entry.op == "add" and entry.payload["log_date"] == day]
+
+    def pending_dates(self) -> set:
+        """
+        Returns the dates of sessions added but not yet applied.
+
+        Returns:
+            set[date]: The dates.
+        """
+        return {date.fromisoformat(entry.payload["log_date"]) for entry in self.pending() if entry.op == "add"}
+
+    def failed(self) -> List[FailedEntry]:
+        """
+        Returns the entries moved to the dead-letter table, oldest first.
+
+        Returns:
+            List[FailedEntry]: The failed entries.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT seq, key, op, payload, error FROM failed ORDER BY seq").fetchall()
+        return [FailedEntry(seq, key, op, json.loads(payload), error) for seq, key, op, payload, error in rows]
+
+    def _dead_letter(self, entry: JournalEntry, error: Exception):
+        """
+        Moves an entry that cannot be applied from the journal to the failed table.
+        """
+        logger.error("Journal entry %s (%s) failed and was set aside: %r", entry.key, entry.op, error)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT INTO failed (seq, key, op, payload, recorded_at, error, failed_at) "
+                "SELECT seq, key, op, payload, recorded_at, ?, ? FROM journal WHERE seq = ?",
+                (repr(error), datetime.now(timezone.utc).isoformat(), entry.seq)
+            )
+            self._conn.execute("DELETE FROM journal WHERE seq = ?", (entry.seq,))
+            self._conn.execute("COMMIT")
+
+    def replay(self, batch_size: int = JOURNAL_BATCH_SIZE) -> int:
+        """
+        Applies pending entries to the main database until the journal is empty.
+
+        Each batch of up to batch_size entries is applied in one transaction
+        and then removed from the journal. Entries whose key is already in
+        applied_operations are skipped. The first replay runs the schema
+        migrations if they have not been applied yet. Each entry is applied and flushed in
+        its own savepoint; one that fails for a reason other than
+        connectivity is rolled back alone and moved to the failed table.
+        Concurrent calls run one at a time.
+
+        Args:
+            batch_size (int, optional): Entries per transaction.
+
+        Returns:
+            int: The number of entries applied by this call.
+
+        Raises:
+            SQLAlchemyError: If the database is unreachable; the batch stays
+                             in the journal for the next replay.
+        """
+        applied = 0
+        applied_keys = []
+        with self._replay_lock:
+            if not self._schema_current:
+                # The app may have started while the database was down, so
+                # init_db() never ran; a current schema costs one query
+                init_db()
+                self._schema_current = True
+            while True:
+                entries = self.pending(batch_size)
+                if not entries:
+                    break
+                changed = []
+                failures = []
+                with session_scope() as db:
+                    keys = [entry.key for entry in entries]
+                    done = set(db.scalars(select(AppliedOperation.key).where(AppliedOperation.key.in_(keys))))
+                    for entry in entries:
+                        if entry.key in done:
+                            continue
+                        # A savepoint per entry, so a bad one is rolled back alone
+                        savepoint = db.begin_nested()
+                        try:
+                            changed_date = OPERATIONS[entry.op](db, entry.payload)
+                            db.add(AppliedOperation(key=entry.key))
+                            # Constraint violations surface here rather than at commit
+                            db.flush()
+                        except Exception as e:
+                            if _is_connectivity_error(e):
+                                raise
+                            savepoint.rollback()
+                            failures.append((entry, e))
+                            continue
+                        savepoint.commit()
+                        changed.append(changed_date)
+                    db.commit()
+                applied += len(changed)
+                _invalidate_months(d for d in changed if d is not None)
+                # Set aside before the batch leaves the journal; after a crash
+                # in between they fail again and are set aside then
+                for failure in failures:
+                    self._dead_letter(*failure)
+                with self._lock:
+                    self._conn.execute("DELETE FROM journal WHERE seq <= ?", (entries[-1].seq,))
+                applied_keys.extend(keys)
+            if applied_keys:
+                self._prune_keys(applied_keys)
+        return applied
+
+    def _prune_keys(self, keys: List[str]):
+        """
+        Deletes applied_operations keys whose entries have left the journal,
+        and any older than JOURNAL_KEY_RETENTION_DAYS.
+
+        Best effort: keys that cannot be deleted now only cost space and are
+        caught by the retention window later.
+        """
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=JOURNAL_KEY_RETENTION_DAYS)
+        try:
+            with session_scope() as db:
+                db.execute(delete(AppliedOperation).where(
+                    AppliedOperation.key.in_(keys) | (AppliedOperation.applied_at < cutoff)
+                ))
+                db.commit()
+        except SQLAlchemyError as e:
+            logger.warning("Could not prune applied journal keys: %r", e)
+
+    def close(self):
+        """
+        Closes the journal file.
+        """
+        with self._lock:
+            self._conn.close()
+
+_journal = None
+_journal_lock = threading.Lock()
+
+def configure_journal(path: str = None) -> Journal:
+    """
+    Opens the process-wide journal, closing any existing one.
+
+    Args:
+        path (str, optional): The journal file. Defaults to JOURNAL_PATH.
+
+    Returns:
+        Journal: The newly opened journal.
+    """
+    global _journal
+    with _journal_lock:
+        if _journal is not None:
+            _journal.close()
+        _journal = Journal(path or JOURNAL_PATH)
+        return _journal
+
+def get_journal() -> Journal:
+    """
+    Returns the process-wide journal, opening it on first use.
+
+    Returns:
+        Journal: The journal.
+    """
+    if _journal is None:
+        configure_journal()
+    return _journal
@@ -0,0 +1,174 @@
+"""
+Versioned schema migrations for the Daily Planner App.
+
+The applied version is recorded in the schema_version table. A new database
+is created from the current models and stamped with the latest version; a
+database created before versioning (tables but no schema_version) starts at
+version 0 and runs every migration. Migrations must therefore tolerate
+objects that already exist.
+
+To change the schema, update the models and append a Migration whose
+upgrade function brings an existing database to the same state.
+"""
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple, Optional
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, insert, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from .models import Base, MentorshipSession, DayTotal, DayCategoryTotal, AppliedOperation
+from .search import create_search_index
+
+schema_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    schema_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+class Migration(NamedTuple):
+    """
+    One schema upgrade step.
+
+    Attributes:
+        version (int): Sequential version number, starting at 1.
+        description (str): Short summary recorded in schema_version.
+        upgrade (Callable[[Connection], None]): Applies the change inside the
+                                                migration's transaction.
+    """
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+def _add_day_totals(conn: Connection):
+    for model in (DayTotal, DayCategoryTotal):
+        model.__table__.create(conn, checkfirst=True)
+    # Written against the schema of this version (hours/minutes columns only),
+    # not rollup.rebuild_day_totals, which follows the current models.
+    sessions = MentorshipSession.__table__.c
+    conn.execute(DayCategoryTotal.__table__.delete())
+    conn.execute(DayTotal.__table__.delete())
+    conn.execute(insert(DayCategoryTotal).from_select(
+        ["day_log_id", "category", "session_count", "total_minutes"],
+        select(
+            sessions.day_log_id,
+            sessions.category,
+            func.count(sessions.id),
+            func.coalesce(func.sum(
+                func.coalesce(sessions.duration_hours, 0) * 60 + func.coalesce(sessions.duration_minutes, 0)
+            ), 0)
+        ).group_by(sessions.day_log_id, sessions.category)
+    ))
+    conn.execute(insert(DayTotal).from_select(
+        ["day_log_id", "session_count", "total_minutes"],
+        select(
+            DayCategoryTotal.day_log_id,
+            func.sum(DayCategoryTotal.session_count),
+            func.sum(DayCategoryTotal.total_minutes)
+        ).group_by(DayCategoryTotal.day_log_id)
+    ))
+
+def _create_session_indexes(conn: Connection, *names: str):
+    for index in MentorshipSession.__table__.indexes:
+        if index.name in names:
+            index.create(conn, checkfirst=True)
+
+def _add_session_indexes(conn: Connection):
+    _create_session_indexes(
+        conn,
+        "ix_mentorship_sessions_day_log_id_group_name",
+        "ix_mentorship_sessions_group_name_day_log_id",
+        "ix_mentorship_sessions_category_day_log_id",
+    )
+
+def _add_duration_total_minutes(conn: Connection):
+    conn.execute(text(
+        "ALTER TABLE mentorship_sessions "
+        "ADD COLUMN duration_total_minutes INTEGER NOT NULL DEFAULT 0"
+    ))
+    sessions = MentorshipSession.__table__.c
+    total = func.coalesce(sessions.duration_hours, 0) * 60 + func.coalesce(sessions.duration_minutes, 0)
+    conn.execute(update(MentorshipSession.__table__).values(duration_total_minutes=total))
+    conn.execute(update(MentorshipSession.__table__).values(
+        duration_hours=sessions.duration_total_minutes // 60,
+        duration_minutes=sessions.duration_total_minutes % 60,
+    ))
+    _create_session_indexes(conn, "ix_mentorship_sessions_duration_total_minutes")
+
+def _add_applied_operations(conn: Connection):
+    AppliedOperation.__table__.create(conn, checkfirst=True)
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "daily rollup tables", _add_day_totals),
+    Migration(2, "mentorship_sessions indexes", _add_session_indexes),
+    Migration(3, "mentorship_sessions.duration_total_minutes", _add_duration_total_minutes),
+    Migration(4, "full-text search index", create_search_index),
+    Migration(5, "applied_operations for the offline journal", _add_applied_operations),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+def current_version(engine: Engine) -> Optional[int]:
+    """
+    Reads the applied schema version with a single query.
+
+    Args:
+        engine (Engine): The database engine.
+
+    Returns:
+        Optional[int]: The applied version, or None if the database has no
+                       schema_version table yet.
+    """
+    try:
+        with engine.connect() as conn:
+            return conn.scalar(select(schema_version.c.version).order_by(schema_version.c.version.desc()).limit(1)) or 0
+    except (OperationalError, ProgrammingError):
+        return None
+
+def _stamp(conn: Connection, migration: Migration):
+    conn.execute(schema_version.insert().values(
+        version=migration.version,
+        description=migration.description,
+        applied_at=datetime.now(timezone.utc).replace(tzinfo=None),
+    ))
+
+def migrate(engine: Engine) -> List[int]:
+    """
+    Brings the database schema up to SCHEMA_VERSION.
+
+    Reflection is only used when schema_version does not exist yet, to tell
+    a new database from one created before versioning. Each pending
+    migration runs and is recorded in its own transaction.
+
+    Args:
+        engine (Engine): The database engine.
+
+    Returns:
+        List[int]: The versions applied, empty if the schema was current.
+    """
+    version = current_version(engine)
+    if version == SCHEMA_VERSION:
+        return []
+
+    if version is None:
+        with engine.begin() as conn:
+            legacy = inspect(conn).has_table("day_logs")
+            schema_metadata.create_all(conn)
+            if not legacy:
+                Base.metadata.create_all(conn)
+                for migration in MIGRATIONS:
+                    _stamp(conn, migration)
+                return [migration.version for migration in MIGRATIONS]
+        version = 0
+
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            _stamp(conn, migration)
+        applied.append(migration.version)
+    return applied
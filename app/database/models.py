@@ -1,17 +1,40 @@
 """
 Database models for the Daily Planner App.
 
-Defines the SQLAlchemy ORM models for DayLog and MentorshipSession.
+Defines the SQLAlchemy ORM models for DayLog and MentorshipSession, the
+DayTotal/DayCategoryTotal rollups derived from them, and the
+AppliedOperation keys used by the offline journal.
 """
 import os
-from sqlalchemy import create_engine, Column, Integer, String, Text, Date, ForeignKey
+import threading
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, Column, Integer, String, Text, Date, DateTime, ForeignKey, Index, func
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
 from dotenv import load_dotenv
+from .cache import month_cache
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Embedded SQLite database used when DATABASE_URL is not set
+SQLITE_PATH = os.getenv("SQLITE_PATH", "planner.db")
+# Per-connection SQLite tuning, applied by _set_sqlite_pragmas. WAL lets
+# readers run alongside the writer, and with it synchronous=NORMAL only
+# syncs at checkpoints: a power cut can lose the last commits, never
+# corrupt the file.
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Connection pool tuning (ignored by SQLite, which manages its own pool)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
 Base = declarative_base()
 
 class DayLog(Base):
@@ -23,6 +46,8 @@ class DayLog(Base):
         date (Date): The date of the log.
         notes (str): Optional notes for the day.
         sessions (list[MentorshipSession]): List of sessions for this day.
+        totals (DayTotal): Rolled-up totals for this day, if any sessions were logged.
+        category_totals (list[DayCategoryTotal]): Rolled-up totals per category.
     """
     __tablename__ = 'day_logs'
 
@@ -30,7 +55,11 @@ class DayLog(Base):
     date = Column(Date, unique=True, nullable=False)
     notes = Column(Text, nullable=True)
     
-    sessions = relationship("MentorshipSession", back_populates="day_log", cascade="all, delete-orphan")
+    # Relationships never lazy load: a read must say what it needs with a
+    # loader option (e.g. selectinload), so an accidental N+1 raises instead
+    sessions = relationship("MentorshipSession", back_populates="day_log", cascade="all, delete-orphan", lazy="raise")
+    totals = relationship("DayTotal", uselist=False, cascade="all, delete-orphan", lazy="raise")
+    category_totals = relationship("DayCategoryTotal", cascade="all, delete-orphan", lazy="raise")
 
 class MentorshipSession(Base):
     """
@@ -42,55 +71,242 @@ class MentorshipSession(Base):
         group_name (str): Name or number of the group/mentee.
         category (str): Type of session (e.g., "1:1 Mentoring").
         activity_description (str): Description of what was done.
-        duration_hours (int): Duration hours.
-        duration_minutes (int): Duration minutes.
+        duration_total_minutes (int): Duration in minutes; the canonical value
+                                      used for sums and filters.
+        duration_hours (int): Whole hours of the duration.
+        duration_minutes (int): Remaining minutes of the duration (0-59).
     """
     __tablename__ = 'mentorship_sessions'
+    __table_args__ = (
+        # Day lookups and date-range joins, optionally narrowed to one group
+        Index("ix_mentorship_sessions_day_log_id_group_name", "day_log_id", "group_name"),
+        # Per-group and per-category queries over a date range
+        Index("ix_mentorship_sessions_group_name_day_log_id", "group_name", "day_log_id"),
+        Index("ix_mentorship_sessions_category_day_log_id", "category", "day_log_id"),
+        # Duration range filters
+        Index("ix_mentorship_sessions_duration_total_minutes", "duration_total_minutes"),
+    )
 
     id = Column(Integer, primary_key=True)
     day_log_id = Column(Integer, ForeignKey('day_logs.id'), nullable=False)
     group_name = Column(String, nullable=False)
     category = Column(String, nullable=False)
     activity_description = Column(Text, nullable=True)
+    duration_total_minutes = Column(Integer, nullable=False, default=0, server_default="0")
     duration_hours = Column(Integer, default=0)
     duration_minutes = Column(Integer, default=0)
 
-    day_log = relationship("DayLog", back_populates="sessions")
+    day_log = relationship("DayLog", back_populates="sessions", lazy="raise")
+
+class DayTotal(Base):
+    """
+    Rollup of the sessions logged on one day.
+
+    Maintained by the CRUD write functions in the same transaction as the
+    sessions themselves; see app.database.rollup.
+
+    Attributes:
+        day_log_id (int): Primary key and foreign key to DayLog.
+        session_count (int): Number of sessions on the day.
+        total_minutes (int): Combined duration of those sessions in minutes.
+    """
+    __tablename__ = 'day_totals'
+
+    day_log_id = Column(Integer, ForeignKey('day_logs.id', ondelete="CASCADE"), primary_key=True)
+    session_count = Column(Integer, nullable=False, default=0)
+    total_minutes = Column(Integer, nullable=False, default=0)
+
+class DayCategoryTotal(Base):
+    """
+    Rollup of the sessions logged on one day in one category.
+
+    Attributes:
+        day_log_id (int): Foreign key to DayLog; part of the primary key.
+        category (str): The session category; part of the primary key.
+        session_count (int): Number of sessions in the category on the day.
+        total_minutes (int): Combined duration of those sessions in minutes.
+    """
+    __tablename__ = 'day_category_totals'
+
+    day_log_id = Column(Integer, ForeignKey('day_logs.id', ondelete="CASCADE"), primary_key=True)
+    category = Column(String, primary_key=True)
+    session_count = Column(Integer, nullable=False, default=0)
+    total_minutes = Column(Integer, nullable=False, default=0)
+
+class AppliedOperation(Base):
+    """
+    Idempotency key of a journaled write that has been applied.
+
+    Inserted in the same transaction as the write itself, so replaying the
+    offline journal never applies an operation twice; see app.database.journal.
+
+    Attributes:
+        key (str): The operation's idempotency key.
+        applied_at (DateTime): When the operation was applied.
+    """
+    __tablename__ = 'applied_operations'
+
+    key = Column(String(32), primary_key=True)
+    applied_at = Column(DateTime, nullable=False, server_default=func.now())
+
+_engine = None
+_SessionLocal = None
+_engine_lock = threading.Lock()
+
+def _engine_options(url: str) -> dict:
+    """
+    Builds the keyword arguments passed to create_engine for a database URL.
+
+    Args:
+        url (str): The database URL.
+
+    Returns:
+        dict: Engine options, including pool tuning for server databases.
+    """
+    options = {"pool_pre_ping": DB_POOL_PRE_PING}
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return options
+
+def default_url() -> str:
+    """
+    Returns the database URL used when none is given.
+
+    Returns:
+        str: DATABASE_URL if set, otherwise the embedded SQLite file at SQLITE_PATH.
+    """
+    return DATABASE_URL or f"sqlite:///{SQLITE_PATH}"
+
+def _set_sqlite_pragmas(dbapi_conn, connection_record):
+    """
+    Tunes each new SQLite connection: WAL journaling, SQLITE_SYNCHRONOUS,
+    a page cache of SQLITE_CACHE_SIZE_KB and memory-mapped reads of up to
+    SQLITE_MMAP_SIZE bytes. In-memory databases ignore the journal mode.
+    """
+    cursor = dbapi_conn.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        # Negative sizes are in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+def install_connection_hooks(engine):
+    """
+    Registers the per-connection setup for the engine's backend.
+
+    Used for both the synchronous engine and the async engine's sync_engine.
+    Currently only SQLite connections need setup.
+
+    Args:
+        engine (Engine): The engine to set up.
+    """
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+
+def configure_engine(url: str = None, **options):
+    """
+    Creates the process-wide engine, replacing (and disposing) any existing one.
+
+    Args:
+        url (str, optional): The database URL. Defaults to default_url().
+        **options: Extra create_engine arguments, overriding the pool defaults.
+
+    Returns:
+        Engine: The newly configured engine.
+    """
+    global _engine, _SessionLocal
+    url = url or default_url()
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = create_engine(url, **{**_engine_options(url), **options})
+        install_connection_hooks(_engine)
+        _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
+    month_cache.clear()
+    return _engine
+
+def dispose_engine():
+    """
+    Closes all pooled connections and forgets the process-wide engine.
+
+    The next call to get_engine() creates a fresh one.
+    """
+    global _engine, _SessionLocal
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = None
+        _SessionLocal = None
+    month_cache.clear()
 
 def get_engine():
     """
-    Creates and returns the SQLAlchemy engine.
+    Returns the process-wide SQLAlchemy engine, creating it on first use.
+
+    Every caller shares the same engine and therefore the same connection pool.
+    Without DATABASE_URL this is the embedded SQLite database at SQLITE_PATH.
     
     Returns:
         Engine: The SQLAlchemy engine connected to the database.
-
-    Raises:
-        ValueError: If the DATABASE_URL environment variable is not set.
     """
-    if not DATABASE_URL:
-        raise ValueError("DATABASE_URL environment variable is not set.")
-    return create_engine(DATABASE_URL)
+    if _engine is None:
+        configure_engine()
+    return _engine
 
 def init_db():
     """
     Initializes the database schema.
     
-    Creates all tables defined in the Base metadata if they do not already exist.
+    Brings the schema up to date through the versioned migrations in
+    app.database.migrations. When the schema is already current this is a
+    single query against the schema_version table.
+
+    Returns:
+        list[int]: The migration versions applied by this call.
     """
-    engine = get_engine()
-    Base.metadata.create_all(bind=engine)
+    from .migrations import migrate
 
-def get_db():
+    return migrate(get_engine())
+
+@contextmanager
+def session_scope():
     """
-    Generator that yields a database session.
-    
+    Context manager that provides a pooled database session.
+
+    The session is rolled back if the block raises and is always closed on
+    exit, returning its connection to the pool. Callers commit explicitly,
+    as the CRUD functions already do.
+
     Yields:
         Session: SQLAlchemy session.
     """
-    engine = get_engine()
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    db = SessionLocal()
+    get_engine()
+    db = _SessionLocal()
     try:
         yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
+
+def get_db():
+    """
+    Generator that yields a database session.
+
+    Prefer session_scope(); this wrapper is kept for existing callers.
+    
+    Yields:
+        Session: SQLAlchemy session.
+    """
+    with session_scope() as db:
+        yield db
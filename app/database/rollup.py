@@ -0,0 +1,205 @@
+"""
+Daily rollup maintenance for the Daily Planner App.
+
+The day_totals and day_category_totals tables hold per-day session counts
+and minutes so read-heavy views scale with the number of days rather than
+the number of sessions. The CRUD write functions call apply_deltas() in the
+same transaction as their change; rebuild_day_totals() recomputes the
+rollups from scratch and check_day_totals() compares them with the base table.
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Tuple
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from .models import DayLog, MentorshipSession, DayTotal, DayCategoryTotal
+
+# Maximum number of values bound into a single IN (...) list
+ROLLUP_CHUNK_SIZE = 500
+
+def dialect_insert(db: Session, model):
+    """
+    Returns the dialect-specific INSERT construct for a model, when the
+    database supports ON CONFLICT clauses.
+
+    Args:
+        db (Session): The database session.
+        model: The ORM model to insert into.
+
+    Returns:
+        Insert: A PostgreSQL or SQLite insert, or None for other databases.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    return None
+
+def _add_to_totals(db: Session, model, key_columns: List[str], rows: List[dict]):
+    """
+    Adds session_count/total_minutes deltas to rollup rows, creating them as needed.
+    """
+    stmt = dialect_insert(db, model)
+    if stmt is not None:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={
+                "session_count": model.session_count + stmt.excluded.session_count,
+                "total_minutes": model.total_minutes + stmt.excluded.total_minutes,
+            }
+        )
+        db.execute(stmt, rows)
+        return
+
+    for row in rows:
+        existing = db.get(model, tuple(row[column] for column in key_columns))
+        if existing:
+            existing.session_count += row["session_count"]
+            existing.total_minutes += row["total_minutes"]
+        else:
+            db.add(model(**row))
+    db.flush()
+
+def apply_deltas(db: Session, deltas: Dict[Tuple[int, str], Tuple[int, int]]):
+    """
+    Applies session count and minute changes to the day and category rollups.
+
+    Rollup rows whose session count drops to zero are removed. Does not commit.
+
+    Args:
+        db (Session): The database session.
+        deltas (Dict[Tuple[int, str], Tuple[int, int]]): Changes keyed by
+            (day_log_id, category), as (session_count_delta, minutes_delta).
+    """
+    deltas = {key: value for key, value in deltas.items() if value != (0, 0)}
+    if not deltas:
+        return
+
+    day_deltas = defaultdict(lambda: [0, 0])
+    for (day_log_id, _), (count, minutes) in deltas.items():
+        day_deltas[day_log_id][0] += count
+        day_deltas[day_log_id][1] += minutes
+
+    _add_to_totals(db, DayCategoryTotal, ["day_log_id", "category"], [
+        {"day_log_id": day_log_id, "category": category, "session_count": count, "total_minutes": minutes}
+        for (day_log_id, category), (count, minutes) in deltas.items()
+    ])
+    _add_to_totals(db, DayTotal, ["day_log_id"], [
+        {"day_log_id": day_log_id, "session_count": count, "total_minutes": minutes}
+        for day_log_id, (count, minutes) in day_deltas.items()
+    ])
+
+    if any(count < 0 for count, _ in deltas.values()):
+        day_log_ids = list(day_deltas)
+        for i in range(0, len(day_log_ids), ROLLUP_CHUNK_SIZE):
+            chunk = day_log_ids[i:i + ROLLUP_CHUNK_SIZE]
+            for model in (DayCategoryTotal, DayTotal):
+                db.execute(
+                    delete(model)
+                    .where(model.day_log_id.in_(chunk), model.session_count <= 0)
+                    .execution_options(synchronize_session=False)
+                )
+
+def session_deltas(db: Session, condition) -> Dict[Tuple[int, str], Tuple[int, int]]:
+    """
+    Returns the negative deltas that removing the matching sessions would cause.
+
+    Args:
+        db (Session): The database session.
+        condition: A SQL expression selecting MentorshipSession rows.
+
+    Returns:
+        Dict[Tuple[int, str], Tuple[int, int]]: Deltas for apply_deltas().
+    """
+    rows = db.execute(
+        select(
+            MentorshipSession.day_log_id,
+            MentorshipSession.category,
+            func.count(MentorshipSession.id),
+            func.coalesce(func.sum(MentorshipSession.duration_total_minutes), 0)
+        )
+        .where(condition)
+        .group_by(MentorshipSession.day_log_id, MentorshipSession.category)
+    )
+    return {(day_log_id, category): (-count, -minutes) for day_log_id, category, count, minutes in rows}
+
+def rebuild_day_totals(db: Session) -> int:
+    """
+    Recomputes both rollup tables from mentorship_sessions and commits.
+
+    Args:
+        db (Session): The database session.
+
+    Returns:
+        int: The number of days with sessions.
+    """
+    db.execute(delete(DayCategoryTotal))
+    db.execute(delete(DayTotal))
+    db.execute(insert(DayCategoryTotal).from_select(
+        ["day_log_id", "category", "session_count", "total_minutes"],
+        select(
+            MentorshipSession.day_log_id,
+            MentorshipSession.category,
+            func.count(MentorshipSession.id),
+            func.coalesce(func.sum(MentorshipSession.duration_total_minutes), 0)
+        ).group_by(MentorshipSession.day_log_id, MentorshipSession.category)
+    ))
+    db.execute(insert(DayTotal).from_select(
+        ["day_log_id", "session_count", "total_minutes"],
+        select(
+            DayCategoryTotal.day_log_id,
+            func.sum(DayCategoryTotal.session_count),
+            func.sum(DayCategoryTotal.total_minutes)
+        ).group_by(DayCategoryTotal.day_log_id)
+    ))
+    db.commit()
+    return db.scalar(select(func.count()).select_from(DayTotal))
+
+def check_day_totals(db: Session) -> List[date]:
+    """
+    Compares the rollups with a fresh aggregate of mentorship_sessions.
+
+    Args:
+        db (Session): The database session.
+
+    Returns:
+        List[date]: Dates whose day or category totals disagree with the base table.
+    """
+    expected = defaultdict(dict)
+    for day, category, count, minutes in db.execute(
+        select(
+            DayLog.date,
+            MentorshipSession.category,
+            func.count(MentorshipSession.id),
+            func.coalesce(func.sum(MentorshipSession.duration_total_minutes), 0)
+        )
+        .join(MentorshipSession)
+        .group_by(DayLog.date, MentorshipSession.category)
+    ):
+        expected[day][category] = (count, minutes)
+
+    actual = defaultdict(dict)
+    for day, category, count, minutes in db.execute(
+        select(DayLog.date, DayCategoryTotal.category, DayCategoryTotal.session_count, DayCategoryTotal.total_minutes)
+        .join(DayCategoryTotal)
+    ):
+        actual[day][category] = (count, minutes)
+
+    day_totals = dict(
+        (day, (count, minutes)) for day, count, minutes in db.execute(
+            select(DayLog.date, DayTotal.session_count, DayTotal.total_minutes).join(DayTotal)
+        )
+    )
+
+    mismatched = set()
+    for day in set(expected) | set(actual) | set(day_totals):
+        categories = expected.get(day, {})
+        day_expected = (
+            sum(count for count, _ in categories.values()),
+            sum(minutes for _, minutes in categories.values())
+        ) if categories else None
+        if categories != actual.get(day, {}) or day_expected != day_totals.get(day):
+            mismatched.add(day)
+    return sorted(mismatched)
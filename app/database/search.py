@@ -0,0 +1,232 @@
+"""
+Full-text search for the Daily Planner App.
+
+Searches session group names and activity descriptions and day notes.
+PostgreSQL uses generated tsvector columns with GIN indexes; SQLite uses
+FTS5 external-content tables kept in sync by triggers. Other databases fall
+back to unindexed ILIKE matching.
+
+The search objects are not part of the ORM models: they are created by the
+DDL hooks below whenever the tables are created, and by migration 4 on
+existing databases.
+"""
+import re
+from datetime import date
+from typing import List, NamedTuple, Optional
+from sqlalchemy import DDL, Date, Float, Integer, String, Text, event, literal, null, or_, select, text, union_all
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from .models import DayLog, MentorshipSession
+
+SEARCH_PAGE_SIZE = 20
+
+# Only the newest matches of each kind are ranked, so a word that appears in
+# most sessions costs a bounded amount of scoring work
+SEARCH_RANK_WINDOW = 10000
+
+# Text search configuration used by the PostgreSQL tsvector columns
+TS_CONFIG = "english"
+
+SEARCH_DDL = {
+    "postgresql": {
+        "mentorship_sessions": [
+            "ALTER TABLE mentorship_sessions ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('{TS_CONFIG}', coalesce(group_name, '') || ' ' "
+            "|| coalesce(activity_description, ''))) STORED",
+            "CREATE INDEX IF NOT EXISTS ix_mentorship_sessions_search_vector "
+            "ON mentorship_sessions USING GIN (search_vector)",
+        ],
+        "day_logs": [
+            "ALTER TABLE day_logs ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('{TS_CONFIG}', coalesce(notes, ''))) STORED",
+            "CREATE INDEX IF NOT EXISTS ix_day_logs_search_vector ON day_logs USING GIN (search_vector)",
+        ],
+    },
+    "sqlite": {
+        "mentorship_sessions": [
+            "CREATE VIRTUAL TABLE IF NOT EXISTS session_search USING fts5("
+            "group_name, activity_description, content='mentorship_sessions', content_rowid='id')",
+            "CREATE TRIGGER IF NOT EXISTS session_search_ai AFTER INSERT ON mentorship_sessions BEGIN "
+            "INSERT INTO session_search(rowid, group_name, activity_description) "
+            "VALUES (new.id, new.group_name, new.activity_description); END",
+            "CREATE TRIGGER IF NOT EXISTS session_search_ad AFTER DELETE ON mentorship_sessions BEGIN "
+            "INSERT INTO session_search(session_search, rowid, group_name, activity_description) "
+            "VALUES ('delete', old.id, old.group_name, old.activity_description); END",
+            "CREATE TRIGGER IF NOT EXISTS session_search_au "
+            "AFTER UPDATE OF group_name, activity_description ON mentorship_sessions BEGIN "
+            "INSERT INTO session_search(session_search, rowid, group_name, activity_description) "
+            "VALUES ('delete', old.id, old.group_name, old.activity_description); "
+            "INSERT INTO session_search(rowid, group_name, activity_description) "
+            "VALUES (new.id, new.group_name, new.activity_description); END",
+        ],
+        "day_logs": [
+            "CREATE VIRTUAL TABLE IF NOT EXISTS note_search USING fts5("
+            "notes, content='day_logs', content_rowid='id')",
+            "CREATE TRIGGER IF NOT EXISTS note_search_ai AFTER INSERT ON day_logs BEGIN "
+            "INSERT INTO note_search(rowid, notes) VALUES (new.id, new.notes); END",
+            "CREATE TRIGGER IF NOT EXISTS note_search_ad AFTER DELETE ON day_logs BEGIN "
+            "INSERT INTO note_search(note_search, rowid, notes) VALUES ('delete', old.id, old.notes); END",
+            "CREATE TRIGGER IF NOT EXISTS note_search_au AFTER UPDATE OF notes ON day_logs BEGIN "
+            "INSERT INTO note_search(note_search, rowid, notes) VALUES ('delete', old.id, old.notes); "
+            "INSERT INTO note_search(rowid, notes) VALUES (new.id, new.notes); END",
+        ],
+    },
+}
+
+# SQLite keeps the FTS tables when the content tables are dropped
+SEARCH_DROP_DDL = {
+    "sqlite": {
+        "mentorship_sessions": ["DROP TABLE IF EXISTS session_search"],
+        "day_logs": ["DROP TABLE IF EXISTS note_search"],
+    },
+}
+
+for _model in (MentorshipSession, DayLog):
+    for _dialect, _tables in SEARCH_DDL.items():
+        for _statement in _tables[_model.__tablename__]:
+            event.listen(_model.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+    for _dialect, _tables in SEARCH_DROP_DDL.items():
+        for _statement in _tables[_model.__tablename__]:
+            event.listen(_model.__table__, "after_drop", DDL(_statement).execute_if(dialect=_dialect))
+
+def create_search_index(conn: Connection):
+    """
+    Creates the search objects on an existing database and indexes its rows.
+
+    Safe to run more than once.
+
+    Args:
+        conn (Connection): A connection inside a transaction.
+    """
+    dialect = conn.dialect.name
+    for statements in SEARCH_DDL.get(dialect, {}).values():
+        for statement in statements:
+            conn.execute(text(statement))
+    if dialect == "sqlite":
+        # Index rows that existed before the triggers
+        for table in ("session_search", "note_search"):
+            conn.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+
+class SearchResult(NamedTuple):
+    """
+    One search hit.
+
+    Attributes:
+        kind (str): "session" for a mentorship session, "note" for day notes.
+        id (int): The MentorshipSession id, or the DayLog id for notes.
+        date (date): The day the hit belongs to.
+        group_name (Optional[str]): The session's group, None for notes.
+        category (Optional[str]): The session's category, None for notes.
+        text (str): The activity description or the notes.
+        rank (float): Relevance; results are ordered best first.
+    """
+    kind: str
+    id: int
+    date: date
+    group_name: Optional[str]
+    category: Optional[str]
+    text: Optional[str]
+    rank: float
+
+def _terms(query: str) -> List[str]:
+    """
+    Splits a search string into word terms, dropping search syntax.
+    """
+    return re.findall(r"\w+", query)
+
+def search(db: Session, query: str, limit: int = SEARCH_PAGE_SIZE, offset: int = 0) -> List[SearchResult]:
+    """
+    Searches session groups, activity descriptions and day notes.
+
+    Every word must match, as a prefix, so partially typed words find
+    results. The newest SEARCH_RANK_WINDOW matching sessions and notes are
+    ranked by relevance, ties newest first.
+
+    Args:
+        db (Session): The database session.
+        query (str): The words to search for.
+        limit (int, optional): Page size. Defaults to SEARCH_PAGE_SIZE.
+        offset (int, optional): Number of hits to skip. Defaults to 0.
+
+    Returns:
+        List[SearchResult]: One page of hits.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        # bm25() is lower for better matches; negate it so higher ranks first
+        stmt = text("""
+            SELECT 'session' AS kind, s.id, d.date, s.group_name, s.category,
+                   s.activity_description AS text, hits.rank
+            FROM (
+                SELECT rowid, -bm25(session_search) AS rank FROM session_search
+                WHERE session_search MATCH :match ORDER BY rowid DESC LIMIT :window
+            ) hits
+            JOIN mentorship_sessions s ON s.id = hits.rowid
+            JOIN day_logs d ON d.id = s.day_log_id
+            UNION ALL
+            SELECT 'note', d.id, d.date, NULL, NULL, d.notes, hits.rank
+            FROM (
+                SELECT rowid, -bm25(note_search) AS rank FROM note_search
+                WHERE note_search MATCH :match ORDER BY rowid DESC LIMIT :window
+            ) hits
+            JOIN day_logs d ON d.id = hits.rowid
+            ORDER BY rank DESC, date DESC
+            LIMIT :limit OFFSET :offset
+        """)
+    elif dialect == "postgresql":
+        match = " & ".join(f"{term}:*" for term in terms)
+        stmt = text(f"""
+            WITH q AS (SELECT to_tsquery('{TS_CONFIG}', :match) AS query)
+            SELECT 'session' AS kind, s.id, d.date, s.group_name, s.category,
+                   s.activity_description AS text, hits.rank
+            FROM (
+                SELECT id, ts_rank(search_vector, q.query) AS rank FROM mentorship_sessions, q
+                WHERE search_vector @@ q.query ORDER BY id DESC LIMIT :window
+            ) hits
+            JOIN mentorship_sessions s ON s.id = hits.id
+            JOIN day_logs d ON d.id = s.day_log_id
+            UNION ALL
+            SELECT 'note', d.id, d.date, NULL, NULL, d.notes, hits.rank
+            FROM (
+                SELECT id, ts_rank(search_vector, q.query) AS rank FROM day_logs, q
+                WHERE search_vector @@ q.query ORDER BY id DESC LIMIT :window
+            ) hits
+            JOIN day_logs d ON d.id = hits.id
+            ORDER BY rank DESC, date DESC
+            LIMIT :limit OFFSET :offset
+        """)
+    else:
+        return _search_unindexed(db, terms, limit, offset)
+
+    stmt = stmt.columns(
+        kind=String, id=Integer, date=Date, group_name=String, category=String, text=Text, rank=Float
+    )
+    rows = db.execute(stmt, {"match": match, "window": SEARCH_RANK_WINDOW, "limit": limit, "offset": offset})
+    return [SearchResult(*row) for row in rows]
+
+def _search_unindexed(db: Session, terms: List[str], limit: int, offset: int) -> List[SearchResult]:
+    """
+    ILIKE fallback for databases without a full-text index. Ranks are all zero.
+    """
+    session_filters = [
+        or_(MentorshipSession.group_name.ilike(f"%{term}%"), MentorshipSession.activity_description.ilike(f"%{term}%"))
+        for term in terms
+    ]
+    sessions = select(
+        literal("session").label("kind"), MentorshipSession.id, DayLog.date.label("date"),
+        MentorshipSession.group_name, MentorshipSession.category,
+        MentorshipSession.activity_description.label("text"), literal(0.0).label("rank")
+    ).join(DayLog).where(*session_filters)
+    notes = select(
+        literal("note"), DayLog.id, DayLog.date, null(), null(), DayLog.notes, literal(0.0)
+    ).where(*(DayLog.notes.ilike(f"%{term}%") for term in terms))
+    combined = union_all(sessions, notes).subquery()
+    rows = db.execute(
+        select(combined).order_by(combined.c.date.desc()).limit(limit).offset(offset)
+    )
+    return [SearchResult(*row) for row in rows]
@@ -1,115 +1,402 @@
 """
 Export module for the Daily Planner App.
 
-Handles exporting mentorship sessions to Excel files.
+Handles exporting mentorship sessions to Excel, CSV, JSON Lines and Parquet files.
+
+openpyxl and pyarrow are imported by their exporters when an export starts,
+so importing this module (and the GUI) does not pay for them.
 """
+import csv
+import importlib.util
+import json
 import os
-import pandas as pd
-from sqlalchemy.orm import Session, sessionmaker
-from .database import get_engine, MentorshipSession, DayLog
+from functools import lru_cache
+from itertools import chain, groupby
+from typing import Callable
+from sqlalchemy import String, cast
+from sqlalchemy.exc import SQLAlchemyError
+from .database import session_scope, MentorshipSession, DayLog
+from .reports import summary_report, format_minutes
 from datetime import datetime, timedelta, date
 
-def export_to_excel(start_date: date = None, end_date: date = None, filename: str = None, separate_sheets: bool = True) -> tuple[bool, str]:
+# Number of rows fetched from the database cursor at a time
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = ["Date", "Week", "Group Name", "Category", "Activity", "Duration"]
+
+@lru_cache(maxsize=64)
+def week_label(d: date) -> str:
     """
-    Exports mentorship sessions from the database to an Excel file.
+    Returns the ISO week label used to group sessions, e.g. "Week 3 - 2024".
+
+    Results are cached, so date-ordered rows only compute each label once.
+
+    Args:
+        d (date): The date to label.
+
+    Returns:
+        str: The week label, using the ISO week-numbering year.
+    """
+    iso_year, week_num, _ = d.isocalendar()
+    return f"Week {week_num} - {iso_year}"
+
+def query_sessions(db, start_date: date = None, end_date: date = None):
+    """
+    Builds the date-ordered query of sessions to export.
 
-    This function queries the database for sessions within the specified date range 
-    and writes them to an Excel file using pandas. It supports data retrieval for 
-    specific periods and organizing the data into separate sheets by week.
+    Each row is (date, group name, category, activity, duration), with the
+    "Xh Ym" duration text built by the database. Rows are streamed from a
+    server-side cursor in batches of EXPORT_BATCH_SIZE rather than loaded
+    all at once.
 
     Args:
-        start_date (date, optional): The start date for filtering sessions. 
-                                     If None, includes sessions from the beginning of time. 
+        db (Session): The database session.
+        start_date (date, optional): The first date to include.
+        end_date (date, optional): The last date to include (inclusive).
+
+    Returns:
+        Query: The streaming query.
+    """
+    query = db.query(
+        DayLog.date,
+        MentorshipSession.group_name,
+        MentorshipSession.category,
+        MentorshipSession.activity_description,
+        (
+            cast(MentorshipSession.duration_total_minutes // 60, String) + "h "
+            + cast(MentorshipSession.duration_total_minutes % 60, String) + "m"
+        ).label("duration")
+    ).join(MentorshipSession).order_by(DayLog.date)
+
+    if start_date:
+        query = query.filter(DayLog.date >= start_date)
+
+    if end_date:
+        # Inclusive of the end date
+        query = query.filter(DayLog.date <= end_date)
+
+    return query.yield_per(EXPORT_BATCH_SIZE)
+
+class Exporter:
+    """
+    Base class for export file formats.
+
+    The export driver streams date-ordered rows and hands them to
+    write_week() one ISO week at a time. Each row is a
+    (date, group name, category, activity, duration) sequence.
+
+    Attributes:
+        extension (str): File extension, without the dot.
+        filepath (str): The output file path.
+        separate_sheets (bool): Whether each week should be kept apart where
+                                the format supports it.
+    """
+    extension = ""
+    supports_summary = False
+
+    def __init__(self, filepath: str, separate_sheets: bool = True):
+        self.filepath = filepath
+        self.separate_sheets = separate_sheets
+
+    def write_summary(self, report: dict):
+        """
+        Writes a summary report ahead of the rows. Only called when
+        supports_summary is True.
+
+        Args:
+            report (dict): The result of reports.summary_report().
+        """
+        raise NotImplementedError
+
+    def write_week(self, week: str, rows):
+        """
+        Writes all rows of one week.
+
+        Args:
+            week (str): The week label, e.g. "Week 3 - 2024".
+            rows (Iterable): The week's rows, in date order.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Finishes writing and releases the output file.
+        """
+        raise NotImplementedError
+
+    def abort(self):
+        """
+        Releases the output file and deletes the partially written export.
+        """
+        try:
+            self.close()
+        except Exception:
+            pass
+        if os.path.exists(self.filepath):
+            os.remove(self.filepath)
+
+class ExcelExporter(Exporter):
+    """
+    Writes an .xlsx workbook in openpyxl write-only mode.
+
+    With separate_sheets each week gets its own worksheet; otherwise all
+    rows go to a single "All Sessions" sheet with a Week column.
+    """
+    extension = "xlsx"
+    supports_summary = True
+
+    def __init__(self, filepath: str, separate_sheets: bool = True):
+        from openpyxl import Workbook
+
+        super().__init__(filepath, separate_sheets)
+        self.workbook = Workbook(write_only=True)
+        self.sheet = None
+
+    def write_summary(self, report: dict):
+        sheet = self.workbook.create_sheet("Summary")
+        titles = {"overall": "Overall", "group": "By Group", "category": "By Category", "week": "By Week"}
+        for section, rows in report.items():
+            sheet.append([titles.get(section, section)])
+            sheet.append(["", "Sessions", "Total Minutes", "Total", "Average"])
+            for row in rows:
+                sheet.append([
+                    "All Sessions" if row.key is None else row.key,
+                    row.session_count,
+                    row.total_minutes,
+                    format_minutes(row.total_minutes),
+                    format_minutes(row.average_minutes)
+                ])
+            sheet.append([])
+
+    def write_week(self, week: str, rows):
+        if self.separate_sheets:
+            # Sheet name length limit is 31 chars
+            sheet = self.workbook.create_sheet(week[:31])
+            sheet.append([c for c in EXPORT_COLUMNS if c != "Week"])
+            for row in rows:
+                sheet.append(tuple(row))
+        else:
+            if self.sheet is None:
+                self.sheet = self.workbook.create_sheet("All Sessions")
+                self.sheet.append(EXPORT_COLUMNS)
+            for row_date, *rest in rows:
+                self.sheet.append([row_date, week, *rest])
+
+    def close(self):
+        self.workbook.save(self.filepath)
+
+class CsvExporter(Exporter):
+    """
+    Writes a single CSV file; the week is kept in the Week column.
+    """
+    extension = "csv"
+
+    def __init__(self, filepath: str, separate_sheets: bool = True):
+        super().__init__(filepath, separate_sheets)
+        self.file = open(filepath, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(EXPORT_COLUMNS)
+
+    def write_week(self, week: str, rows):
+        self.writer.writerows((row_date.isoformat(), week, *rest) for row_date, *rest in rows)
+
+    def close(self):
+        self.file.close()
+
+class JsonLinesExporter(Exporter):
+    """
+    Writes one JSON object per session; the week is kept in the Week key.
+    """
+    extension = "jsonl"
+
+    def __init__(self, filepath: str, separate_sheets: bool = True):
+        super().__init__(filepath, separate_sheets)
+        self.file = open(filepath, "w", encoding="utf-8")
+
+    def write_week(self, week: str, rows):
+        for row_date, *rest in rows:
+            record = dict(zip(EXPORT_COLUMNS, (row_date.isoformat(), week, *rest)))
+            self.file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        self.file.close()
+
+class ParquetExporter(Exporter):
+    """
+    Writes a columnar Parquet file. Requires pyarrow.
+
+    Rows are buffered and written as row groups of EXPORT_BATCH_SIZE rows;
+    the week is kept in the Week column.
+    """
+    extension = "parquet"
+
+    def __init__(self, filepath: str, separate_sheets: bool = True):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow).") from None
+        super().__init__(filepath, separate_sheets)
+        self.pa = pa
+        self.schema = pa.schema(
+            [("Date", pa.date32())] + [(name, pa.string()) for name in EXPORT_COLUMNS[1:]]
+        )
+        self.writer = pq.ParquetWriter(filepath, self.schema)
+        self.buffer = []
+
+    def write_week(self, week: str, rows):
+        for row_date, *rest in rows:
+            self.buffer.append((row_date, week, *rest))
+            if len(self.buffer) >= EXPORT_BATCH_SIZE:
+                self._flush()
+
+    def _flush(self):
+        if self.buffer:
+            columns = [list(column) for column in zip(*self.buffer)]
+            self.writer.write_table(self.pa.Table.from_arrays(columns, schema=self.schema))
+            self.buffer = []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+EXPORTERS = {
+    "xlsx": ExcelExporter,
+    "csv": CsvExporter,
+    "jsonl": JsonLinesExporter,
+    "parquet": ParquetExporter,
+}
+
+def available_formats() -> list[str]:
+    """
+    Returns the export formats usable in this installation.
+
+    Checks for pyarrow without importing it.
+
+    Returns:
+        list[str]: Format names, e.g. ["xlsx", "csv", "jsonl", "parquet"].
+    """
+    return [fmt for fmt in EXPORTERS if fmt != "parquet" or importlib.util.find_spec("pyarrow") is not None]
+
+def export_sessions(
+    start_date: date = None,
+    end_date: date = None,
+    filename: str = None,
+    separate_sheets: bool = True,
+    fmt: str = "xlsx",
+    on_progress: Callable[[int], None] = None,
+    include_summary: bool = False
+) -> tuple[bool, str]:
+    """
+    Exports mentorship sessions from the database in the given format.
+
+    Rows are streamed from the database and handed to the format's exporter
+    one ISO week at a time, so memory use stays flat regardless of the size
+    of the range.
+
+    Args:
+        start_date (date, optional): The start date for filtering sessions.
+                                     If None, includes sessions from the beginning of time.
                                      Defaults to None.
-        end_date (date, optional): The end date for filtering sessions (inclusive). 
-                                   If None, checks up to the current date/last entry. 
+        end_date (date, optional): The end date for filtering sessions (inclusive).
+                                   If None, checks up to the current date/last entry.
                                    Defaults to None.
-        filename (str, optional): The name of the output Excel file. 
-                                  If None, a timestamped filename is generated 
-                                  (e.g., "mentorship_log_YYYYMMDD_HHMMSS.xlsx"). 
+        filename (str, optional): The name of the output file.
+                                  If None, a timestamped filename is generated
+                                  (e.g., "mentorship_log_YYYYMMDD_HHMMSS.csv").
                                   Defaults to None.
-        separate_sheets (bool, optional): Configuration to split data into weekly sheets.
-                                          - If True, creates a separate worksheet for each week.
-                                          - If False, puts all data into a single "All Sessions" sheet.
+        separate_sheets (bool, optional): Split data into weekly sheets where the
+                                          format supports it (Excel only).
                                           Defaults to True.
+        fmt (str, optional): One of the keys of EXPORTERS. Defaults to "xlsx".
+        on_progress (Callable[[int], None], optional): Called after each week with the
+                                                       number of rows written so far.
+                                                       If it raises, the export stops
+                                                       and the partial file is removed.
+        include_summary (bool, optional): Add a "Summary" sheet with totals by group,
+                                          category and week (Excel only).
+                                          Defaults to False.
 
     Returns:
         tuple[bool, str]: A tuple containing:
                           - bool: True if the export was successful, False otherwise.
                           - str: A success message with the filepath or an error description.
     """
-    engine = get_engine()
-    SessionLocal = sessionmaker(bind=engine)
-    
-    try:
-        with SessionLocal() as db:
-            query = db.query(
-                DayLog.date,
-                MentorshipSession.group_name,
-                MentorshipSession.category,
-                MentorshipSession.activity_description,
-                MentorshipSession.duration_hours,
-                MentorshipSession.duration_minutes
-            ).join(MentorshipSession).order_by(DayLog.date)
-
-            if start_date:
-                query = query.filter(DayLog.date >= start_date)
-            
-            if end_date:
-                # Inclusive of the end date
-                query = query.filter(DayLog.date <= end_date)
-            
-            results = query.all()
-    except Exception as e:
-        return False, f"Database Error: {str(e)}"
-    
-    if not results:
-        return False, "No data to export for the selected range."
-
-    # Prepare data for DataFrame
-    data = []
-    for row in results:
-        date_obj = row.date
-        week_num = date_obj.isocalendar()[1]
-        year = date_obj.year
-        week_label = f"Week {week_num} - {year}"
-        
-        data.append({
-            "Date": date_obj,
-            "Week": week_label,
-            "Group Name": row.group_name,
-            "Category": row.category,
-            "Activity": row.activity_description,
-            "Duration": f"{row.duration_hours}h {row.duration_minutes}m"
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Ensure exports directory exists
-    export_dir = "exports"
-    if not os.path.exists(export_dir):
-        os.makedirs(export_dir)
-        
-    if not filename:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"mentorship_log_{timestamp}.xlsx"
-    
-    filepath = os.path.join(export_dir, filename)
-
-    # Write to Excel
+    if fmt not in EXPORTERS:
+        return False, f"Unknown export format: {fmt}"
+
+    exporter = None
     try:
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-            if separate_sheets:
-                # Separate sheets for each week
-                weeks = df['Week'].unique()
-                for week in weeks:
-                    week_df = df[df['Week'] == week].drop(columns=['Week'])
-                    # Sheet name length limit is 31 chars
-                    sheet_name = week[:31] 
-                    week_df.to_excel(writer, sheet_name=sheet_name, index=False)
-            else:
-                # Single sheet with all data
-                df.to_excel(writer, sheet_name="All Sessions", index=False)
+        with session_scope() as db:
+            rows = iter(query_sessions(db, start_date, end_date))
+            first_row = next(rows, None)
+            if first_row is None:
+                return False, "No data to export for the selected range."
+
+            # Ensure exports directory exists
+            export_dir = "exports"
+            if not os.path.exists(export_dir):
+                os.makedirs(export_dir)
+
+            if not filename:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                filename = f"mentorship_log_{timestamp}.{EXPORTERS[fmt].extension}"
+
+            filepath = os.path.join(export_dir, filename)
+
+            exporter = EXPORTERS[fmt](filepath, separate_sheets)
+            if include_summary and exporter.supports_summary:
+                exporter.write_summary(summary_report(db, start_date, end_date))
+            rows = chain([first_row], rows)
+            rows_written = [0]
+            if on_progress:
+                rows = _counted(rows, rows_written)
+            # Rows are date ordered, so each week is one contiguous group
+            for week, week_rows in groupby(rows, key=lambda row: week_label(row[0])):
+                exporter.write_week(week, week_rows)
+                if on_progress:
+                    on_progress(rows_written[0])
+            exporter.close()
         return True, f"Exported to {filepath}"
+    except SQLAlchemyError as e:
+        if exporter:
+            exporter.abort()
+        return False, f"Database Error: {str(e)}"
     except Exception as e:
-        return False, str(e)
+        if exporter:
+            exporter.abort()
+        return False, str(e) or type(e).__name__
+
+def _counted(rows, counter: list):
+    """
+    Yields rows unchanged while counting them in counter[0].
+    """
+    for row in rows:
+        counter[0] += 1
+        yield row
+
+def export_to_excel(
+    start_date: date = None,
+    end_date: date = None,
+    filename: str = None,
+    separate_sheets: bool = True,
+    include_summary: bool = False
+) -> tuple[bool, str]:
+    """
+    Exports mentorship sessions from the database to an Excel file.
+
+    See export_sessions() for the details of the streaming export.
+
+    Args:
+        start_date (date, optional): The start date for filtering sessions. Defaults to None.
+        end_date (date, optional): The end date for filtering sessions (inclusive). Defaults to None.
+        filename (str, optional): The name of the output Excel file. Defaults to None.
+        separate_sheets (bool, optional): Creates a separate worksheet for each week if True,
+                                          a single "All Sessions" sheet otherwise.
+                                          Defaults to True.
+        include_summary (bool, optional): Add a "Summary" sheet first. Defaults to False.
+
+    Returns:
+        tuple[bool, str]: Success flag and a message with the filepath or an error description.
+    """
+    return export_sessions(start_date, end_date, filename, separate_sheets, fmt="xlsx", include_summary=include_summary)
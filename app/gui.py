@@ -1,13 +1,28 @@
+import asyncio
+import os
+import time
+from functools import partial
 import flet as ft
 from datetime import date, timedelta, datetime
-from app.database import get_db, get_sessions_for_day, add_mentorship_session, update_mentorship_session
+from sqlalchemy.exc import SQLAlchemyError
+from app.database import aio, get_journal, SEARCH_PAGE_SIZE
 from app.config import SESSION_CATEGORIES
-from app.export import export_to_excel
+from app.jobs import job_runner, CANCELLED
+from app import metrics
+from app.reports import overall_totals, totals_by, format_minutes
 
-def main(page: ft.Page):
+# Seconds between attempts to sync the offline journal while the database is unreachable
+JOURNAL_RETRY_SECONDS = float(os.getenv("JOURNAL_RETRY_SECONDS", "10"))
+
+async def main(page: ft.Page):
     """
     Main entry point for the Flet GUI application.
 
+    Handlers that touch the database are coroutines using the async
+    database layer, so a slow query does not stall the page's event loop.
+    Session writes go to the offline journal and are synced in the
+    background, so logging a session never waits on the network.
+
     Args:
         page (ft.Page): The Flet page instance used to render the UI.
     """
@@ -19,6 +34,13 @@ def main(page: ft.Page):
 
     # State
     current_month = date.today().replace(day=1)
+    # Background job callbacks run on worker threads and hand their page
+    # updates to this loop, where every other handler runs
+    loop = asyncio.get_running_loop()
+    journal = get_journal()
+    sync_task = None
+    # refresh_sessions() of the most recently opened day dialog
+    refresh_open_day = None
     
     # Components
     
@@ -34,7 +56,22 @@ def main(page: ft.Page):
         ],
         alignment=ft.MainAxisAlignment.SPACE_EVENLY
     )
+    # Grid cells are created once and reused for every month: up to six
+    # leading blanks, then one cell per day. Changing a month only updates
+    # their visibility, colour and click target, so Flet sends a small patch
+    # instead of the whole grid.
+    blank_cells = [ft.Container(visible=False) for _ in range(6)]
+    day_cells = [
+        ft.Container(
+            content=ft.Text(str(d), color=ft.Colors.WHITE),
+            bgcolor=ft.Colors.GREY_800,
+            border_radius=8,
+            alignment=ft.Alignment(0, 0),
+            ink=True,
+        ) for d in range(1, 32)
+    ]
     calendar_grid = ft.GridView(
+        controls=blank_cells + day_cells,
         expand=True,
         runs_count=7,
         max_extent=120,
@@ -63,68 +100,187 @@ def main(page: ft.Page):
         next_month = (d.replace(day=28) + timedelta(days=4)).replace(day=1)
         return (next_month - d).days
 
-    def update_calendar():
+    def shift_month(d: date, delta: int) -> date:
+        """
+        Returns the first day of the month before or after the given month.
+
+        Args:
+            d (date): The first day of a month.
+            delta (int): +1 for the next month, -1 for the previous one.
+
+        Returns:
+            date: The first day of the adjacent month.
+        """
+        if delta > 0:
+            return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return (d.replace(day=1) - timedelta(days=1)).replace(day=1)
+
+    # Running background loads of month summaries, keyed by month
+    prefetches = {}
+
+    @metrics.timed()
+    async def prefetch_month(month: date):
+        """
+        Loads a month's summary into the shared month cache.
+
+        A write to the month invalidates the cache entry, and a load that
+        raced the write is discarded by the cache, so prefetched data is
+        never shown stale.
+        """
+        try:
+            async with aio.async_session_scope() as db:
+                await aio.get_month_summary(db, month.year, month.month)
+        except SQLAlchemyError:
+            # Best effort; the month is queried normally when shown
+            pass
+        finally:
+            prefetches.pop(month, None)
+
+    def prefetch_adjacent_months():
+        """
+        Starts loading the previous and next months in the background after
+        a render, so the chevrons usually draw from the month cache instead
+        of waiting on the database.
+        """
+        for delta in (-1, 1):
+            month = shift_month(current_month, delta)
+            if month not in prefetches:
+                prefetches[month] = asyncio.ensure_future(prefetch_month(month))
+
+    @metrics.timed()
+    async def update_calendar():
         """
         Refresh the calendar grid to show days for the current selected month.
         
-        This function clears the current grid and repopulates it with:
-        - Empty slots for days before the 1st of the month.
-        - Buttons for each day of the month, colored green if sessions exist.
+        Reuses the grid cells:
+        - Blank cells are shown for days before the 1st of the month.
+        - Day cells are shown for each day of the month, colored green if sessions exist.
+
+        Logged days come from a single month summary query. The month is
+        read once up front; if another navigation changes it while the
+        summary loads, this render gives up and leaves the grid to that one.
         """
-        month_label.value = current_month.strftime("%B %Y")
-        calendar_grid.controls.clear()
-        
+        month = current_month
+        if month in prefetches:
+            # Already being loaded in the background; wait for it instead of querying twice
+            await asyncio.shield(prefetches[month])
+            if current_month != month:
+                return
+        try:
+            async with aio.async_session_scope() as db:
+                summary = await aio.get_month_summary(db, month.year, month.month)
+        except SQLAlchemyError:
+            # Offline: still render the month, with the unsynced days below
+            summary = {}
+            show_offline_notice()
+        if current_month != month:
+            return
+
+        month_label.value = month.strftime("%B %Y")
+
         # Empty slots for the start of the month
-        start_weekday = current_month.weekday()
-        for _ in range(start_weekday):
-            calendar_grid.controls.append(ft.Container())
+        start_weekday = month.weekday()
+        for i, cell in enumerate(blank_cells):
+            cell.visible = i < start_weekday
             
         # Days
-        days_in_month = get_days_in_month(current_month)
-        db = next(get_db())
-        
-        for d in range(1, days_in_month + 1):
-            day_date = current_month.replace(day=d)
-            sessions = get_sessions_for_day(db, day_date)
-            is_logged = len(sessions) > 0
-            
-            btn_style = ft.ButtonStyle(
-                bgcolor=ft.Colors.GREEN_900 if is_logged else ft.Colors.GREY_800,
-                color=ft.Colors.WHITE,
-                shape=ft.RoundedRectangleBorder(radius=8),
-            )
-            
-            calendar_grid.controls.append(
-                ft.ElevatedButton(
-                    str(d),
-                    style=btn_style,
-                    on_click=lambda e, date=day_date: open_day_view(date)
-                )
-            )
+        days_in_month = get_days_in_month(month)
+        for d, cell in enumerate(day_cells, start=1):
+            cell.visible = d <= days_in_month
+            if cell.visible:
+                day_date = month.replace(day=d)
+                cell.bgcolor = ft.Colors.GREEN_900 if day_date in summary else ft.Colors.GREY_800
+                cell.on_click = partial(open_day_view, day_date)
+        for day_date in journal.pending_dates():
+            mark_day_logged(day_date)
         
         page.update()
 
-    def change_month(delta: int):
+    def mark_day_logged(day_date: date):
+        """
+        Colors a day's cell green without reloading the month.
+
+        Args:
+            day_date (date): A day that now has sessions. Ignored unless it is in the shown month.
+        """
+        if day_date.replace(day=1) == current_month:
+            day_cells[day_date.day - 1].bgcolor = ft.Colors.GREEN_900
+
+    def show_offline_notice():
+        """
+        Tells the user the database is unreachable and sessions are kept locally.
+
+        The caller updates the page.
+        """
+        page.snack_bar = ft.SnackBar(ft.Text("Database unreachable; new sessions are saved locally and will sync"))
+        page.snack_bar.open = True
+
+    async def sync_journal():
+        """
+        Replays the offline journal on a worker thread until it is empty.
+
+        Retries every JOURNAL_RETRY_SECONDS while the database is unreachable.
+        Afterwards repaints the calendar and the open day dialog, and tells
+        other clients to repaint theirs.
+        """
+        nonlocal sync_task
+        notified = False
+        try:
+            while True:
+                try:
+                    await asyncio.to_thread(journal.replay)
+                except SQLAlchemyError:
+                    if not notified:
+                        show_offline_notice()
+                        page.update()
+                        notified = True
+                    await asyncio.sleep(JOURNAL_RETRY_SECONDS)
+                    continue
+                # Sessions logged while the replay ran are picked up by another pass
+                if not journal.pending_count():
+                    break
+        finally:
+            # Also on an unexpected error, so the next request_sync() starts over
+            sync_task = None
+
+        page.pubsub.send_others(("journal_synced", None))
+        await update_calendar()
+        if refresh_open_day:
+            await refresh_open_day()
+
+    def request_sync():
+        """
+        Starts sync_journal() unless it is already running.
+        """
+        nonlocal sync_task
+        if sync_task is None:
+            sync_task = asyncio.ensure_future(sync_journal())
+
+    async def change_month(delta: int, e=None):
         """
         Changes the currently viewed month by a given delta.
 
         Args:
             delta (int): The number of months to move. +1 for next month, -1 for previous.
+            e (ft.ControlEvent, optional): The click event, when used as a handler.
         """
         nonlocal current_month
-        if delta > 0:
-            current_month = (current_month.replace(day=28) + timedelta(days=4)).replace(day=1)
-        else:
-            current_month = (current_month.replace(day=1) - timedelta(days=1)).replace(day=1)
-        update_calendar()
+        current_month = shift_month(current_month, delta)
+        await update_calendar()
+        prefetch_adjacent_months()
 
-    def open_day_view(day_date: date):
+    @metrics.timed()
+    async def open_day_view(day_date: date, e=None):
         """
         Opens a dialog to view and log sessions for a specific date.
 
+        The dialog opens at once; the day's saved sessions load in the background.
+
         Args:
             day_date (date): The date to view.
+            e (ft.ControlEvent, optional): The click event, when used as a handler.
         """
+        nonlocal refresh_open_day
         # Form Controls
         group_input = ft.TextField(label="Group Number or Name", expand=True)
         category_dropdown = ft.Dropdown(
@@ -140,7 +296,7 @@ def main(page: ft.Page):
         
         # Edit state
         editing_session_id = None
-        log_button = ft.ElevatedButton("Log Session", on_click=lambda e: log_session(e), bgcolor=ft.Colors.GREEN_600, color=ft.Colors.WHITE)
+        log_button = ft.ElevatedButton("Log Session", bgcolor=ft.Colors.GREEN_600, color=ft.Colors.WHITE)
         cancel_edit_btn = ft.TextButton("Cancel Edit", visible=False)
 
         def reset_form():
@@ -162,8 +318,9 @@ def main(page: ft.Page):
             group_input.value = session.group_name
             category_dropdown.value = session.category
             activity_input.value = session.activity_description
-            hours_input.value = str(session.duration_hours)
-            minutes_input.value = str(session.duration_minutes)
+            hours, minutes = divmod(session.duration_total_minutes, 60)
+            hours_input.value = str(hours)
+            minutes_input.value = str(minutes)
             
             log_button.text = "Update Session"
             log_button.bgcolor = ft.Colors.ORANGE_700
@@ -171,18 +328,22 @@ def main(page: ft.Page):
             cancel_edit_btn.on_click = lambda e: reset_form()
             page.update()
 
-        def refresh_sessions():
+        # The day's sessions from the database; drawn as soon as the dialog
+        # opens, before they have loaded, so an unreachable database never
+        # delays logging
+        db_sessions = []
+        db_state = "loading" # then "loaded" or "offline"
+
+        def render_sessions():
             """
-            Fetches sessions for the selected day from the database and updates the list in the dialog.
+            Draws the day's database sessions, then those still waiting in the offline journal.
             """
             session_list.controls.clear()
-            db = next(get_db())
-            sessions = get_sessions_for_day(db, day_date)
-            for s in sessions:
+            for s in db_sessions:
                 session_list.controls.append(
                     ft.ListTile(
                         title=ft.Text(f"{s.group_name} - {s.category}"),
-                        subtitle=ft.Text(f"{s.activity_description}\nDuration: {s.duration_hours}h {s.duration_minutes}m"),
+                        subtitle=ft.Text(f"{s.activity_description}\nDuration: {format_minutes(s.duration_total_minutes)}"),
                         leading=ft.Icon(ft.Icons.EVENT_NOTE),
                         trailing=ft.IconButton(
                             ft.Icons.EDIT, 
@@ -191,13 +352,41 @@ def main(page: ft.Page):
                         )
                     )
                 )
+            for p in journal.pending_sessions(day_date):
+                minutes = (p["hours"] or 0) * 60 + (p["minutes"] or 0)
+                session_list.controls.append(
+                    ft.ListTile(
+                        title=ft.Text(f"{p['group_name']} - {p['category']}"),
+                        subtitle=ft.Text(f"{p['activity']}\nDuration: {format_minutes(minutes)} (waiting to sync)"),
+                        leading=ft.Icon(ft.Icons.CLOUD_OFF),
+                    )
+                )
+            if db_state == "loading":
+                session_list.controls.append(ft.Text("Loading saved sessions...", color=ft.Colors.GREY_400))
+            elif db_state == "offline":
+                session_list.controls.append(ft.Text("Database unreachable; saved sessions may be missing", color=ft.Colors.ORANGE_400))
             page.update()
 
-        def log_session(e):
+        async def refresh_sessions():
+            """
+            Fetches sessions for the selected day from the database and redraws the list in the dialog.
+            """
+            nonlocal db_sessions, db_state
+            try:
+                async with aio.async_session_scope() as db:
+                    db_sessions = list(await aio.get_sessions_for_day(db, day_date))
+                db_state = "loaded"
+            except SQLAlchemyError:
+                db_state = "offline"
+            render_sessions()
+
+        @metrics.timed()
+        async def log_session(e):
             """
             Callback to log a new session when the 'Log Session' button is clicked.
             
-            Validates input and saves the session to the database.
+            Validates input and records the session in the offline journal, then
+            starts a background sync to the database.
             """
             if not group_input.value or not category_dropdown.value:
                 page.snack_bar = ft.SnackBar(ft.Text("Please fill in Group and Category"))
@@ -214,35 +403,38 @@ def main(page: ft.Page):
                 page.update()
                 return
 
-            db = next(get_db())
-            
+            if hours_part * 60 + mins_part < 0:
+                page.snack_bar = ft.SnackBar(ft.Text("Duration cannot be negative"))
+                page.snack_bar.open = True
+                page.update()
+                return
+
+            fields = {
+                "group_name": group_input.value,
+                "category": category_dropdown.value,
+                "activity": activity_input.value,
+                "hours": hours_part,
+                "minutes": mins_part,
+            }
             if editing_session_id:
-                update_mentorship_session(
-                    db, editing_session_id,
-                    group_input.value, 
-                    category_dropdown.value, 
-                    activity_input.value, 
-                    hours_part, mins_part
-                )
+                journal.record("update", session_id=editing_session_id, **fields)
                 msg = "Session Updated!"
             else:
-                add_mentorship_session(
-                    db, day_date, 
-                    group_input.value, 
-                    category_dropdown.value, 
-                    activity_input.value, 
-                    hours_part, mins_part
-                )
+                journal.record("add", log_date=day_date, **fields)
                 msg = "Session Logged!"
             
             page.snack_bar = ft.SnackBar(ft.Text(msg))
             page.snack_bar.open = True
             reset_form()
-            refresh_sessions()
-            update_calendar() # Update main calendar to show green status
+            render_sessions()
+            mark_day_logged(day_date) # Only this day's cell changes color
             page.update()
+            # Other clients are told to repaint once the sync has written it
+            request_sync()
 
-        refresh_sessions()
+        log_button.on_click = log_session
+        refresh_open_day = refresh_sessions
+        render_sessions()
 
         dlg = ft.AlertDialog(
             title=ft.Text(f"Sessions for {day_date.strftime('%A, %B %d')}"),
@@ -267,11 +459,15 @@ def main(page: ft.Page):
         page.overlay.append(dlg)
         dlg.open = True
         page.update()
+        asyncio.ensure_future(refresh_sessions())
 
     def open_export_dialog(e):
         """
-        Opens a dialog to configure and perform data export to Excel.
+        Opens a dialog to configure and perform data export to Excel, CSV, JSON Lines or Parquet.
         """
+        # Imported here so startup does not load the export module
+        from app.export import export_sessions, available_formats
+
         # State for date pickers
         start_date_value = current_month
         end_date_value = date.today()
@@ -337,22 +533,82 @@ def main(page: ft.Page):
             # end_picker.value = end_date_value
             page.update()
 
+        @metrics.timed()
         def export_action(e):
+            """
+            Starts the export on the background job runner.
+
+            The dialog shows progress and a Cancel button while the export runs;
+            the result is reported in a snack bar when the job finishes.
+
+            Returns:
+                Job: The export job.
+            """
             # Determine if we should use separate sheets
             use_separate_sheets = True
             if (end_date_value - start_date_value).days > 7:
                 use_separate_sheets = sheet_option.value == "separate"
-            
-            success, msg = export_to_excel(
-                start_date=start_date_value, 
-                end_date=end_date_value,
-                separate_sheets=use_separate_sheets
+
+            @metrics.timed("export_job")
+            def run_export(job, start_date, end_date, separate_sheets, fmt, include_summary):
+                return export_sessions(
+                    start_date=start_date,
+                    end_date=end_date,
+                    separate_sheets=separate_sheets,
+                    fmt=fmt,
+                    on_progress=lambda rows: job.report(rows, f"{rows:,} rows exported"),
+                    include_summary=include_summary
+                )
+
+            last_refresh = 0.0
+
+            def paint_progress(message):
+                progress_text.value = message
+                page.update()
+
+            def paint_done(msg):
+                page.snack_bar = ft.SnackBar(ft.Text(msg))
+                page.snack_bar.open = True
+                dlg.open = False
+                page.update()
+
+            def show_progress(job):
+                nonlocal last_refresh
+                # Throttle repaints; exports can report thousands of weeks
+                now = time.monotonic()
+                if now - last_refresh >= 0.2:
+                    last_refresh = now
+                    loop.call_soon_threadsafe(paint_progress, job.message)
+
+            def export_done(job):
+                if job.status == CANCELLED:
+                    msg = "Export cancelled."
+                elif job.error:
+                    msg = f"Export failed: {job.error}"
+                else:
+                    success, msg = job.result
+                loop.call_soon_threadsafe(paint_done, msg)
+
+            job = job_runner.submit(
+                run_export,
+                start_date_value,
+                end_date_value,
+                use_separate_sheets,
+                format_dropdown.value,
+                summary_checkbox.value,
+                name="export",
+                on_progress=show_progress,
+                on_done=export_done
             )
-            
-            page.snack_bar = ft.SnackBar(ft.Text(msg))
-            page.snack_bar.open = True
-            dlg.open = False
+
+            progress_text.value = "Starting export..."
+            dlg.content.controls.append(
+                ft.Row([ft.ProgressRing(width=16, height=16), progress_text])
+            )
+            export_button.disabled = True
+            cancel_button.on_click = lambda e: job_runner.cancel(job.id)
             page.update()
+            return job
 
         # Sheet option selector (only shown if date range > 7 days)
         sheet_option = ft.RadioGroup(
@@ -363,13 +619,26 @@ def main(page: ft.Page):
             value="separate"
         )
 
+        format_labels = {"xlsx": "Excel (.xlsx)", "csv": "CSV", "jsonl": "JSON Lines", "parquet": "Parquet"}
+        format_dropdown = ft.Dropdown(
+            label="Format",
+            options=[ft.dropdown.Option(key=fmt, text=format_labels[fmt]) for fmt in available_formats()],
+            value="xlsx",
+            width=200
+        )
+
+        summary_checkbox = ft.Checkbox(label="Include summary sheet (Excel)", value=True)
+        progress_text = ft.Text("")
+        cancel_button = ft.TextButton("Cancel", on_click=lambda e: (setattr(dlg, 'open', False), page.update()))
+        export_button = ft.ElevatedButton("Export", on_click=export_action, bgcolor=ft.Colors.GREEN_600, color=ft.Colors.WHITE)
+
         # Calculate if we need to show the sheet option
         show_sheet_option = (end_date_value - start_date_value).days > 7
 
         dlg = ft.AlertDialog(
-            title=ft.Text("Export to Excel"),
+            title=ft.Text("Export Data"),
             content=ft.Column(
-                height=400 if show_sheet_option else 300,
+                height=520 if show_sheet_option else 420,
                 width=400,
                 controls=[
                     ft.Text("Select Date Range", weight=ft.FontWeight.BOLD),
@@ -405,26 +674,223 @@ def main(page: ft.Page):
                             ft.Chip(label=ft.Text("All Time"), on_click=lambda e: set_range("All Time")),
                         ]
                     ),
+                    ft.Divider(),
+                    format_dropdown,
+                    summary_checkbox,
                 ] + ([ft.Divider(), ft.Text("Export Options", weight=ft.FontWeight.BOLD), sheet_option] if show_sheet_option else [])
             ),
+            actions=[cancel_button, export_button],
+        )
+        page.overlay.append(dlg)
+        dlg.open = True
+        page.update()
+
+    async def open_stats_dialog(e):
+        """
+        Opens a dialog with totals for the currently viewed month.
+
+        Figures come from the reporting module's GROUP BY queries.
+        """
+        start_date = current_month
+        end_date = current_month.replace(day=get_days_in_month(current_month))
+        try:
+            async with aio.async_session_scope() as db:
+                overall = await db.run_sync(overall_totals, start_date, end_date)
+                by_category = await db.run_sync(totals_by, "category", start_date, end_date)
+                by_group = await db.run_sync(totals_by, "group", start_date, end_date)
+        except SQLAlchemyError:
+            show_offline_notice()
+            page.update()
+            return
+
+        def section(title, rows):
+            return [ft.Text(title, weight=ft.FontWeight.BOLD)] + [
+                ft.Text(f"{row.key}: {row.session_count} sessions, {format_minutes(row.total_minutes)}")
+                for row in rows
+            ]
+
+        dlg = ft.AlertDialog(
+            title=ft.Text(f"Stats for {current_month.strftime('%B %Y')}"),
+            content=ft.Column(
+                width=400,
+                height=400,
+                scroll=ft.ScrollMode.AUTO,
+                controls=[
+                    ft.Text(f"Sessions: {overall.session_count}"),
+                    ft.Text(f"Total time: {format_minutes(overall.total_minutes)}"),
+                    ft.Text(f"Average session: {format_minutes(overall.average_minutes)}"),
+                    ft.Divider(),
+                ] + section("By Category", by_category) + [ft.Divider()] + section("By Group", by_group)
+            ),
+            actions=[
+                ft.TextButton("Close", on_click=lambda e: (setattr(dlg, 'open', False), page.update())),
+            ],
+        )
+        page.overlay.append(dlg)
+        dlg.open = True
+        page.update()
+
+    def open_search_dialog(e):
+        """
+        Opens a dialog to search sessions and day notes.
+
+        Results come from the full-text index one page at a time; clicking a
+        result jumps to its month and opens that day.
+        """
+        results_list = ft.Column(scroll=ft.ScrollMode.AUTO, expand=True)
+        status_text = ft.Text("")
+        offset = 0
+
+        async def go_to_day(day_date, e=None):
+            nonlocal current_month
+            dlg.open = False
+            current_month = day_date.replace(day=1)
+            await update_calendar()
+            prefetch_adjacent_months()
+            await open_day_view(day_date)
+
+        async def load_page(reset, e=None):
+            nonlocal offset
+            if reset:
+                offset = 0
+                results_list.controls.clear()
+            try:
+                async with aio.async_session_scope() as db:
+                    hits = await aio.search(db, search_input.value or "", limit=SEARCH_PAGE_SIZE + 1, offset=offset)
+            except SQLAlchemyError:
+                status_text.value = "Search is unavailable while the database is unreachable."
+                show_offline_notice()
+                page.update()
+                return
+            more_button.visible = len(hits) > SEARCH_PAGE_SIZE
+            hits = hits[:SEARCH_PAGE_SIZE]
+            offset += len(hits)
+            for hit in hits:
+                title = f"{hit.group_name} - {hit.category}" if hit.kind == "session" else "Day notes"
+                results_list.controls.append(
+                    ft.ListTile(
+                        title=ft.Text(f"{hit.date.strftime('%Y-%m-%d')}: {title}"),
+                        subtitle=ft.Text(hit.text or "", max_lines=2),
+                        leading=ft.Icon(ft.Icons.EVENT_NOTE if hit.kind == "session" else ft.Icons.NOTES),
+                        on_click=partial(go_to_day, hit.date)
+                    )
+                )
+            status_text.value = f"{offset} results" if offset else "No matches."
+            page.update()
+
+        search_input = ft.TextField(
+            label="Search sessions and notes",
+            autofocus=True,
+            expand=True,
+            on_submit=partial(load_page, True)
+        )
+        more_button = ft.TextButton("More results", visible=False, on_click=partial(load_page, False))
+
+        dlg = ft.AlertDialog(
+            title=ft.Text("Search"),
+            content=ft.Column(
+                width=500,
+                height=450,
+                controls=[
+                    ft.Row([
+                        search_input,
+                        ft.IconButton(ft.Icons.SEARCH, on_click=partial(load_page, True)),
+                    ]),
+                    status_text,
+                    results_list,
+                    more_button,
+                ]
+            ),
             actions=[
-                ft.TextButton("Cancel", on_click=lambda e: (setattr(dlg, 'open', False), page.update())),
-                ft.ElevatedButton("Export", on_click=export_action, bgcolor=ft.Colors.GREEN_600, color=ft.Colors.WHITE),
+                ft.TextButton("Close", on_click=lambda e: (setattr(dlg, 'open', False), page.update())),
             ],
         )
         page.overlay.append(dlg)
         dlg.open = True
         page.update()
 
+    async def on_broadcast(message):
+        """
+        Handles pubsub messages from other clients of this process.
+
+        Args:
+            message (tuple): ("journal_synced", None) after another client synced
+                             the offline journal to the database.
+        """
+        kind, _ = message
+        if kind == "journal_synced":
+            await update_calendar()
+
+    page.pubsub.subscribe(on_broadcast)
+
+    def open_debug_overlay(e):
+        """
+        Opens a dialog with the instrumentation figures for this process.
+
+        Only offered when app.metrics is enabled (METRICS_ENABLED=1).
+        """
+        def render():
+            snapshot = metrics.metrics.snapshot()
+            rows = [
+                ft.DataRow(cells=[
+                    ft.DataCell(ft.Text(name)),
+                    ft.DataCell(ft.Text(str(stats["calls"]))),
+                    ft.DataCell(ft.Text(f"{stats['avg_ms']:.1f}")),
+                    ft.DataCell(ft.Text(f"{stats['max_ms']:.1f}")),
+                    ft.DataCell(ft.Text(f"{stats['avg_queries']:.1f}")),
+                    ft.DataCell(ft.Text(f"{stats['avg_query_ms']:.1f}")),
+                    ft.DataCell(ft.Text(f"{stats['avg_other_ms']:.1f}")),
+                ])
+                for name, stats in sorted(snapshot["operations"].items())
+            ]
+            content.controls = [
+                ft.DataTable(
+                    columns=[
+                        ft.DataColumn(ft.Text(label))
+                        for label in ("Operation", "Calls", "Avg ms", "Max ms", "Queries", "DB ms", "Other ms")
+                    ],
+                    rows=rows,
+                ),
+                ft.Text(f"Slow queries (>= {metrics.SLOW_QUERY_MS:.0f} ms)", weight=ft.FontWeight.BOLD),
+            ] + [
+                ft.Text(f"{q['ms']:.0f} ms [{q['operation']}] {q['statement'][:120]}", size=12)
+                for q in reversed(snapshot["slow_queries"])
+            ]
+            page.update()
+
+        def dump(e):
+            os.makedirs("exports", exist_ok=True)
+            path = metrics.metrics.dump(os.path.join("exports", f"metrics_{datetime.now():%Y%m%d_%H%M%S}.json"))
+            page.snack_bar = ft.SnackBar(ft.Text(f"Metrics written to {path}"))
+            page.snack_bar.open = True
+            render()
+
+        content = ft.Column(width=700, height=450, scroll=ft.ScrollMode.AUTO)
+        dlg = ft.AlertDialog(
+            title=ft.Text("Debug Metrics"),
+            content=content,
+            actions=[
+                ft.TextButton("Reset", on_click=lambda e: (metrics.metrics.reset(), render())),
+                ft.TextButton("Refresh", on_click=lambda e: render()),
+                ft.TextButton("Dump JSON", on_click=dump),
+                ft.TextButton("Close", on_click=lambda e: (setattr(dlg, 'open', False), page.update())),
+            ],
+        )
+        page.overlay.append(dlg)
+        dlg.open = True
+        render()
+
     # Layout
     header = ft.Row(
         controls=[
-            ft.IconButton(ft.Icons.CHEVRON_LEFT, on_click=lambda e: change_month(-1)),
+            ft.IconButton(ft.Icons.CHEVRON_LEFT, on_click=partial(change_month, -1)),
             month_label,
-            ft.IconButton(ft.Icons.CHEVRON_RIGHT, on_click=lambda e: change_month(1)),
+            ft.IconButton(ft.Icons.CHEVRON_RIGHT, on_click=partial(change_month, 1)),
             ft.Container(expand=True), # Spacer
-            ft.ElevatedButton("Export", icon=ft.Icons.DOWNLOAD, on_click=open_export_dialog, bgcolor=ft.Colors.GREEN_700, color=ft.Colors.WHITE)
-        ],
+            ft.ElevatedButton("Stats", icon=ft.Icons.INSIGHTS, on_click=open_stats_dialog),
+            ft.ElevatedButton("Export", icon=ft.Icons.DOWNLOAD, on_click=open_export_dialog, bgcolor=ft.Colors.GREEN_700, color=ft.Colors.WHITE),
+            ft.IconButton(ft.Icons.SEARCH, tooltip="Search", on_click=open_search_dialog)
+        ] + ([ft.IconButton(ft.Icons.SPEED, tooltip="Debug metrics", on_click=open_debug_overlay)] if metrics.is_enabled() else []),
         alignment=ft.MainAxisAlignment.START,
     )
 
@@ -440,4 +906,8 @@ def main(page: ft.Page):
         )
     )
 
-    update_calendar()
+    await update_calendar()
+    prefetch_adjacent_months()
+    if journal.pending_count():
+        # Sessions recorded while the database was unreachable, e.g. before a restart
+        request_sync()
@@ -0,0 +1,251 @@
+"""
+Background job runner for the Daily Planner App.
+
+Runs long operations (exports, imports, integrity checks) on a worker pool
+so Flet event handlers return immediately. Jobs report progress through
+callbacks and can be cancelled cooperatively.
+"""
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+class JobCancelled(Exception):
+    """
+    Raised inside a job function when the job has been cancelled.
+    """
+
+class Job:
+    """
+    A unit of background work and its observable state.
+
+    The job function receives the Job as its first argument and should call
+    report() periodically; report() raises JobCancelled once cancel() has
+    been requested.
+
+    Attributes:
+        id (int): Unique job id within the runner.
+        name (str): Human readable name.
+        status (str): One of pending, running, done, failed or cancelled.
+        progress (Any): Last progress value reported by the job.
+        message (str): Last progress message reported by the job.
+        result (Any): The job function's return value once done.
+        error (Exception): The exception raised by a failed job.
+    """
+    def __init__(self, job_id: int, name: str = "", on_progress: Callable = None, on_done: Callable = None):
+        self.id = job_id
+        self.name = name
+        self.status = PENDING
+        self.progress = None
+        self.message = ""
+        self.result = None
+        self.error = None
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._cancel_event = threading.Event()
+        self._done_event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        bool: True once cancellation has been requested.
+        """
+        return self._cancel_event.is_set()
+
+    @property
+    def finished(self) -> bool:
+        """
+        bool: True once the job is done, failed or cancelled.
+        """
+        return self._done_event.is_set()
+
+    def cancel(self):
+        """
+        Requests cancellation. The job stops at its next report() call.
+        """
+        self._cancel_event.set()
+
+    def report(self, progress: Any = None, message: str = None):
+        """
+        Records progress and notifies the on_progress callback.
+
+        Args:
+            progress (Any, optional): A progress value, e.g. rows processed.
+            message (str, optional): A short status message.
+
+        Raises:
+            JobCancelled: If cancellation has been requested.
+        """
+        if self.cancelled:
+            raise JobCancelled()
+        self.progress = progress
+        if message is not None:
+            self.message = message
+        if self._on_progress:
+            self._on_progress(self)
+
+    def wait(self, timeout: float = None) -> Any:
+        """
+        Blocks until the job finishes and its on_done callback has returned.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait.
+
+        Returns:
+            Any: The job's result (None if it failed or was cancelled).
+        """
+        self._done_event.wait(timeout)
+        return self.result
+
+    def _run(self, fn: Callable, args: tuple, kwargs: dict):
+        if self.cancelled:
+            self.status = CANCELLED
+        else:
+            self.status = RUNNING
+            try:
+                self.result = fn(self, *args, **kwargs)
+                self.status = CANCELLED if self.cancelled else DONE
+            except JobCancelled:
+                self.status = CANCELLED
+            except Exception as e:
+                self.error = e
+                self.status = FAILED
+        try:
+            if self._on_done:
+                self._on_done(self)
+        finally:
+            self._done_event.set()
+
+class JobRunner:
+    """
+    Runs jobs on a thread pool and keeps track of them by id.
+
+    Finished jobs are forgotten when the next job is submitted, so a
+    long-running process does not accumulate them; callers keep the Job
+    returned by submit() for as long as they need its outcome.
+
+    Attributes:
+        max_workers (int): Number of worker threads.
+    """
+    def __init__(self, max_workers: int = JOB_WORKERS):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: Dict[int, Job] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        fn: Callable,
+        *args,
+        name: str = "",
+        on_progress: Callable[[Job], None] = None,
+        on_done: Callable[[Job], None] = None,
+        **kwargs
+    ) -> Job:
+        """
+        Schedules fn(job, *args, **kwargs) on the pool.
+
+        Args:
+            fn (Callable): The job function. Receives the Job as first argument.
+            *args: Positional arguments for fn.
+            name (str, optional): Human readable job name.
+            on_progress (Callable, optional): Called with the Job on every report().
+            on_done (Callable, optional): Called with the Job when it finishes,
+                                          whatever the outcome.
+            **kwargs: Keyword arguments for fn.
+
+        Returns:
+            Job: The scheduled job.
+        """
+        with self._lock:
+            job = Job(next(self._ids), name, on_progress, on_done)
+            self._prune_locked()
+            self._jobs[job.id] = job
+        self._executor.submit(job._run, fn, args, kwargs)
+        return job
+
+    def get(self, job_id: int) -> Optional[Job]:
+        """
+        Looks up a job by id.
+
+        Args:
+            job_id (int): The job id.
+
+        Returns:
+            Optional[Job]: The job if known, else None.
+        """
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Requests cancellation of a job.
+
+        Args:
+            job_id (int): The job id.
+
+        Returns:
+            bool: True if the job exists and had not finished yet.
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel()
+        return True
+
+    def active_jobs(self) -> list:
+        """
+        Returns the jobs that have not finished yet.
+
+        Returns:
+            list[Job]: Pending and running jobs.
+        """
+        return [job for job in list(self._jobs.values()) if not job.finished]
+
+    def prune(self):
+        """
+        Forgets finished jobs.
+        """
+        with self._lock:
+            self._prune_locked()
+
+    def _prune_locked(self):
+        self._jobs = {job_id: job for job_id, job in self._jobs.items() if not job.finished}
+
+    def resize(self, max_workers: int):
+        """
+        Changes the number of worker threads.
+
+        Jobs already submitted finish on the previous pool.
+
+        Args:
+            max_workers (int): The new number of worker threads.
+        """
+        with self._lock:
+            previous = self._executor
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+            self.max_workers = max_workers
+        previous.shutdown(wait=False)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Cancels outstanding jobs and stops the worker threads.
+
+        Args:
+            wait (bool, optional): Wait for running jobs to return. Defaults to True.
+        """
+        for job in self.active_jobs():
+            job.cancel()
+        self._executor.shutdown(wait=wait)
+
+# Process-wide runner used by the GUI
+job_runner = JobRunner()
@@ -0,0 +1,277 @@
+"""
+Opt-in query and latency instrumentation for the Daily Planner App.
+
+When enabled (METRICS_ENABLED=1, or enable()), SQLAlchemy cursor events
+count and time every statement and attribute it to the logical operation
+running at the time, e.g. "update_calendar". GUI actions are wrapped with
+@timed so each operation's wall time can be split into database time and
+everything else (Python and Flet rendering).
+
+Statements slower than SLOW_QUERY_MS and operations slower than
+SLOW_OPERATION_MS are logged as warnings on the "app.metrics" logger;
+every finished operation is logged at DEBUG level. All log messages are
+JSON objects. The aggregated figures are shown in the GUI's debug overlay
+and can be written out with dump().
+"""
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+SLOW_OPERATION_MS = float(os.getenv("SLOW_OPERATION_MS", "250"))
+# Number of slow queries and operations kept for the debug overlay
+RECENT_LIMIT = 50
+
+logger = logging.getLogger("app.metrics")
+
+class _Operation:
+    """
+    Query totals for one running operation.
+    """
+    __slots__ = ("name", "queries", "query_ms")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.queries = 0
+        self.query_ms = 0.0
+
+_current = contextvars.ContextVar("metrics_operation", default=None)
+
+class Metrics:
+    """
+    Thread-safe aggregate of operation and query timings.
+
+    Attributes:
+        operations (dict): Per operation name: calls, total_ms, max_ms,
+                           queries and query_ms.
+        slow_queries (deque): The most recent slow statements.
+        slow_operations (deque): The most recent slow operations.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets all recorded figures.
+        """
+        with self._lock:
+            self.operations = {}
+            self.slow_queries = deque(maxlen=RECENT_LIMIT)
+            self.slow_operations = deque(maxlen=RECENT_LIMIT)
+            self.unattributed = {"queries": 0, "query_ms": 0.0}
+
+    def record_query(self, statement: str, elapsed_ms: float):
+        """
+        Adds one statement's time to the running operation, if any.
+
+        Args:
+            statement (str): The SQL text.
+            elapsed_ms (float): Execution time in milliseconds.
+        """
+        operation = _current.get()
+        with self._lock:
+            if operation is not None:
+                operation.queries += 1
+                operation.query_ms += elapsed_ms
+            else:
+                self.unattributed["queries"] += 1
+                self.unattributed["query_ms"] += elapsed_ms
+            if elapsed_ms >= SLOW_QUERY_MS:
+                entry = {
+                    "event": "slow_query",
+                    "operation": operation.name if operation else None,
+                    "ms": round(elapsed_ms, 2),
+                    "statement": " ".join(statement.split())[:500],
+                }
+                self.slow_queries.append(entry)
+        if elapsed_ms >= SLOW_QUERY_MS:
+            logger.warning(json.dumps(entry))
+
+    def record_operation(self, operation: _Operation, elapsed_ms: float):
+        """
+        Folds a finished operation into the per-name totals.
+
+        Args:
+            operation (_Operation): The finished operation.
+            elapsed_ms (float): Its wall time in milliseconds.
+        """
+        entry = {
+            "event": "operation",
+            "operation": operation.name,
+            "ms": round(elapsed_ms, 2),
+            "queries": operation.queries,
+            "query_ms": round(operation.query_ms, 2),
+        }
+        with self._lock:
+            totals = self.operations.setdefault(
+                operation.name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "queries": 0, "query_ms": 0.0}
+            )
+            totals["calls"] += 1
+            totals["total_ms"] += elapsed_ms
+            totals["max_ms"] = max(totals["max_ms"], elapsed_ms)
+            totals["queries"] += operation.queries
+            totals["query_ms"] += operation.query_ms
+            if elapsed_ms >= SLOW_OPERATION_MS:
+                self.slow_operations.append(entry)
+        if elapsed_ms >= SLOW_OPERATION_MS:
+            logger.warning(json.dumps({**entry, "event": "slow_operation"}))
+        else:
+            logger.debug(json.dumps(entry))
+
+    def snapshot(self) -> dict:
+        """
+        Returns a JSON-serialisable copy of the current figures.
+
+        Returns:
+            dict: "operations" with per-call averages added, "unattributed"
+                  queries, "slow_queries" and "slow_operations".
+        """
+        with self._lock:
+            operations = {}
+            for name, totals in self.operations.items():
+                calls = totals["calls"]
+                operations[name] = {
+                    "calls": calls,
+                    "avg_ms": round(totals["total_ms"] / calls, 2),
+                    "max_ms": round(totals["max_ms"], 2),
+                    "avg_queries": round(totals["queries"] / calls, 2),
+                    "avg_query_ms": round(totals["query_ms"] / calls, 2),
+                    # Time not spent in the database: Python work and Flet rendering
+                    "avg_other_ms": round((totals["total_ms"] - totals["query_ms"]) / calls, 2),
+                }
+            return {
+                "operations": operations,
+                "unattributed": {
+                    "queries": self.unattributed["queries"],
+                    "query_ms": round(self.unattributed["query_ms"], 2),
+                },
+                "slow_queries": list(self.slow_queries),
+                "slow_operations": list(self.slow_operations),
+            }
+
+    def dump(self, path: str) -> str:
+        """
+        Writes snapshot() to a JSON file.
+
+        Args:
+            path (str): The file to write.
+
+        Returns:
+            str: The path written.
+        """
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+metrics = Metrics()
+_enabled = False
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("metrics_started")
+    if not started:
+        # Instrumentation was enabled while this statement was running
+        return
+    metrics.record_query(statement, (time.perf_counter() - started.pop()) * 1000)
+
+def _handle_error(exception_context):
+    if exception_context.connection is not None:
+        started = exception_context.connection.info.get("metrics_started")
+        if started:
+            started.pop()
+
+def enable():
+    """
+    Starts instrumenting every SQLAlchemy engine in the process.
+    """
+    global _enabled
+    if not _enabled:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        _enabled = True
+
+def disable():
+    """
+    Stops instrumenting engines. Recorded figures are kept.
+    """
+    global _enabled
+    if _enabled:
+        event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.remove(Engine, "handle_error", _handle_error)
+        _enabled = False
+
+def is_enabled() -> bool:
+    """
+    bool: True while instrumentation is active.
+    """
+    return _enabled
+
+def timed(name: Optional[str] = None) -> Callable:
+    """
+    Decorator recording a function's calls as a logical operation.
+
+    Works for plain functions and coroutine functions. Statements executed
+    while the function runs, including nested calls, are attributed to the
+    outermost timed operation. Costs one flag check when disabled.
+
+    Args:
+        name (str, optional): Operation name. Defaults to the function name.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(fn):
+        label = name or fn.__name__
+
+        def start():
+            if not _enabled or _current.get() is not None:
+                return None, None
+            operation = _Operation(label)
+            return operation, _current.set(operation)
+
+        def finish(operation, token, started):
+            _current.reset(token)
+            metrics.record_operation(operation, (time.perf_counter() - started) * 1000)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                operation, token = start()
+                if operation is None:
+                    return await fn(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    finish(operation, token, started)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            operation, token = start()
+            if operation is None:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                finish(operation, token, started)
+        return wrapper
+    return decorator
+
+if os.getenv("METRICS_ENABLED", "").lower() in ("1", "true", "yes"):
+    enable()
@@ -0,0 +1,170 @@
+"""
+Reporting module for the Daily Planner App.
+
+Computes session counts and total/average minutes grouped by group,
+category, day, ISO week or month. All aggregation runs in the database
+with GROUP BY, so reports never pull individual sessions over the wire.
+Everything except the per-group report reads the daily rollup tables.
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, NamedTuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from .database import DayLog, MentorshipSession, DayTotal, DayCategoryTotal
+
+DIMENSIONS = ("group", "category", "day", "week", "month")
+
+class ReportRow(NamedTuple):
+    """
+    Aggregated totals for one report key.
+
+    Attributes:
+        key (Any): The grouping value, e.g. a group name, a date,
+                   "2024-W03" for a week or "2024-03" for a month.
+        session_count (int): Number of sessions.
+        total_minutes (int): Combined duration in minutes.
+    """
+    key: Any
+    session_count: int
+    total_minutes: int
+
+    @property
+    def average_minutes(self) -> float:
+        """
+        float: Mean session duration in minutes.
+        """
+        return self.total_minutes / self.session_count if self.session_count else 0.0
+
+def _total_minutes():
+    """
+    Returns the SQL expression summing session durations in minutes.
+    """
+    return func.coalesce(func.sum(MentorshipSession.duration_total_minutes), 0)
+
+def _filtered(query, start_date: date = None, end_date: date = None, source=MentorshipSession):
+    """
+    Joins a query over sessions or a rollup table to DayLog and applies the
+    inclusive date range.
+    """
+    query = query.select_from(source).join(DayLog)
+    if start_date:
+        query = query.filter(DayLog.date >= start_date)
+    if end_date:
+        query = query.filter(DayLog.date <= end_date)
+    return query
+
+def _week_key(iso_year: int, week: int) -> str:
+    """
+    Formats an ISO week key, e.g. "2024-W03".
+    """
+    return f"{iso_year}-W{week:02d}"
+
+def totals_by(db: Session, dimension: str, start_date: date = None, end_date: date = None) -> List[ReportRow]:
+    """
+    Returns totals grouped by a dimension, using one GROUP BY query.
+
+    Weeks are ISO weeks. On PostgreSQL they are bucketed by the database; on
+    other backends the day_totals rows (one per day) are rolled up into weeks.
+
+    Args:
+        db (Session): The database session.
+        dimension (str): One of "group", "category", "day", "week" or "month".
+        start_date (date, optional): The first date to include. Defaults to None.
+        end_date (date, optional): The last date to include (inclusive). Defaults to None.
+
+    Returns:
+        List[ReportRow]: One row per key, ordered by key.
+
+    Raises:
+        ValueError: If the dimension is unknown.
+    """
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Unknown report dimension: {dimension}")
+
+    if dimension == "group":
+        column = MentorshipSession.group_name
+        rows = _filtered(
+            db.query(column, func.count(MentorshipSession.id), _total_minutes()), start_date, end_date
+        ).group_by(column)
+        return sorted(ReportRow(*row) for row in rows)
+
+    if dimension == "category":
+        column = DayCategoryTotal.category
+        rows = _filtered(
+            db.query(column, func.sum(DayCategoryTotal.session_count), func.sum(DayCategoryTotal.total_minutes)),
+            start_date, end_date, DayCategoryTotal
+        ).group_by(column)
+        return sorted(ReportRow(*row) for row in rows)
+
+    count, total = func.sum(DayTotal.session_count), func.sum(DayTotal.total_minutes)
+    if dimension == "month":
+        year, month = func.extract("year", DayLog.date), func.extract("month", DayLog.date)
+        rows = _filtered(db.query(year, month, count, total), start_date, end_date, DayTotal).group_by(year, month)
+        return sorted(ReportRow(f"{int(y)}-{int(m):02d}", c, t) for y, m, c, t in rows)
+
+    if dimension == "week" and db.get_bind().dialect.name == "postgresql":
+        iso_year, week = func.extract("isoyear", DayLog.date), func.extract("week", DayLog.date)
+        rows = _filtered(db.query(iso_year, week, count, total), start_date, end_date, DayTotal).group_by(iso_year, week)
+        return sorted(ReportRow(_week_key(int(y), int(w)), c, t) for y, w, c, t in rows)
+
+    rows = _filtered(
+        db.query(DayLog.date, DayTotal.session_count, DayTotal.total_minutes), start_date, end_date, DayTotal
+    )
+    days = [ReportRow(*row) for row in rows]
+    if dimension == "day":
+        return sorted(days)
+
+    weeks = defaultdict(lambda: [0, 0])
+    for day, session_count, total_minutes in days:
+        key = _week_key(*day.isocalendar()[:2])
+        weeks[key][0] += session_count
+        weeks[key][1] += total_minutes
+    return sorted(ReportRow(key, c, t) for key, (c, t) in weeks.items())
+
+def overall_totals(db: Session, start_date: date = None, end_date: date = None) -> ReportRow:
+    """
+    Returns the totals over all sessions in a date range.
+
+    Args:
+        db (Session): The database session.
+        start_date (date, optional): The first date to include. Defaults to None.
+        end_date (date, optional): The last date to include (inclusive). Defaults to None.
+
+    Returns:
+        ReportRow: Totals with key None.
+    """
+    session_count, total_minutes = _filtered(
+        db.query(func.sum(DayTotal.session_count), func.sum(DayTotal.total_minutes)), start_date, end_date, DayTotal
+    ).one()
+    return ReportRow(None, session_count or 0, total_minutes or 0)
+
+def summary_report(db: Session, start_date: date = None, end_date: date = None) -> Dict[str, List[ReportRow]]:
+    """
+    Builds the standard summary: overall totals plus totals by group, category and week.
+
+    Args:
+        db (Session): The database session.
+        start_date (date, optional): The first date to include. Defaults to None.
+        end_date (date, optional): The last date to include (inclusive). Defaults to None.
+
+    Returns:
+        Dict[str, List[ReportRow]]: Sections keyed "overall", "group", "category" and "week".
+    """
+    report = {"overall": [overall_totals(db, start_date, end_date)]}
+    for dimension in ("group", "category", "week"):
+        report[dimension] = totals_by(db, dimension, start_date, end_date)
+    return report
+
+def format_minutes(minutes: float) -> str:
+    """
+    Formats a number of minutes as "Xh Ym".
+
+    Args:
+        minutes (float): Minutes; fractions are rounded.
+
+    Returns:
+        str: The formatted duration.
+    """
+    hours, mins = divmod(int(round(minutes)), 60)
+    return f"{hours}h {mins}m"
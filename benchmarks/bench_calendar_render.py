@@ -0,0 +1,87 @@
+"""
+Benchmark of the calendar's per-interaction render cost.
+
+Drives one headless client (see load_test.py) through month navigation and
+session logging. After every action the page is diffed the way a Flet
+session does before sending an update, and the encoded patch size and the
+time spent in the handler plus the diff are recorded. The patch size is
+what web mode sends to the browser for that interaction.
+
+Usage:
+    python -m benchmarks.bench_calendar_render --years 2 --actions 100
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+import msgpack
+from flet.controls.base_control import BaseControl
+from flet.controls.object_patch import ObjectPatch
+from flet.messaging.protocol import configure_encode_object_for_msgpack
+from app.database import aio, configure_journal, dispose_engine
+from benchmarks.load_test import HeadlessClient, drain, seed
+
+_encode = configure_encode_object_for_msgpack(BaseControl)
+
+def patch_bytes(root, previous=True) -> int:
+    """
+    Returns the encoded size of the update patch for root.
+
+    Args:
+        root (BaseControl): The page's root control.
+        previous (bool): False for the initial render, which sends the whole tree.
+    """
+    patch, _, _ = ObjectPatch.from_diff(root if previous else None, root, control_cls=BaseControl)
+    return len(msgpack.packb(patch.to_message(), default=_encode))
+
+async def run(actions: int, seed_value: int) -> dict:
+    client = HeadlessClient(0, random.Random(seed_value))
+    aio.configure_async_engine()
+    results = {"navigate": [], "log_session": []}
+    try:
+        await client.start()
+        root = client.page.add.call_args[0][0]
+        print(f"Initial render: {patch_bytes(root, previous=False):,} bytes")
+        for _ in range(actions):
+            operation = client.rng.choice(tuple(results))
+            started = time.perf_counter()
+            await getattr(client, operation)()
+            size = patch_bytes(root)
+            results[operation].append((time.perf_counter() - started, size))
+        await drain()
+    finally:
+        await aio.dispose_async_engine()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=2, help="Years of data to seed (default: 2)")
+    parser.add_argument("--actions", type=int, default=100, help="Actions to run (default: 100)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="calendar_bench_") as work_dir:
+        journal = configure_journal(os.path.join(work_dir, "journal.db"))
+        try:
+            print("Seeding database...")
+            seed(os.path.join(work_dir, "calendar.db"), args.years)
+            results = asyncio.run(run(args.actions, args.seed))
+        finally:
+            journal.close()
+            dispose_engine()
+
+    print(f"\n{'operation':<14}{'count':>8}{'median ms':>12}{'median bytes':>15}{'max bytes':>12}")
+    for operation, samples in results.items():
+        if not samples:
+            continue
+        timings, sizes = zip(*samples)
+        print(
+            f"{operation:<14}{len(samples):>8}{statistics.median(timings) * 1000:>12.2f}"
+            f"{statistics.median(sizes):>15,.0f}{max(sizes):>12,}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark comparing export throughput and file size across formats.
+
+Seeds a temporary SQLite database with generated sessions (or uses an
+existing DATABASE_URL with --use-existing) and times export_sessions()
+for every available format.
+
+Usage:
+    python -m benchmarks.bench_export_formats --years 5 --sessions-per-day 10-20
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date
+from app.database import configure_engine, init_db
+from app.export import available_formats, export_sessions
+from populate_calendar import populate
+
+def seed(db_path: str, years: int, sessions_per_day: str) -> int:
+    configure_engine(f"sqlite:///{db_path}")
+    init_db()
+    min_sessions, max_sessions = (int(n) for n in sessions_per_day.split("-"))
+    end_date = date(2024, 12, 31)
+    return populate(
+        date(end_date.year - years + 1, 1, 1), end_date, {5, 6}, 3.0,
+        [f"Group {n}" for n in range(1, 11)],
+        seed=1, min_sessions=min_sessions, max_sessions=max_sessions
+    )
+
+def run(formats, separate_sheets: bool) -> list:
+    results = []
+    for fmt in formats:
+        filename = f"bench.{fmt}"
+        started = time.perf_counter()
+        success, msg = export_sessions(filename=filename, separate_sheets=separate_sheets, fmt=fmt)
+        elapsed = time.perf_counter() - started
+        if not success:
+            raise RuntimeError(f"{fmt} export failed: {msg}")
+        size = os.path.getsize(os.path.join("exports", filename))
+        results.append((fmt, elapsed, size))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=3, help="Years of weekday data to generate (default: 3)")
+    parser.add_argument("--sessions-per-day", default="10-20", help="MIN-MAX sessions per day (default: 10-20)")
+    parser.add_argument("--formats", default=",".join(available_formats()), help="Comma separated formats")
+    parser.add_argument("--single-sheet", action="store_true", help="Write Excel as a single sheet")
+    parser.add_argument("--use-existing", action="store_true", help="Export from DATABASE_URL instead of seeding")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="export_bench_")
+    if args.use_existing:
+        rows = None
+    else:
+        print("Seeding database...")
+        rows = seed(os.path.join(work_dir, "bench.db"), args.years, args.sessions_per_day)
+    os.chdir(work_dir)
+
+    results = run(args.formats.split(","), separate_sheets=not args.single_sheet)
+
+    print(f"\n{'format':<10}{'seconds':>10}{'rows/s':>12}{'size (MB)':>12}")
+    for fmt, elapsed, size in results:
+        throughput = f"{rows / elapsed:,.0f}" if rows else "-"
+        print(f"{fmt:<10}{elapsed:>10.2f}{throughput:>12}{size / 1_048_576:>12.2f}")
+    print(f"\nFiles written to {os.path.join(work_dir, 'exports')}")
+
+if __name__ == "__main__":
+    main()
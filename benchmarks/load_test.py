@@ -0,0 +1,180 @@
+"""
+Headless load test for the web mode.
+
+Simulates N concurrent clients in one process, the way run_web.py serves
+them: every client runs app.gui.main() on its own page object and all of
+them share the event loop, the database engines and the month cache. Each
+client repeatedly navigates months, opens days and logs sessions through
+the real GUI handlers. Latency percentiles per operation and overall
+throughput are reported. A log_session action is timed until the offline
+journal has been replayed into the database, so it includes the write.
+
+Seeds a temporary SQLite database by default; pass --use-existing to run
+against DATABASE_URL (logged sessions are then written to that database).
+The journal always lives in a temporary directory, removed after the run.
+
+Usage:
+    python -m benchmarks.load_test --clients 50 --actions 40 --years 2
+"""
+import argparse
+import asyncio
+import inspect
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List
+from unittest.mock import MagicMock
+from app import gui
+from app.database import aio, configure_engine, configure_journal, dispose_engine, get_journal, init_db
+from populate_calendar import populate
+
+OPERATIONS = ("navigate", "open_day", "log_session")
+
+def seed(db_path: str, years: int) -> int:
+    configure_engine(f"sqlite:///{db_path}")
+    init_db()
+    today = date.today()
+    return populate(
+        date(today.year - years, today.month, 1), today, {5, 6}, 3.0,
+        [f"Group {n}" for n in range(1, 11)],
+        seed=1, min_sessions=2, max_sessions=6
+    )
+
+class HeadlessClient:
+    """
+    One simulated browser session driving the GUI handlers directly.
+    """
+    def __init__(self, client_id: int, rng: random.Random):
+        self.client_id = client_id
+        self.rng = rng
+        self.page = MagicMock()
+        self.page.overlay = []
+
+    async def start(self):
+        await gui.main(self.page)
+        root = self.page.add.call_args[0][0]
+        self.header = root.controls[0]
+        self.calendar_grid = root.controls[3]
+
+    async def click(self, control):
+        result = control.on_click(None)
+        if inspect.isawaitable(result):
+            await result
+
+    def day_buttons(self) -> list:
+        return [c for c in self.calendar_grid.controls if c.visible and c.on_click]
+
+    async def navigate(self):
+        await self.click(self.header.controls[self.rng.choice((0, 2))])
+
+    async def open_day(self):
+        await self.click(self.rng.choice(self.day_buttons()))
+        self.page.overlay.pop()
+
+    async def log_session(self):
+        await self.click(self.rng.choice(self.day_buttons()))
+        dlg = self.page.overlay.pop()
+        form_row = dlg.content.controls[3]
+        form_row.controls[0].value = f"Load {self.client_id}"
+        form_row.controls[1].value = "Code Review"
+        await self.click(dlg.actions[2])
+        # The click only appends to the journal; wait until it is in the database
+        await asyncio.to_thread(get_journal().replay)
+
+async def run_client(client: HeadlessClient, actions: int, weights: List[float], latencies: Dict[str, list]):
+    await client.start()
+    for _ in range(actions):
+        operation = client.rng.choices(OPERATIONS, weights)[0]
+        started = time.perf_counter()
+        await getattr(client, operation)()
+        latencies[operation].append(time.perf_counter() - started)
+
+async def drain():
+    """
+    Waits for the clients' background prefetches and journal syncs to finish.
+    """
+    pending = asyncio.all_tasks() - {asyncio.current_task()}
+    if pending:
+        await asyncio.gather(*pending)
+
+async def run(clients: int, actions: int, weights: List[float], seed_value: int) -> tuple:
+    latencies = defaultdict(list)
+    aio.configure_async_engine()
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            run_client(HeadlessClient(n, random.Random(seed_value + n)), actions, weights, latencies)
+            for n in range(clients)
+        ))
+        elapsed = time.perf_counter() - started
+        await drain()
+    finally:
+        await aio.dispose_async_engine()
+    return latencies, elapsed
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Returns the pct-th percentile (0-100) of values using linear interpolation.
+    """
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def report(latencies: Dict[str, list], elapsed: float):
+    print(f"\n{'operation':<14}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'mean ms':>10}")
+    total = 0
+    for operation in OPERATIONS:
+        values = latencies.get(operation)
+        if not values:
+            continue
+        total += len(values)
+        print(
+            f"{operation:<14}{len(values):>8}"
+            + "".join(f"{percentile(values, pct) * 1000:>10.1f}" for pct in (50, 90, 99))
+            + f"{max(values) * 1000:>10.1f}{statistics.fmean(values) * 1000:>10.1f}"
+        )
+    print(f"\n{total} actions in {elapsed:.2f}s: {total / elapsed:,.1f} actions/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent simulated clients (default: 20)")
+    parser.add_argument("--actions", type=int, default=30, help="Actions per client (default: 30)")
+    parser.add_argument(
+        "--mix", default="6,3,1",
+        help="Relative weights of navigate,open_day,log_session (default: 6,3,1)"
+    )
+    parser.add_argument("--years", type=int, default=2, help="Years of data to seed (default: 2)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for client behaviour (default: 1)")
+    parser.add_argument("--use-existing", action="store_true", help="Run against DATABASE_URL instead of seeding")
+    args = parser.parse_args()
+
+    weights = [float(w) for w in args.mix.split(",")]
+    if len(weights) != len(OPERATIONS):
+        parser.error(f"--mix needs {len(OPERATIONS)} weights")
+
+    with tempfile.TemporaryDirectory(prefix="load_test_") as work_dir:
+        journal = configure_journal(os.path.join(work_dir, "journal.db"))
+        try:
+            if not args.use_existing:
+                print("Seeding database...")
+                seed(os.path.join(work_dir, "load.db"), args.years)
+            else:
+                init_db()
+
+            print(f"Running {args.clients} clients x {args.actions} actions...")
+            latencies, elapsed = asyncio.run(run(args.clients, args.actions, weights, args.seed))
+        finally:
+            journal.close()
+            dispose_engine()
+    report(latencies, elapsed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+Benchmark suite for the database, calendar and export hot paths.
+
+For each dataset size the suite seeds a database with populate_calendar,
+then times the hot paths used by the app: loading a day's sessions, the
+calendar's month summary (cold and cached), logging a session, the report
+queries and an Excel export. Every measurement records the median wall
+time per call, the number of SQL statements per call and the peak Python
+memory allocated by one call.
+
+Results are written to JSON. The compare command checks a run against a
+baseline and exits with status 1 if anything regressed.
+
+SQLite databases are created in a temporary directory. A PostgreSQL URL
+given with --postgres must point at a scratch database: its tables are
+dropped and recreated for every dataset size.
+
+Usage:
+    python -m benchmarks.suite run --days 90,730 --output baseline.json
+    python -m benchmarks.suite run --days 90,730 --output current.json
+    python -m benchmarks.suite compare baseline.json current.json --threshold 0.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Callable, Dict, List
+import sqlalchemy
+from sqlalchemy import event, select
+from app.database import (
+    Base,
+    DayLog,
+    add_mentorship_session,
+    configure_engine,
+    dispose_engine,
+    get_engine,
+    get_month_summary,
+    get_sessions_for_day,
+    init_db,
+    month_cache,
+    session_scope
+)
+from app.database.migrations import schema_metadata
+from app.export import export_to_excel
+from app.reports import summary_report
+from populate_calendar import populate
+
+# Dataset end date; fixed so runs on different days seed identical data
+END_DATE = date(2024, 12, 31)
+GROUPS = [f"Group {n}" for n in range(1, 11)]
+
+class QueryCounter:
+    """
+    Counts the SQL statements executed on an engine while active.
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+def measure(fn: Callable[[int], None], calls: int, setup: Callable[[], None] = None) -> dict:
+    """
+    Times fn(i) for i in range(calls) and records its queries and memory.
+
+    One extra traced call, made first, provides the peak memory figure so
+    tracemalloc's overhead does not distort the timings.
+
+    Args:
+        fn (Callable[[int], None]): The operation; receives the call index.
+        calls (int): Number of timed calls.
+        setup (Callable[[], None], optional): Run before every call, untimed.
+
+    Returns:
+        dict: median_ms, p90_ms, queries (per call) and peak_kb.
+    """
+    engine = get_engine()
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn(calls)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    timings = []
+    with QueryCounter(engine) as counter:
+        for i in range(calls):
+            if setup:
+                setup()
+            started = time.perf_counter()
+            fn(i)
+            timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "p90_ms": round(timings[int(0.9 * (len(timings) - 1))] * 1000, 3),
+        "queries": round(counter.count / calls, 2),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+def seed(url: str, days: int) -> dict:
+    """
+    Creates a fresh schema at url and fills `days` days of sessions.
+
+    Returns:
+        dict: The populate timing, with the number of sessions written.
+    """
+    engine = configure_engine(url)
+    Base.metadata.drop_all(engine)
+    schema_metadata.drop_all(engine)
+    dispose_engine()
+    configure_engine(url)
+    init_db()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = populate(
+            END_DATE - timedelta(days=days - 1), END_DATE, {5, 6}, 3.0, GROUPS,
+            seed=1, min_sessions=4, max_sessions=8
+        )
+    elapsed = time.perf_counter() - started
+    return {"seconds": round(elapsed, 3), "sessions": rows, "sessions_per_s": round(rows / elapsed)}
+
+def run_dataset(url: str, days: int, calls: int, work_dir: str) -> Dict[str, dict]:
+    """
+    Seeds one dataset and measures every hot path on it.
+    """
+    results = {"populate": seed(url, days)}
+    rng = random.Random(days)
+    with session_scope() as db:
+        logged_days = list(db.scalars(select(DayLog.date)))
+    sample_days = [rng.choice(logged_days) for _ in range(calls + 1)]
+    months = sorted({(d.year, d.month) for d in logged_days})
+    sample_months = [rng.choice(months) for _ in range(calls + 1)]
+
+    def sessions_for_day(i):
+        with session_scope() as db:
+            list(get_sessions_for_day(db, sample_days[i]))
+
+    def month_summary(i):
+        with session_scope() as db:
+            get_month_summary(db, *sample_months[i])
+
+    def add_session(i):
+        with session_scope() as db:
+            add_mentorship_session(db, sample_days[i], "Bench", "Code Review", "Benchmark session", 0, 30)
+
+    def reports(i):
+        with session_scope() as db:
+            summary_report(db)
+
+    def export(i):
+        with contextlib.redirect_stdout(io.StringIO()):
+            success, msg = export_to_excel(filename=f"bench_{days}.xlsx")
+        if not success:
+            raise RuntimeError(msg)
+
+    results["get_sessions_for_day"] = measure(sessions_for_day, calls)
+    results["month_summary_cold"] = measure(month_summary, calls, setup=month_cache.clear)
+    for i in range(calls + 1):
+        month_summary(i)
+    results["month_summary_cached"] = measure(month_summary, calls)
+    results["add_mentorship_session"] = measure(add_session, calls)
+    results["summary_report"] = measure(reports, max(3, calls // 10))
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        results["export_to_excel"] = measure(export, 3)
+    finally:
+        os.chdir(cwd)
+    dispose_engine()
+    return results
+
+def run(args) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_suite_") as work_dir:
+        backends = {"sqlite": lambda days: f"sqlite:///{os.path.join(work_dir, f'bench_{days}.db')}"}
+        if args.postgres:
+            backends["postgresql"] = lambda days: args.postgres
+
+        try:
+            for backend, url_for in backends.items():
+                for days in args.days:
+                    print(f"{backend}: {days} days...", flush=True)
+                    for name, metrics in run_dataset(url_for(days), days, args.calls, work_dir).items():
+                        results[f"{backend}/{days}d/{name}"] = metrics
+        finally:
+            # Close the seeded files before the directory is removed
+            dispose_engine()
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "machine": platform.machine(),
+            "calls": args.calls,
+        },
+        "results": results,
+    }
+
+def compare(baseline: dict, current: dict, threshold: float, min_ms: float) -> List[str]:
+    """
+    Lists the measurements in current that regressed against baseline.
+
+    A timing regresses when it is more than `threshold` (a fraction) slower
+    and at least min_ms slower in absolute terms; query counts regress on
+    any increase; peak memory regresses by the same relative threshold.
+
+    Args:
+        baseline (dict): A results file from `run`.
+        current (dict): A results file from `run`.
+        threshold (float): Allowed relative slowdown, e.g. 0.2 for 20%.
+        min_ms (float): Ignore timing changes smaller than this.
+
+    Returns:
+        List[str]: One line per regression.
+    """
+    regressions = []
+    for key, now in sorted(current["results"].items()):
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        if "median_ms" in now:
+            slower = now["median_ms"] - before["median_ms"]
+            if slower > min_ms and now["median_ms"] > before["median_ms"] * (1 + threshold):
+                regressions.append(f"{key}: median {before['median_ms']}ms -> {now['median_ms']}ms")
+            if now["queries"] > before["queries"]:
+                regressions.append(f"{key}: queries {before['queries']} -> {now['queries']}")
+            if now["peak_kb"] > before["peak_kb"] * (1 + threshold):
+                regressions.append(f"{key}: peak memory {before['peak_kb']}KB -> {now['peak_kb']}KB")
+        elif now["sessions_per_s"] < before["sessions_per_s"] / (1 + threshold):
+            regressions.append(f"{key}: {before['sessions_per_s']} -> {now['sessions_per_s']} sessions/s")
+    return regressions
+
+def print_results(data: dict):
+    print(f"\n{'measurement':<48}{'median ms':>11}{'p90 ms':>10}{'queries':>9}{'peak KB':>10}")
+    for key, metrics in data["results"].items():
+        if "median_ms" in metrics:
+            print(
+                f"{key:<48}{metrics['median_ms']:>11.2f}{metrics['p90_ms']:>10.2f}"
+                f"{metrics['queries']:>9}{metrics['peak_kb']:>10.0f}"
+            )
+        else:
+            print(f"{key:<48}{metrics['seconds'] * 1000:>11.0f}   ({metrics['sessions_per_s']:,} sessions/s)")
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Seed datasets and measure the hot paths")
+    run_parser.add_argument(
+        "--days", type=lambda value: [int(n) for n in value.split(",")], default=[90, 730],
+        help="Comma separated dataset sizes in days (default: 90,730)"
+    )
+    run_parser.add_argument("--calls", type=int, default=30, help="Timed calls per measurement (default: 30)")
+    run_parser.add_argument("--postgres", help="Also benchmark this scratch PostgreSQL URL (tables are dropped)")
+    run_parser.add_argument("--output", default="benchmark.json", help="Results file (default: benchmark.json)")
+
+    compare_parser = commands.add_parser("compare", help="Compare a results file against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown fraction (default: 0.2)")
+    compare_parser.add_argument("--min-ms", type=float, default=0.5, help="Ignore timing changes below this (default: 0.5)")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        data = run(args)
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=2)
+        print_results(data)
+        print(f"\nResults written to {args.output}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold, args.min_ms)
+    if regressions:
+        print(f"✗ {len(regressions)} regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"✓ No regressions in {len(current['results'])} measurements")
+
+if __name__ == "__main__":
+    main()
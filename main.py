@@ -3,6 +3,8 @@ Daily Planner Application Entry Point.
 
 This script initializes the database and starts the Flet GUI application.
 """
+import logging
+import os
 import flet as ft
 from app.gui import main
 from app.database import init_db
@@ -11,9 +13,11 @@ if __name__ == "__main__":
     """
     Main execution block.
     
-    1. Initializes the PostgreSQL database connection and tables.
+    1. Initializes the database (PostgreSQL, or the embedded SQLite file) and tables.
     2. Starts the Flet desktop application loop.
     """
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING"))
+
     # Initialize database
     try:
         init_db()
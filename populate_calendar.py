@@ -1,8 +1,23 @@
+import argparse
 import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from datetime import date, timedelta, datetime
 from typing import List, Set
-from app.database import init_db, get_db
-from app.database.models import DayLog, MentorshipSession
+from app.database import init_db, session_scope, configure_engine, get_engine, add_mentorship_sessions_bulk, delete_sessions_bulk
+
+# Activities and descriptions
+ACTIVITIES = [
+    ("Code Review", "Reviewed current assignment progress."),
+    ("Code Review", "Went through code quality checks and linting errors."),
+    ("Pair Programming", "Worked together on a code question with one person typing and another person giving directions."),
+    ("Pair Programming", "Paired up the mentees to help each other with the assignment they had to do for the week."),
+    ("1:1", "Weekly sync to check in on blockers and challenges."),
+    ("1:1", "Performance review and feedback session."),
+    ("Debugging", "Helped mentees debug issues in their code."),
+    ("Concept Explanation", "Explained core concepts related to the current module.")
+]
 
 def get_date_input(prompt: str) -> date:
     while True:
@@ -17,27 +32,228 @@ def get_excluded_weekdays() -> Set[int]:
     input_str = input("Enter weekdays to exclude (comma separated, e.g., '5,6' for weekends) [default: 5,6]: ")
     if not input_str.strip():
         return {5, 6}
-    
+
     try:
         return {int(d.strip()) for d in input_str.split(",") if d.strip().isdigit()}
     except ValueError:
         print("Invalid input. Using default (Sat, Sun).")
         return {5, 6}
 
+def generate_day_sessions(
+    seed: int,
+    day: date,
+    target_hours: float,
+    group_names: List[str],
+    min_sessions: int = 1,
+    max_sessions: int = 3
+) -> List[dict]:
+    """
+    Generates the sessions for one day as rows for add_mentorship_sessions_bulk.
+
+    The random stream is derived from the seed and the date alone, so a day's
+    sessions are identical however the range is chunked or sharded.
+    """
+    rng = random.Random(seed * 1_000_003 + day.toordinal())
+    num_sessions = rng.randint(min_sessions, max_sessions)
+    target_minutes = int(target_hours * 60)
+    current_minutes = 0
+    rows = []
+
+    for i in range(num_sessions):
+        category, description = rng.choice(ACTIVITIES)
+
+        # Distribution logic
+        remaining_minutes = target_minutes - current_minutes
+
+        if i == num_sessions - 1:
+            # Last session takes remaining time
+            minutes = remaining_minutes
+        else:
+            # Random chunk of remaining time
+            max_chunk = remaining_minutes - (30 * (num_sessions - 1 - i)) # Leave at least 30m for others
+            if max_chunk < 30:
+                max_chunk = 30
+            minutes = rng.randint(30, max_chunk)
+
+        # Jitter (+/- 10 mins) but enforce min 15
+        minutes += rng.randint(-10, 10)
+        minutes = max(15, minutes)
+
+        current_minutes += minutes
+
+        rows.append({
+            "log_date": day,
+            "group_name": rng.choice(group_names),
+            "category": category,
+            "activity": description,
+            "hours": minutes // 60,
+            "minutes": minutes % 60,
+        })
+    return rows
+
+def iter_days(start_date: date, end_date: date, excluded_weekdays: Set[int]):
+    current_date = start_date
+    while current_date <= end_date:
+        if current_date.weekday() not in excluded_weekdays:
+            yield current_date
+        current_date += timedelta(days=1)
+
+def populate_range(
+    start_date: date,
+    end_date: date,
+    excluded_weekdays: Set[int],
+    target_hours: float,
+    group_names: List[str],
+    seed: int,
+    min_sessions: int = 1,
+    max_sessions: int = 3,
+    chunk_size: int = 10000,
+    verbose: bool = True
+) -> int:
+    """
+    Generates and bulk inserts sessions for a date range, one transaction per chunk of sessions.
+
+    Returns:
+        int: The number of sessions inserted.
+    """
+    total_sessions = 0
+    chunk = []
+    with session_scope() as db:
+        for day in iter_days(start_date, end_date, excluded_weekdays):
+            chunk.extend(generate_day_sessions(seed, day, target_hours, group_names, min_sessions, max_sessions))
+            if len(chunk) >= chunk_size:
+                total_sessions += len(add_mentorship_sessions_bulk(db, chunk))
+                if verbose:
+                    print(f"Processed up to {day} ({total_sessions} sessions)...")
+                chunk = []
+        if chunk:
+            total_sessions += len(add_mentorship_sessions_bulk(db, chunk))
+    return total_sessions
+
+def _populate_shard(url: str, kwargs: dict) -> int:
+    # Forked workers must not reuse the parent's pooled connections, and
+    # spawned ones start without the parent's configured engine
+    configure_engine(url)
+    return populate_range(**kwargs)
+
+def split_range(start_date: date, end_date: date, shards: int) -> List[tuple]:
+    """
+    Splits an inclusive date range into up to `shards` contiguous sub-ranges.
+    """
+    total_days = (end_date - start_date).days + 1
+    shards = max(1, min(shards, total_days))
+    size, extra = divmod(total_days, shards)
+    ranges = []
+    current = start_date
+    for i in range(shards):
+        length = size + (1 if i < extra else 0)
+        ranges.append((current, current + timedelta(days=length - 1)))
+        current += timedelta(days=length)
+    return ranges
+
+def populate(
+    start_date: date,
+    end_date: date,
+    excluded_weekdays: Set[int],
+    target_hours: float,
+    group_names: List[str],
+    seed: int = None,
+    min_sessions: int = 1,
+    max_sessions: int = 3,
+    chunk_size: int = 10000,
+    workers: int = 1
+) -> int:
+    """
+    Replaces all data in the date range with generated sessions.
+
+    Existing logs are cleared with set-based DELETEs. With workers > 1 the
+    range is split into date shards generated by a process pool; the output
+    is the same for a given seed either way.
+
+    Returns:
+        int: The number of sessions inserted.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+        print(f"Using seed {seed}")
+
+    print("\nClearing existing data for date range...")
+    with session_scope() as db:
+        count = delete_sessions_bulk(db, start_date=start_date, end_date=end_date, remove_day_logs=True)
+    print(f"Cleared {count} existing sessions.")
+
+    options = dict(
+        excluded_weekdays=excluded_weekdays,
+        target_hours=target_hours,
+        group_names=group_names,
+        seed=seed,
+        min_sessions=min_sessions,
+        max_sessions=max_sessions,
+        chunk_size=chunk_size,
+    )
+    if workers <= 1:
+        return populate_range(start_date, end_date, **options)
+
+    shards = [
+        dict(options, start_date=shard_start, end_date=shard_end, verbose=False)
+        for shard_start, shard_end in split_range(start_date, end_date, workers)
+    ]
+    engine = get_engine()
+    url = engine.url.render_as_string(hide_password=False)
+    # Close pooled connections before forking; the engine stays configured
+    engine.dispose()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(partial(_populate_shard, url), shards))
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Populate the calendar with generated mentorship sessions. "
+                    "Runs interactively when no arguments are given."
+    )
+    parse_date = lambda value: datetime.strptime(value, "%Y-%m-%d").date()
+    parser.add_argument("--start", type=parse_date, required=True, help="First date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=parse_date, required=True, help="Last date (YYYY-MM-DD), inclusive")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible data")
+    parser.add_argument("--exclude-weekdays", default="5,6",
+                        help="Comma separated weekdays to skip, 0=Mon..6=Sun (default: 5,6; '' for none)")
+    parser.add_argument("--target-hours", type=float, default=2.0, help="Target hours per day (default: 2.0)")
+    parser.add_argument("--groups", type=int, default=1,
+                        help="Number of groups; 1 uses --group-name, more uses 'Group 1'..'Group N'")
+    parser.add_argument("--group-name", default="Group 26", help="Group name when --groups is 1")
+    parser.add_argument("--sessions-per-day", default="1-3", help="Sessions per day as N or MIN-MAX (default: 1-3)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Sessions per insert transaction (default: 10000)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes to generate date shards with (default: 1)")
+    args = parser.parse_args(argv)
+
+    if args.start > args.end:
+        parser.error("--start must be before --end")
+    try:
+        bounds = [int(n) for n in args.sessions_per_day.split("-")]
+        args.min_sessions, args.max_sessions = bounds[0], bounds[-1]
+    except ValueError:
+        parser.error("--sessions-per-day must be N or MIN-MAX")
+    if not 1 <= args.min_sessions <= args.max_sessions:
+        parser.error("--sessions-per-day must be at least 1 and MIN <= MAX")
+    args.excluded_weekdays = {int(d) for d in args.exclude_weekdays.split(",") if d.strip().isdigit()}
+    args.group_names = (
+        [args.group_name] if args.groups <= 1 else [f"Group {n}" for n in range(1, args.groups + 1)]
+    )
+    return args
+
 def populate_calendar():
     print("=== Daily Planner Population Tool ===\n")
     print("Initializing database...")
     init_db()
-    
+
     start_date = get_date_input("\nEnter start date")
     end_date = get_date_input("Enter end date")
-    
+
     if start_date > end_date:
         print("Error: Start date must be before end date.")
         return
 
     excluded_weekdays = get_excluded_weekdays()
-    
+
     while True:
         try:
             target_hours = float(input("\nEnter target hours per day (e.g., 2.5): "))
@@ -47,103 +263,29 @@ def populate_calendar():
 
     group_name = input("\nEnter Group Name [default: Group 26]: ") or "Group 26"
 
-    # Activities and descriptions
-    activities = [
-        ("Code Review", "Reviewed current assignment progress."),
-        ("Code Review", "Went through code quality checks and linting errors."),
-        ("Pair Programming", "Worked together on a code question with one person typing and another person giving directions."),
-        ("Pair Programming", "Paired up the mentees to help each other with the assignment they had to do for the week."),
-        ("1:1", "Weekly sync to check in on blockers and challenges."),
-        ("1:1", "Performance review and feedback session."),
-        ("Debugging", "Helped mentees debug issues in their code."),
-        ("Concept Explanation", "Explained core concepts related to the current module.")
-    ]
-    
-    db_gen = get_db()
-    db = next(db_gen)
-    
     try:
-        # Clear existing data for the date range
-        print("\nClearing existing data for date range...")
-        existing_day_logs = db.query(DayLog).filter(
-            DayLog.date >= start_date,
-            DayLog.date <= end_date
-        ).all()
-        
-        count = len(existing_day_logs)
-        for day_log in existing_day_logs:
-            db.delete(day_log)
-        db.commit()
-        print(f"Cleared {count} existing day logs.")
-        
-        current_date = start_date
-        total_days_populated = 0
-        
-        while current_date <= end_date:
-            # Skip excluded weekdays
-            if current_date.weekday() in excluded_weekdays:
-                current_date += timedelta(days=1)
-                continue
-            
-            print(f"Processing {current_date}...")
-            
-            # Create/Get DayLog
-            day_log = DayLog(date=current_date)
-            db.add(day_log)
-            db.commit()
-            db.refresh(day_log)
-            
-            # Generate sessions
-            num_sessions = random.randint(1, 3)
-            target_minutes = int(target_hours * 60)
-            current_minutes = 0
-            
-            for i in range(num_sessions):
-                category, description = random.choice(activities)
-                
-                # Distribution logic
-                remaining_minutes = target_minutes - current_minutes
-                
-                if i == num_sessions - 1:
-                    # Last session takes remaining time
-                    minutes = remaining_minutes
-                else:
-                    # Random chunk of remaining time
-                    max_chunk = remaining_minutes - (30 * (num_sessions - 1 - i)) # Leave at least 30m for others
-                    if max_chunk < 30: 
-                        max_chunk = 30
-                    minutes = random.randint(30, max_chunk)
-                
-                # Jitter (+/- 10 mins) but enforce min 15
-                minutes += random.randint(-10, 10)
-                minutes = max(15, minutes)
-                
-                current_minutes += minutes
-                
-                hours_part = minutes // 60
-                mins_part = minutes % 60
-                
-                session = MentorshipSession(
-                    day_log_id=day_log.id,
-                    group_name=group_name,
-                    category=category,
-                    activity_description=description,
-                    duration_hours=hours_part,
-                    duration_minutes=mins_part
-                )
-                db.add(session)
-            
-            db.commit()
-            total_days_populated += 1
-            current_date += timedelta(days=1)
-            
-        print(f"\nSuccess! Populated {total_days_populated} days.")
-        
+        total_sessions = populate(start_date, end_date, excluded_weekdays, target_hours, [group_name])
+        print(f"\nSuccess! Populated {total_sessions} sessions.")
     except Exception as e:
         print(f"An error occurred: {e}")
-        db.rollback()
-    finally:
-        db.close()
+
+def main(argv: List[str] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        populate_calendar()
+        return
+
+    args = parse_args(argv)
+    init_db()
+    total_sessions = populate(
+        args.start, args.end, args.excluded_weekdays, args.target_hours, args.group_names,
+        seed=args.seed,
+        min_sessions=args.min_sessions,
+        max_sessions=args.max_sessions,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+    print(f"Success! Populated {total_sessions} sessions.")
 
 if __name__ == "__main__":
-    populate_calendar()
+    main()
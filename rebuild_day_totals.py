@@ -0,0 +1,22 @@
+import argparse
+from app.database import init_db, session_scope, rebuild_day_totals, check_day_totals
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or verify the daily rollup tables.")
+    parser.add_argument("--check", action="store_true", help="Only compare the rollups with the sessions table")
+    args = parser.parse_args()
+
+    init_db()
+    with session_scope() as db:
+        if not args.check:
+            days = rebuild_day_totals(db)
+            print(f"Rebuilt rollups for {days} days.")
+
+        mismatched = check_day_totals(db)
+        if mismatched:
+            print(f"✗ {len(mismatched)} days disagree with mentorship_sessions, e.g. {mismatched[:5]}")
+            raise SystemExit(1)
+        print("✓ Rollups match mentorship_sessions")
+
+if __name__ == "__main__":
+    main()
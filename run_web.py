@@ -1,15 +1,61 @@
+"""
+Daily Planner web mode.
+
+Serves the Flet app to browsers. All page sessions run in this one process
+and share its database engines, connection pools, month cache and
+background job runner, so a new visitor reuses warm connections and cached
+months instead of building their own.
+
+Usage:
+    python run_web.py --host 0.0.0.0 --port 8550 --job-workers 4 --pool-size 20
+"""
+import argparse
+import logging
+import os
 import flet as ft
 from app.gui import main
-from app.database import init_db
-import os
+from app.jobs import JOB_WORKERS, job_runner
+from app.database import init_db, configure_engine, aio
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parses the web server options, defaulting to the WEB_* environment variables.
+    """
+    parser = argparse.ArgumentParser(description="Serve the Daily Planner to browsers.")
+    parser.add_argument("--host", default=os.getenv("WEB_HOST", "127.0.0.1"), help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=int(os.getenv("WEB_PORT", "8550")), help="Port (default: 8550)")
+    parser.add_argument(
+        "--job-workers", type=int, default=JOB_WORKERS,
+        help="Threads that run background exports for all clients; not server processes (default: JOB_WORKERS)"
+    )
+    parser.add_argument(
+        "--pool-size", type=int, default=None,
+        help="Database connections kept open for all clients (default: DB_POOL_SIZE)"
+    )
+    return parser.parse_args(argv)
+
+def configure(args: argparse.Namespace):
+    """
+    Sets up the process-wide resources shared by every page session.
+
+    Args:
+        args (argparse.Namespace): Parsed options from parse_args().
+    """
+    pool_options = {"pool_size": args.pool_size} if args.pool_size else {}
+    if pool_options:
+        configure_engine(**pool_options)
+    init_db()
+    aio.configure_async_engine(**pool_options)
+    if args.job_workers != job_runner.max_workers:
+        job_runner.resize(args.job_workers)
 
 if __name__ == "__main__":
-    # Initialize database
+    args = parse_args()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING"))
     try:
-        init_db()
+        configure(args)
     except Exception as e:
         print(f"Database initialization failed: {e}")
-    
-    # Run Flet app in web mode
-    print("Starting Flet app on http://localhost:8550")
-    ft.app(target=main, view=ft.AppView.WEB_BROWSER, port=8550)
+
+    print(f"Starting Flet app on http://{args.host}:{args.port}")
+    ft.run(main, view=ft.AppView.WEB_BROWSER, host=args.host, port=args.port)
@@ -0,0 +1,88 @@
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from datetime import date
+from sqlalchemy import event, text
+from app.database import configure_engine, dispose_engine, init_db, aio
+from app.database.cache import month_cache
+
+class TestAsyncDatabase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        configure_engine(f"sqlite:///{os.path.join(self.tmp_dir, 'aio.db')}")
+        init_db()
+        month_cache.clear()
+
+    async def asyncSetUp(self):
+        self.engine = aio.configure_async_engine(pool_size=5)
+
+    async def asyncTearDown(self):
+        await aio.dispose_async_engine()
+
+    def tearDown(self):
+        dispose_engine()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_async_url(self):
+        self.assertEqual(
+            aio.async_url("postgresql://u:p@localhost/daily_planner").render_as_string(hide_password=False),
+            "postgresql+asyncpg://u:p@localhost/daily_planner"
+        )
+        self.assertEqual(str(aio.async_url("sqlite:///planner.db")), "sqlite+aiosqlite:///planner.db")
+        with self.assertRaises(ValueError):
+            aio.async_url("mssql://localhost/db")
+
+    async def test_connections_are_tuned(self):
+        async with self.engine.connect() as conn:
+            self.assertEqual((await conn.execute(text("PRAGMA journal_mode"))).scalar(), "wal")
+
+    async def test_crud_round_trip(self):
+        d = date(2024, 5, 6)
+        async with aio.async_session_scope() as db:
+            session = await aio.add_mentorship_session(db, d, "G1", "Code Review", "Reviewed the importer", 1, 15)
+            await aio.update_mentorship_session(db, session.id, "G1", "Code Review", "Reviewed the importer", 1, 45)
+
+        async with aio.async_session_scope() as db:
+            sessions = await aio.get_sessions_for_day(db, d)
+            self.assertEqual([s.duration_total_minutes for s in sessions], [105])
+            summary = await aio.get_month_summary(db, 2024, 5)
+            self.assertEqual(summary[d].total_minutes, 105)
+            hits = await aio.search(db, "import")
+            self.assertEqual([hit.id for hit in hits], [session.id])
+            self.assertTrue(await aio.delete_session(db, session.id))
+            self.assertEqual(await aio.get_month_summary(db, 2024, 5), {})
+
+    async def test_queries_overlap_and_loop_stays_responsive(self):
+        @event.listens_for(self.engine.sync_engine, "connect")
+        def add_sleep(dbapi_conn, conn_record):
+            dbapi_conn.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000) or ms)
+
+        async def slow_query():
+            async with aio.async_session_scope() as db:
+                return await db.scalar(text("SELECT sleep_ms(200)"))
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        tick_task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        results = await asyncio.gather(*(slow_query() for _ in range(5)))
+        elapsed = time.perf_counter() - start
+        tick_task.cancel()
+
+        self.assertEqual(results, [200] * 5)
+        # Five 200 ms queries run side by side rather than one after another
+        self.assertLess(elapsed, 0.8)
+        # The event loop kept running other tasks while the queries waited
+        self.assertGreater(ticks, 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from sqlalchemy import text
+from app.database import configure_engine, dispose_engine, session_scope
+from benchmarks.suite import QueryCounter, compare, measure
+
+def results(**entries):
+    return {"meta": {}, "results": entries}
+
+def timing(median_ms, queries=1, peak_kb=100):
+    return {"median_ms": median_ms, "p90_ms": median_ms, "queries": queries, "peak_kb": peak_kb}
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def setUp(self):
+        self.engine = configure_engine("sqlite://")
+
+    def tearDown(self):
+        dispose_engine()
+
+    def test_measure_counts_queries_per_call(self):
+        def two_queries(i):
+            with session_scope() as db:
+                db.execute(text("SELECT 1"))
+                db.execute(text("SELECT 2"))
+
+        metrics = measure(two_queries, 5)
+        self.assertEqual(metrics["queries"], 2)
+        self.assertGreater(metrics["peak_kb"], 0)
+
+        with QueryCounter(self.engine) as counter:
+            pass
+        self.assertEqual(counter.count, 0)
+
+    def test_compare_flags_regressions(self):
+        baseline = results(
+            slow=timing(10.0), noisy=timing(0.1), queries=timing(1.0, queries=2),
+            populate={"seconds": 1.0, "sessions": 1000, "sessions_per_s": 1000}
+        )
+        current = results(
+            slow=timing(15.0), noisy=timing(0.3), queries=timing(1.0, queries=3),
+            populate={"seconds": 2.0, "sessions": 1000, "sessions_per_s": 500}, new=timing(99.0)
+        )
+        regressions = compare(baseline, current, threshold=0.2, min_ms=0.5)
+
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(regressions[0].startswith("populate:"))
+        self.assertTrue(regressions[1].startswith("queries: queries 2 -> 3"))
+        self.assertTrue(regressions[2].startswith("slow: median"))
+        self.assertEqual(compare(baseline, baseline, 0.2, 0.5), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,38 @@
 import unittest
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from sqlalchemy import create_engine
+from unittest.mock import patch
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.orm import sessionmaker
-from app.database.models import Base, DayLog, MentorshipSession
+from app.database import models
+from app.database.models import (
+    Base,
+    DayLog,
+    MentorshipSession,
+    configure_engine,
+    dispose_engine,
+    get_engine,
+    session_scope
+)
 from app.database.crud import (
     create_day_log,
     add_mentorship_session,
     get_sessions_for_day,
     delete_session,
-    get_day_log
+    get_day_log,
+    get_month_summary,
+    get_range_summary,
+    update_mentorship_session,
+    update_day_log_notes,
+    add_mentorship_sessions_bulk,
+    delete_sessions_bulk
 )
+from app.database.cache import LRUCache, month_cache
 
 class TestDatabase(unittest.TestCase):
     def setUp(self):
@@ -18,6 +41,7 @@ class TestDatabase(unittest.TestCase):
         Base.metadata.create_all(self.engine)
         self.Session = sessionmaker(bind=self.engine)
         self.db = self.Session()
+        month_cache.clear()
 
     def tearDown(self):
         self.db.close()
@@ -39,9 +63,10 @@ class TestDatabase(unittest.TestCase):
         self.assertEqual(session.group_name, "Group A")
         self.assertEqual(session.duration_hours, 1)
         self.assertEqual(session.duration_minutes, 30)
+        self.assertEqual(session.duration_total_minutes, 90)
         
         # Verify DayLog was created implicitly
-        log = get_day_log(self.db, d)
+        log = get_day_log(self.db, d, with_sessions=True)
         self.assertIsNotNone(log)
         self.assertEqual(len(log.sessions), 1)
 
@@ -53,6 +78,25 @@ class TestDatabase(unittest.TestCase):
         sessions = get_sessions_for_day(self.db, d)
         self.assertEqual(len(sessions), 2)
 
+    def test_reads_use_one_query_and_never_lazy_load(self):
+        d = date(2023, 1, 5)
+        add_mentorship_session(self.db, d, "G1", "Cat1", "Act1", 1, 0)
+        add_mentorship_session(self.db, d, "G2", "Cat2", "Act2", 0, 30)
+        self.db.expunge_all()
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        sessions = get_sessions_for_day(self.db, d)
+        self.assertEqual([s.activity_description for s in sessions], ["Act1", "Act2"])
+        self.assertEqual(len(statements), 1)
+        with self.assertRaises(InvalidRequestError):
+            sessions[0].day_log
+
+        log = get_day_log(self.db, d)
+        with self.assertRaises(InvalidRequestError):
+            log.totals
+        self.assertEqual(len(get_day_log(self.db, d, with_sessions=True).sessions), 2)
+
     def test_delete_session(self):
         d = date(2023, 1, 4)
         session = add_mentorship_session(self.db, d, "G1", "Cat1", "Act1", 1, 0)
@@ -63,5 +107,224 @@ class TestDatabase(unittest.TestCase):
         sessions = get_sessions_for_day(self.db, d)
         self.assertEqual(len(sessions), 0)
 
+    def test_get_month_summary(self):
+        add_mentorship_session(self.db, date(2023, 2, 1), "G1", "Cat1", "Act1", 1, 30)
+        add_mentorship_session(self.db, date(2023, 2, 1), "G2", "Cat2", "Act2", 0, 45)
+        add_mentorship_session(self.db, date(2023, 2, 28), "G1", "Cat1", "Act3", 2, 0)
+        add_mentorship_session(self.db, date(2023, 3, 1), "G1", "Cat1", "Act4", 1, 0)
+        create_day_log(self.db, date(2023, 2, 10), "Notes only")
+
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        summary = get_month_summary(self.db, 2023, 2)
+
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(set(summary), {date(2023, 2, 1), date(2023, 2, 28)})
+        self.assertEqual(summary[date(2023, 2, 1)].session_count, 2)
+        self.assertEqual(summary[date(2023, 2, 1)].total_minutes, 135)
+        self.assertEqual(summary[date(2023, 2, 28)].total_minutes, 120)
+
+    def test_get_range_summary_is_inclusive(self):
+        add_mentorship_session(self.db, date(2023, 4, 1), "G1", "Cat1", "Act1", 1, 0)
+        add_mentorship_session(self.db, date(2023, 4, 3), "G1", "Cat1", "Act2", 1, 0)
+        summary = get_range_summary(self.db, date(2023, 4, 1), date(2023, 4, 3))
+        self.assertEqual(len(summary), 2)
+
+    def test_month_summary_is_cached(self):
+        add_mentorship_session(self.db, date(2023, 5, 1), "G1", "Cat1", "Act1", 1, 0)
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        for _ in range(5):
+            get_month_summary(self.db, 2023, 5)
+            get_month_summary(self.db, 2023, 6)
+
+        self.assertEqual(len(statements), 2)
+        self.assertEqual(month_cache.stats()["hits"], 8)
+        self.assertEqual(month_cache.stats()["misses"], 2)
+
+    def test_writes_invalidate_month_summary(self):
+        d = date(2023, 5, 2)
+        session = add_mentorship_session(self.db, d, "G1", "Cat1", "Act1", 1, 0)
+        self.assertEqual(get_month_summary(self.db, 2023, 5)[d].total_minutes, 60)
+
+        update_mentorship_session(self.db, session.id, "G1", "Cat1", "Act1", 2, 0)
+        self.assertEqual(get_month_summary(self.db, 2023, 5)[d].total_minutes, 120)
+
+        add_mentorship_session(self.db, d, "G2", "Cat1", "Act2", 0, 30)
+        self.assertEqual(get_month_summary(self.db, 2023, 5)[d].session_count, 2)
+
+        update_day_log_notes(self.db, d, "Notes")
+        self.assertNotIn((2023, 5), month_cache._data)
+
+        delete_session(self.db, session.id)
+        self.assertEqual(get_month_summary(self.db, 2023, 5)[d].session_count, 1)
+
+    def test_add_mentorship_session_needs_no_reads_after_write(self):
+        d = date(2023, 1, 6)
+        create_day_log(self.db, d)
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        session = add_mentorship_session(self.db, d, "G1", "Cat1", "Act1", 1, 0)
+        count = len(statements)
+        self.assertEqual((session.id, session.group_name, session.duration_total_minutes), (1, "G1", 60))
+        self.assertEqual(len(statements), count)
+        self.assertFalse(any(s.startswith("SELECT") for s in statements[1:]))
+
+    def test_duration_is_normalised(self):
+        d = date(2023, 1, 3)
+        session = add_mentorship_session(self.db, d, "G", "Cat", "Act", 0, 135)
+        self.assertEqual(
+            (session.duration_total_minutes, session.duration_hours, session.duration_minutes), (135, 2, 15)
+        )
+
+        updated = update_mentorship_session(self.db, session.id, "G", "Cat", "Act", 0, 200)
+        self.assertEqual(
+            (updated.duration_total_minutes, updated.duration_hours, updated.duration_minutes), (200, 3, 20)
+        )
+        stored = self.db.get(MentorshipSession, session.id)
+        self.assertEqual((stored.duration_total_minutes, stored.duration_hours, stored.duration_minutes), (200, 3, 20))
+
+        with self.assertRaises(ValueError):
+            add_mentorship_session(self.db, d, "G", "Cat", "Act", 0, -5)
+
+    def test_add_mentorship_sessions_bulk(self):
+        create_day_log(self.db, date(2023, 6, 1), "Existing")
+        rows = [
+            {"log_date": date(2023, 6, 1 + i % 3), "group_name": f"G{i}", "category": "Cat1",
+             "activity": "Act", "hours": 1, "minutes": i}
+            for i in range(9)
+        ]
+        ids = add_mentorship_sessions_bulk(self.db, rows)
+
+        self.assertEqual(len(ids), 9)
+        self.assertEqual(self.db.query(DayLog).count(), 3)
+        self.assertEqual(get_day_log(self.db, date(2023, 6, 1)).notes, "Existing")
+        first = self.db.get(MentorshipSession, ids[4])
+        self.assertEqual(first.group_name, "G4")
+        self.assertEqual(first.duration_minutes, 4)
+        self.assertEqual(get_month_summary(self.db, 2023, 6)[date(2023, 6, 2)].session_count, 3)
+
+    def test_bulk_insert_invalidates_cached_month(self):
+        get_month_summary(self.db, 2023, 6)
+        add_mentorship_sessions_bulk(self.db, [
+            {"log_date": date(2023, 6, 5), "group_name": "G", "category": "C", "activity": "A", "hours": 1, "minutes": 0}
+        ])
+        self.assertIn(date(2023, 6, 5), get_month_summary(self.db, 2023, 6))
+
+    def test_delete_sessions_bulk_by_ids(self):
+        ids = [add_mentorship_session(self.db, date(2023, 7, d), "G", "C", "A", 1, 0).id for d in (1, 2, 3)]
+        get_month_summary(self.db, 2023, 7)
+        self.assertEqual(delete_sessions_bulk(self.db, session_ids=ids[:2]), 2)
+        self.assertEqual(list(get_month_summary(self.db, 2023, 7)), [date(2023, 7, 3)])
+
+    def test_delete_sessions_bulk_by_range(self):
+        for d in (1, 15, 31):
+            add_mentorship_session(self.db, date(2023, 8, d), "G", "C", "A", 1, 0)
+        deleted = delete_sessions_bulk(
+            self.db, start_date=date(2023, 8, 1), end_date=date(2023, 8, 15), remove_day_logs=True
+        )
+        self.assertEqual(deleted, 2)
+        self.assertIsNone(get_day_log(self.db, date(2023, 8, 1)))
+        self.assertEqual(len(get_sessions_for_day(self.db, date(2023, 8, 31))), 1)
+
+    def test_delete_sessions_bulk_requires_selection(self):
+        with self.assertRaises(ValueError):
+            delete_sessions_bulk(self.db, start_date=date(2023, 8, 1))
+
+class TestConcurrentWrites(unittest.TestCase):
+    THREADS = 8
+    SESSIONS_PER_THREAD = 25
+
+    def setUp(self):
+        # File-backed so every thread gets its own connection from the pool
+        self.tmp_dir = tempfile.mkdtemp()
+        configure_engine(f"sqlite:///{os.path.join(self.tmp_dir, 'concurrent.db')}")
+        Base.metadata.create_all(get_engine())
+
+    def tearDown(self):
+        dispose_engine()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_same_new_date_from_many_threads(self):
+        d = date(2024, 5, 1)
+        barrier = threading.Barrier(self.THREADS)
+
+        def log_sessions(n):
+            barrier.wait()
+            for i in range(self.SESSIONS_PER_THREAD):
+                with session_scope() as db:
+                    add_mentorship_session(db, d, f"G{n}", "Code Review", "Act", 0, 10)
+
+        with ThreadPoolExecutor(self.THREADS) as pool:
+            list(pool.map(log_sessions, range(self.THREADS)))
+
+        expected = self.THREADS * self.SESSIONS_PER_THREAD
+        with session_scope() as db:
+            self.assertEqual(db.query(DayLog).count(), 1)
+            self.assertEqual(len(get_sessions_for_day(db, d)), expected)
+            self.assertEqual(get_month_summary(db, 2024, 5)[d], (expected, expected * 10))
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+
+    def test_stale_put_is_discarded(self):
+        cache = LRUCache()
+        token = cache.token()
+        cache.invalidate("a")
+        cache.put("a", 1, token)
+        self.assertIsNone(cache.get("a"))
+
+class TestEngine(unittest.TestCase):
+    def setUp(self):
+        configure_engine('sqlite:///:memory:')
+
+    def tearDown(self):
+        dispose_engine()
+
+    def test_engine_is_shared(self):
+        self.assertIs(get_engine(), get_engine())
+
+    def test_session_scope_rolls_back_on_error(self):
+        Base.metadata.create_all(get_engine())
+        with self.assertRaises(RuntimeError):
+            with session_scope() as db:
+                db.add(DayLog(date=date(2023, 1, 5)))
+                db.flush()
+                raise RuntimeError("boom")
+        with session_scope() as db:
+            self.assertEqual(db.query(DayLog).count(), 0)
+
+class TestEmbeddedSQLite(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        dispose_engine()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_defaults_to_local_file_without_database_url(self):
+        path = os.path.join(self.tmp_dir, "planner.db")
+        with patch.object(models, "DATABASE_URL", None), patch.object(models, "SQLITE_PATH", path):
+            engine = get_engine()
+        self.assertEqual(engine.url.database, path)
+
+    def test_connections_are_tuned(self):
+        configure_engine(f"sqlite:///{os.path.join(self.tmp_dir, 'planner.db')}")
+        with get_engine().connect() as conn:
+            pragma = lambda name: conn.execute(text(f"PRAGMA {name}")).scalar()
+            self.assertEqual(pragma("journal_mode"), "wal")
+            self.assertEqual(pragma("synchronous"), 1) # NORMAL
+            self.assertEqual(pragma("cache_size"), -models.SQLITE_CACHE_SIZE_KB)
+            self.assertEqual(pragma("mmap_size"), models.SQLITE_MMAP_SIZE)
+
 if __name__ == '__main__':
     unittest.main()
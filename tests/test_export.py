@@ -1,68 +1,110 @@
 import unittest
+import csv
+import json
 import os
 import shutil
 from datetime import date
-from unittest.mock import MagicMock, patch
-from app.export import export_to_excel
+from app.database import configure_engine, dispose_engine, init_db, session_scope, add_mentorship_session
+from app.export import export_to_excel, export_sessions, available_formats
 
 class TestExport(unittest.TestCase):
     def setUp(self):
         self.test_dir = "test_exports"
         if not os.path.exists(self.test_dir):
             os.makedirs(self.test_dir)
-            
+        configure_engine(f"sqlite:///{os.path.join(self.test_dir, 'export.db')}")
+        init_db()
+        with session_scope() as db:
+            add_mentorship_session(db, date(2023, 1, 1), "G1", "Cat1", "Act1", 1, 0)
+            add_mentorship_session(db, date(2023, 1, 8), "G2", "Cat2", "Act2", 2, 0)
+
     def tearDown(self):
+        dispose_engine()
         if os.path.exists(self.test_dir):
             shutil.rmtree(self.test_dir)
-        # Clean up export file if it exists
-        export_file = os.path.join("exports", "test_export.xlsx")
-        if os.path.exists(export_file):
-            os.remove(export_file)
-
-    @patch('app.export.get_engine')
-    @patch('app.export.sessionmaker')
-    def test_export_to_excel(self, mock_sessionmaker, mock_get_engine):
-        # Mock DB session
-        mock_session = MagicMock()
-        mock_sessionmaker.return_value.return_value.__enter__.return_value = mock_session
-        
-        # Mock query results
-        class MockRow:
-            def __init__(self, d, g, c, a, h, m):
-                self.date = d
-                self.group_name = g
-                self.category = c
-                self.activity_description = a
-                self.duration_hours = h
-                self.duration_minutes = m
-
-        mock_data = [
-            MockRow(date(2023, 1, 1), "G1", "Cat1", "Act1", 1, 0),
-            MockRow(date(2023, 1, 8), "G2", "Cat2", "Act2", 2, 0)
-        ]
-        
-        # Mock query chain
-        mock_query = mock_session.query.return_value.join.return_value.order_by.return_value
-        # Ensure filter returns the same query object (fluent interface)
-        mock_query.filter.return_value = mock_query
-        mock_query.all.return_value = mock_data
-        
+        # Clean up export files if they exist
+        for extension in ("xlsx", "csv", "jsonl", "parquet"):
+            export_file = os.path.join("exports", f"test_export.{extension}")
+            if os.path.exists(export_file):
+                os.remove(export_file)
+
+    def test_export_to_excel(self):
         # Run export
         filename = "test_export.xlsx"
         # Export from Jan 1st to Jan 10th (covers both sessions)
         success, msg = export_to_excel(
-            start_date=date(2023, 1, 1), 
-            end_date=date(2023, 1, 10), 
+            start_date=date(2023, 1, 1),
+            end_date=date(2023, 1, 10),
             filename=filename
         )
-        
+
         self.assertTrue(success, msg)
         expected_path = os.path.join("exports", filename)
         self.assertTrue(os.path.exists(expected_path))
-        
+
         import pandas as pd
         xl = pd.ExcelFile(expected_path)
         self.assertEqual(len(xl.sheet_names), 2)
+        week_df = xl.parse(xl.sheet_names[1])
+        self.assertEqual(list(week_df.columns), ["Date", "Group Name", "Category", "Activity", "Duration"])
+        self.assertEqual(week_df["Duration"].tolist(), ["2h 0m"])
+
+    def test_export_single_sheet(self):
+        success, msg = export_to_excel(filename="test_export.xlsx", separate_sheets=False)
+
+        self.assertTrue(success, msg)
+        import pandas as pd
+        df = pd.read_excel(os.path.join("exports", "test_export.xlsx"), sheet_name=None)
+        self.assertEqual(list(df), ["All Sessions"])
+        self.assertEqual(df["All Sessions"]["Week"].tolist(), ["Week 52 - 2022", "Week 1 - 2023"])
+
+    def test_export_summary_sheet(self):
+        success, msg = export_to_excel(filename="test_export.xlsx", include_summary=True)
+
+        self.assertTrue(success, msg)
+        import pandas as pd
+        xl = pd.ExcelFile(os.path.join("exports", "test_export.xlsx"))
+        self.assertEqual(xl.sheet_names[0], "Summary")
+        summary = xl.parse("Summary", header=None)
+        self.assertEqual(summary.iloc[2].tolist()[:4], ["All Sessions", 2, 180, "3h 0m"])
+
+    def test_export_empty_range(self):
+        success, msg = export_to_excel(start_date=date(2024, 1, 1), end_date=date(2024, 1, 31))
+        self.assertFalse(success)
+        self.assertEqual(msg, "No data to export for the selected range.")
+
+    def test_export_csv(self):
+        success, msg = export_sessions(filename="test_export.csv", fmt="csv")
+
+        self.assertTrue(success, msg)
+        with open(os.path.join("exports", "test_export.csv"), newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["Date", "Week", "Group Name", "Category", "Activity", "Duration"])
+        self.assertEqual(rows[1], ["2023-01-01", "Week 52 - 2022", "G1", "Cat1", "Act1", "1h 0m"])
+        self.assertEqual(len(rows), 3)
+
+    def test_export_jsonl(self):
+        success, msg = export_sessions(filename="test_export.jsonl", fmt="jsonl")
+
+        self.assertTrue(success, msg)
+        with open(os.path.join("exports", "test_export.jsonl")) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[1]["Week"], "Week 1 - 2023")
+        self.assertEqual(records[1]["Duration"], "2h 0m")
+
+    @unittest.skipUnless("parquet" in available_formats(), "pyarrow is not installed")
+    def test_export_parquet(self):
+        success, msg = export_sessions(filename="test_export.parquet", fmt="parquet")
+
+        self.assertTrue(success, msg)
+        import pyarrow.parquet as pq
+        table = pq.read_table(os.path.join("exports", "test_export.parquet"))
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column("Date").to_pylist(), [date(2023, 1, 1), date(2023, 1, 8)])
+
+    def test_unknown_format(self):
+        success, msg = export_sessions(fmt="docx")
+        self.assertFalse(success)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,327 @@
+import unittest
+import asyncio
+import inspect
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+import flet as ft
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from app.database import (
+    configure_engine, dispose_engine, init_db, aio, session_scope, add_mentorship_session,
+    configure_journal, get_sessions_for_day, month_cache
+)
+from app import gui
+from app import metrics
+
+class TestGuiConnections(unittest.TestCase):
+    def setUp(self):
+        # File-backed SQLite so the engine uses a real QueuePool
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_url = f"sqlite:///{os.path.join(self.tmp_dir, 'gui.db')}"
+        # Journal replays write through the sync engine
+        self.sync_engine = configure_engine(self.db_url)
+        init_db()
+        self.journal = configure_journal(os.path.join(self.tmp_dir, "journal.db"))
+        # The GUI handlers read through the async engine; one loop, as in a Flet app
+        self.loop = asyncio.new_event_loop()
+        self.engine = aio.configure_async_engine().sync_engine
+        self.connects = 0
+        self.sync_connects = 0
+
+        def on_connect(dbapi_conn, conn_record):
+            self.connects += 1
+
+        def on_sync_connect(dbapi_conn, conn_record):
+            self.sync_connects += 1
+
+        event.listen(self.engine, "connect", on_connect)
+        event.listen(self.sync_engine, "connect", on_sync_connect)
+
+        self.page = MagicMock()
+        self.page.overlay = []
+        self.loop.run_until_complete(gui.main(self.page))
+        root = self.page.add.call_args[0][0]
+        self.header = root.controls[0]
+        self.calendar_grid = root.controls[3]
+
+    def tearDown(self):
+        self.settle()
+        self.loop.run_until_complete(aio.dispose_async_engine())
+        self.loop.close()
+        dispose_engine()
+        shutil.rmtree(self.tmp_dir)
+
+    def settle(self):
+        # Lets background prefetches and journal syncs finish
+        pending = asyncio.all_tasks(self.loop)
+        if pending:
+            self.loop.run_until_complete(asyncio.gather(*pending))
+
+    def database_down(self):
+        # Every async session fails as if the database could not be reached
+        @asynccontextmanager
+        async def scope():
+            raise OperationalError("connect", None, ConnectionRefusedError())
+            yield
+
+        return patch.object(aio, "async_session_scope", scope)
+
+    def click(self, control):
+        result = control.on_click(None)
+        if inspect.isawaitable(result):
+            self.loop.run_until_complete(result)
+
+    def day_buttons(self):
+        return [c for c in self.calendar_grid.controls if c.visible and c.on_click]
+
+    def log_session(self, day_index=0, sync=True):
+        self.click(self.day_buttons()[day_index])
+        dlg = self.page.overlay[-1]
+        form_row = dlg.content.controls[3]
+        form_row.controls[0].value = "Group 1"
+        form_row.controls[1].value = "Code Review"
+        self.click(dlg.actions[2])
+        if sync:
+            self.settle()
+        return dlg
+
+    def test_connection_count_stays_flat(self):
+        prev_month, next_month = self.header.controls[0], self.header.controls[2]
+        baseline, sync_baseline = self.connects, self.sync_connects
+
+        for i in range(1000):
+            self.click(next_month if i % 2 else prev_month)
+        for i in range(1000):
+            self.log_session(i % 28)
+
+        # All 1000 writes went through the sync engine
+        self.assertEqual(self.journal.pending_count(), 0)
+        self.assertEqual(self.engine.pool.checkedout(), 0)
+        self.assertEqual(self.sync_engine.pool.checkedout(), 0)
+        self.assertLessEqual(self.connects - baseline, 1)
+        self.assertLessEqual(self.sync_connects - sync_baseline, 1)
+
+    def test_export_runs_in_background(self):
+        self.log_session()
+        export_button = self.header.controls[5]
+        cwd = os.getcwd()
+        os.chdir(self.tmp_dir)
+        try:
+            export_button.on_click(None)
+            dlg = self.page.overlay[-1]
+            # The job's callbacks repaint the page on the event loop's thread
+            threads = set()
+            self.page.update.side_effect = lambda: threads.add(threading.get_ident())
+            job = dlg.actions[1].on_click(None)
+            job.wait(10)
+            self.loop.run_until_complete(asyncio.sleep(0))
+            self.assertEqual(threads, {threading.get_ident()})
+            self.assertFalse(dlg.open)
+            self.assertTrue(self.page.snack_bar.content.value.startswith("Exported to"))
+        finally:
+            os.chdir(cwd)
+
+    def test_stats_dialog_shows_month_totals(self):
+        self.log_session()
+        self.click(self.header.controls[4])
+        dlg = self.page.overlay[-1]
+        texts = [c.value for c in dlg.content.controls if isinstance(c, ft.Text)]
+        self.assertIn("Sessions: 1", texts)
+        self.assertIn("Code Review: 1 sessions, 0h 0m", texts)
+
+    def test_stats_dialog_reports_unreachable_database(self):
+        overlays = len(self.page.overlay)
+        with self.database_down():
+            self.click(self.header.controls[4])
+        self.assertEqual(len(self.page.overlay), overlays)
+        self.assertTrue(self.page.snack_bar.content.value.startswith("Database unreachable"))
+
+    def test_search_reports_unreachable_database(self):
+        self.click(self.header.controls[6])
+        search_row, status_text = self.page.overlay[-1].content.controls[:2]
+        search_row.controls[0].value = "group"
+        with self.database_down():
+            self.click(search_row.controls[1])
+        self.assertEqual(status_text.value, "Search is unavailable while the database is unreachable.")
+        self.assertTrue(self.page.snack_bar.content.value.startswith("Database unreachable"))
+
+    def test_search_opens_matching_day(self):
+        self.log_session(3)
+        self.click(self.header.controls[6])
+        dlg = self.page.overlay[-1]
+        search_row, status_text, results_list = dlg.content.controls[:3]
+        search_row.controls[0].value = "group"
+        self.click(search_row.controls[1])
+        self.assertEqual(status_text.value, "1 results")
+
+        self.click(results_list.controls[0])
+        self.assertFalse(dlg.open)
+        self.assertTrue(self.page.overlay[-1].title.value.startswith("Sessions for"))
+
+    def test_other_clients_repaint_changed_month(self):
+        # Another client showing the same month
+        other = MagicMock()
+        other.overlay = []
+        self.loop.run_until_complete(gui.main(other))
+        self.settle()
+
+        self.log_session()
+        self.page.pubsub.send_others.assert_called_once()
+        message = self.page.pubsub.send_others.call_args[0][0]
+
+        # It repaints when told the session was synced
+        other_cell = other.add.call_args[0][0].controls[3].controls[6] # Day 1
+        self.assertEqual(other_cell.bgcolor, ft.Colors.GREY_800)
+        self.loop.run_until_complete(other.pubsub.subscribe.call_args[0][0](message))
+        self.assertEqual(other_cell.bgcolor, ft.Colors.GREEN_900)
+
+    def test_debug_overlay_shows_operation_metrics(self):
+        metrics.metrics.reset()
+        metrics.enable()
+        try:
+            page = MagicMock()
+            page.overlay = []
+            self.loop.run_until_complete(gui.main(page))
+            header = page.add.call_args[0][0].controls[0]
+            self.click(header.controls[7])
+            table = page.overlay[-1].content.controls[0]
+            operations = [row.cells[0].content.value for row in table.rows]
+            self.assertIn("update_calendar", operations)
+        finally:
+            metrics.disable()
+            metrics.metrics.reset()
+
+    def test_logged_day_turns_green(self):
+        dlg = self.log_session()
+        session_list = dlg.content.controls[0]
+        self.assertEqual(len(session_list.controls), 1)
+        self.assertEqual(self.day_buttons()[0].bgcolor, ft.Colors.GREEN_900)
+
+    def test_calendar_cells_are_reused(self):
+        cells = list(self.calendar_grid.controls)
+        for _ in range(13):
+            self.click(self.header.controls[2])
+            self.assertTrue(all(a is b for a, b in zip(self.calendar_grid.controls, cells, strict=True)))
+
+        # Blanks and day cells match the month now shown
+        month = self.day_buttons()[0].on_click.args[0]
+        next_month = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+        self.assertEqual(sum(c.visible for c in cells[:6]), month.weekday())
+        self.assertEqual(len(self.day_buttons()), (next_month - month).days)
+
+    def test_logging_repaints_only_the_day(self):
+        cells = self.day_buttons()
+        colors = [c.bgcolor for c in cells]
+        self.log_session(4)
+        colors[4] = ft.Colors.GREEN_900
+        self.assertTrue(all(a is b for a, b in zip(self.day_buttons(), cells, strict=True)))
+        self.assertEqual([c.bgcolor for c in cells], colors)
+
+    def test_overlapping_navigations_render_the_last_month(self):
+        def shown_month():
+            return self.day_buttons()[0].on_click.args[0]
+
+        while shown_month().month != 2:
+            self.click(self.header.controls[2])
+        self.settle()
+        february = shown_month()
+
+        # The render for March is still loading when the month goes back to February
+        month_cache.clear()
+        prev_month, next_month = self.header.controls[0], self.header.controls[2]
+        async def navigate_twice():
+            await asyncio.gather(next_month.on_click(None), prev_month.on_click(None))
+
+        self.loop.run_until_complete(navigate_twice())
+        self.assertEqual(shown_month(), february)
+        self.assertEqual(self.header.controls[1].value, february.strftime("%B %Y"))
+        self.assertEqual(len(self.day_buttons()), (february.replace(month=3) - february).days)
+
+    def test_adjacent_months_render_without_queries(self):
+        self.settle()
+        loaded = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: loaded.append(args[3][0]))
+
+        def shown_month():
+            return self.day_buttons()[0].on_click.args[0]
+
+        # Only the prefetches for the new neighbours reach the database
+        self.click(self.header.controls[2])
+        self.assertNotIn(shown_month(), loaded)
+        self.settle()
+        self.click(self.header.controls[0])
+        self.click(self.header.controls[0])
+        self.assertNotIn(shown_month(), loaded)
+
+    def test_write_discards_prefetched_month(self):
+        self.settle()
+        first_day = self.day_buttons()[0].on_click.args[0]
+        next_month = (first_day.replace(day=28) + timedelta(days=4)).replace(day=1)
+        with session_scope() as db:
+            add_mentorship_session(db, next_month, "Group 1", "Code Review", "Planning", 1, 0)
+
+        self.click(self.header.controls[2])
+        self.assertEqual(self.day_buttons()[0].bgcolor, ft.Colors.GREEN_900)
+
+    def test_sync_restarts_after_an_unexpected_error(self):
+        real_replay = self.journal.replay
+        calls = []
+
+        def flaky_replay(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return real_replay(*args)
+
+        with patch.object(self.journal, "replay", flaky_replay):
+            self.log_session(sync=False)
+            with self.assertRaises(RuntimeError):
+                self.settle()
+            # The failed sync does not keep later ones from starting
+            self.log_session(1)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.journal.pending_count(), 0)
+
+    def test_logging_does_not_wait_for_the_database(self):
+        # After the page loaded, connecting to the database hangs and the
+        # journal cannot sync
+        connected = asyncio.Event()
+        real_scope = aio.async_session_scope
+
+        @asynccontextmanager
+        async def scope():
+            await connected.wait()
+            async with real_scope() as db:
+                yield db
+
+        def icons(dlg):
+            return [c.leading.icon for c in dlg.content.controls[0].controls if isinstance(c, ft.ListTile)]
+
+        configure_engine("sqlite:////nonexistent/planner.db")
+        with patch.object(aio, "async_session_scope", scope), patch.object(gui, "JOURNAL_RETRY_SECONDS", 0.01):
+            dlg = self.log_session(sync=False)
+            self.loop.run_until_complete(asyncio.sleep(0.05))
+
+            # The dialog opened and the session was recorded locally, shown as waiting
+            self.assertTrue(dlg.open)
+            self.assertEqual(self.journal.pending_count(), 1)
+            self.assertEqual(self.day_buttons()[0].bgcolor, ft.Colors.GREEN_900)
+            self.assertEqual(icons(dlg), [ft.Icons.CLOUD_OFF])
+
+            # Synced by the retry loop once the database is back
+            configure_engine(self.db_url)
+            connected.set()
+            self.settle()
+        self.assertEqual(self.journal.pending_count(), 0)
+        day = self.day_buttons()[0].on_click.args[0]
+        with session_scope() as db:
+            self.assertEqual([s.group_name for s in get_sessions_for_day(db, day)], ["Group 1"])
+        self.assertEqual(icons(dlg), [ft.Icons.EVENT_NOTE])
+
+if __name__ == '__main__':
+    unittest.main()
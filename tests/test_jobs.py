@@ -0,0 +1,91 @@
+import unittest
+import threading
+from app.jobs import JobRunner, DONE, FAILED, CANCELLED
+
+class TestJobRunner(unittest.TestCase):
+    def setUp(self):
+        self.runner = JobRunner(max_workers=2)
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def test_job_returns_result_and_reports_progress(self):
+        progress = []
+
+        def work(job, n):
+            for i in range(n):
+                job.report(i + 1, f"step {i + 1}")
+            return n * 2
+
+        job = self.runner.submit(work, 3, on_progress=lambda j: progress.append(j.progress))
+        self.assertEqual(job.wait(5), 6)
+        self.assertEqual(job.status, DONE)
+        self.assertEqual(progress, [1, 2, 3])
+        self.assertEqual(job.message, "step 3")
+        self.assertIs(self.runner.get(job.id), job)
+
+    def test_cancel_stops_job_at_next_report(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def work(job):
+            started.set()
+            release.wait(5)
+            job.report(1)
+            return "unreachable"
+
+        finished = []
+        job = self.runner.submit(work, on_done=finished.append)
+        started.wait(5)
+        self.assertTrue(self.runner.cancel(job.id))
+        release.set()
+
+        self.assertIsNone(job.wait(5))
+        self.assertEqual(job.status, CANCELLED)
+        self.assertEqual(finished, [job])
+        self.assertFalse(self.runner.cancel(job.id))
+
+    def test_failure_is_recorded(self):
+        def work(job):
+            raise ValueError("bad input")
+
+        job = self.runner.submit(work)
+        job.wait(5)
+        self.assertEqual(job.status, FAILED)
+        self.assertIsInstance(job.error, ValueError)
+
+    def test_prune_forgets_finished_jobs(self):
+        job = self.runner.submit(lambda job: None)
+        job.wait(5)
+        self.runner.prune()
+        self.assertIsNone(self.runner.get(job.id))
+
+    def test_submit_forgets_finished_jobs(self):
+        finished = self.runner.submit(lambda job: None)
+        finished.wait(5)
+        release = threading.Event()
+        running = self.runner.submit(lambda job: release.wait(5))
+        self.runner.submit(lambda job: None)
+
+        self.assertIsNone(self.runner.get(finished.id))
+        self.assertIs(self.runner.get(running.id), running)
+        release.set()
+        running.wait(5)
+
+    def test_resize_keeps_running_jobs(self):
+        release = threading.Event()
+        running = self.runner.submit(lambda job: release.wait(5))
+        self.runner.resize(4)
+        self.assertEqual(self.runner.max_workers, 4)
+
+        barrier = threading.Barrier(4, timeout=5)
+        jobs = [self.runner.submit(lambda job: barrier.wait()) for _ in range(4)]
+        for job in jobs:
+            job.wait(5)
+            self.assertEqual(job.status, DONE)
+        release.set()
+        running.wait(5)
+        self.assertEqual(running.status, DONE)
+
+if __name__ == '__main__':
+    unittest.main()
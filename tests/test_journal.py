@@ -0,0 +1,137 @@
+import unittest
+import os
+import shutil
+import tempfile
+from datetime import date
+from sqlalchemy import event, select
+from sqlalchemy.exc import SQLAlchemyError
+from app.database import (
+    configure_engine, dispose_engine, init_db, session_scope, add_mentorship_session,
+    get_month_summary, get_sessions_for_day, Journal, AppliedOperation
+)
+from app.database.cache import month_cache
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_url = f"sqlite:///{os.path.join(self.tmp_dir, 'planner.db')}"
+        self.engine = configure_engine(self.db_url)
+        init_db()
+        self.journal = Journal(os.path.join(self.tmp_dir, "journal.db"))
+        month_cache.clear()
+
+    def tearDown(self):
+        self.journal.close()
+        dispose_engine()
+        shutil.rmtree(self.tmp_dir)
+
+    def record_add(self, d, group="Group 1", hours=1):
+        return self.journal.record(
+            "add", log_date=d, group_name=group, category="Code Review", activity="Pairing", hours=hours, minutes=0
+        )
+
+    def sessions(self, d):
+        with session_scope() as db:
+            return [(s.group_name, s.duration_total_minutes) for s in get_sessions_for_day(db, d)]
+
+    def test_records_while_unreachable_and_replays_later(self):
+        d = date(2024, 3, 1)
+        configure_engine("sqlite:////nonexistent/planner.db")
+        self.record_add(d)
+        self.assertEqual(self.journal.pending_sessions(d)[0]["group_name"], "Group 1")
+        self.assertEqual(self.journal.pending_dates(), {d})
+        with self.assertRaises(SQLAlchemyError):
+            self.journal.replay()
+        self.assertEqual(self.journal.pending_count(), 1)
+
+        configure_engine(self.db_url)
+        self.assertEqual(self.journal.replay(), 1)
+        self.assertEqual(self.journal.pending_count(), 0)
+        self.assertEqual(self.sessions(d), [("Group 1", 60)])
+
+    def test_replay_migrates_a_database_created_while_offline(self):
+        d = date(2024, 3, 1)
+        self.record_add(d)
+        # init_db() never ran against this database
+        configure_engine(f"sqlite:///{os.path.join(self.tmp_dir, 'new.db')}")
+
+        self.assertEqual(self.journal.replay(), 1)
+        self.assertEqual(self.sessions(d), [("Group 1", 60)])
+
+    def test_replay_applies_in_order_and_is_idempotent(self):
+        d = date(2024, 3, 1)
+        with session_scope() as db:
+            session_id = add_mentorship_session(db, d, "Group 1", "Code Review", "Pairing", 1, 0).id
+        edit = dict(session_id=session_id, category="Code Review", activity="Pairing", minutes=0)
+        first = self.journal.record("update", group_name="Group 2", hours=2, **edit)
+        self.record_add(d, "Group 3")
+        self.journal.record("update", group_name="Group 4", hours=3, **edit)
+        # The first update was applied before the process stopped, but left in the journal
+        with session_scope() as db:
+            db.add(AppliedOperation(key=first))
+            db.commit()
+
+        self.assertEqual(self.journal.replay(), 2)
+        self.assertEqual(self.sessions(d), [("Group 4", 180), ("Group 3", 60)])
+        # Keys are not kept once their entries have left the journal
+        with session_scope() as db:
+            self.assertEqual(db.scalars(select(AppliedOperation.key)).all(), [])
+
+    def test_failing_entry_is_set_aside(self):
+        d = date(2024, 3, 1)
+        self.record_add(d, "Group 1")
+        # Missing fields fail on every replay
+        bad = self.journal.record("update", session_id=1, hours=1, minutes=0)
+        self.record_add(d, "Group 2")
+
+        with self.assertLogs("app.database.journal", "ERROR"):
+            self.assertEqual(self.journal.replay(), 2)
+        self.assertEqual(self.sessions(d), [("Group 1", 60), ("Group 2", 60)])
+        self.assertEqual(self.journal.pending_count(), 0)
+        failed = self.journal.failed()
+        self.assertEqual([(f.key, f.op) for f in failed], [(bad, "update")])
+        self.assertIn("KeyError", failed[0].error)
+
+    def test_constraint_violation_is_set_aside(self):
+        d = date(2024, 3, 1)
+        # Passes record() but violates NOT NULL, which only the database checks
+        bad = self.record_add(d, None)
+        self.record_add(d, "Group 2")
+
+        with self.assertLogs("app.database.journal", "ERROR"):
+            self.assertEqual(self.journal.replay(), 1)
+        self.assertEqual(self.sessions(d), [("Group 2", 60)])
+        self.assertEqual(self.journal.pending_count(), 0)
+        failed = self.journal.failed()
+        self.assertEqual([f.key for f in failed], [bad])
+        self.assertIn("IntegrityError", failed[0].error)
+
+    def test_replay_batches_transactions(self):
+        d = date(2024, 3, 1)
+        for n in range(7):
+            self.record_add(d, f"Group {n}")
+        commits = []
+        event.listen(self.engine, "commit", lambda conn: commits.append(conn))
+
+        self.assertEqual(self.journal.replay(batch_size=3), 7)
+        # One per batch, then one pruning the applied keys
+        self.assertEqual(len(commits), 4)
+        self.assertEqual(len(self.sessions(d)), 7)
+
+    def test_replay_invalidates_cached_month(self):
+        d = date(2024, 3, 1)
+        with session_scope() as db:
+            self.assertEqual(get_month_summary(db, 2024, 3), {})
+            self.record_add(d)
+            self.journal.replay()
+            self.assertIn(d, get_month_summary(db, 2024, 3))
+
+    def test_rejects_bad_entries_when_recorded(self):
+        with self.assertRaises(ValueError):
+            self.record_add(date(2024, 3, 1), hours=-1)
+        with self.assertRaises(ValueError):
+            self.journal.record("delete", session_id=1)
+        self.assertEqual(self.journal.pending_count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
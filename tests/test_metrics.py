@@ -0,0 +1,84 @@
+import unittest
+import asyncio
+import json
+import os
+import tempfile
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app import metrics
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        metrics.metrics.reset()
+        metrics.enable()
+
+    def tearDown(self):
+        metrics.disable()
+        metrics.metrics.reset()
+        self.engine.dispose()
+
+    def query(self, n=1):
+        with self.engine.connect() as conn:
+            for _ in range(n):
+                conn.execute(text("SELECT 1"))
+
+    def test_queries_are_attributed_to_outermost_operation(self):
+        @metrics.timed("inner")
+        def inner():
+            self.query(2)
+
+        @metrics.timed()
+        def load_month():
+            self.query()
+            inner()
+
+        load_month()
+        load_month()
+        self.query()
+
+        snapshot = metrics.metrics.snapshot()
+        self.assertEqual(list(snapshot["operations"]), ["load_month"])
+        stats = snapshot["operations"]["load_month"]
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["avg_queries"], 3)
+        self.assertGreaterEqual(stats["avg_ms"], stats["avg_query_ms"])
+        self.assertEqual(snapshot["unattributed"]["queries"], 1)
+
+    def test_async_operations_include_async_engine_queries(self):
+        @metrics.timed("async_load")
+        async def async_load():
+            engine = create_async_engine("sqlite+aiosqlite://")
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            await engine.dispose()
+
+        asyncio.run(async_load())
+        self.assertEqual(metrics.metrics.snapshot()["operations"]["async_load"]["avg_queries"], 1)
+
+    def test_slow_queries_are_logged_as_json(self):
+        with patch.object(metrics, "SLOW_QUERY_MS", 0), self.assertLogs("app.metrics", "WARNING") as logs:
+            metrics.timed("slow")(self.query)()
+        entry = json.loads(logs.output[0].split(":", 2)[2])
+        self.assertEqual(entry["event"], "slow_query")
+        self.assertEqual(entry["operation"], "slow")
+        self.assertEqual(entry["statement"], "SELECT 1")
+        self.assertEqual(len(metrics.metrics.snapshot()["slow_queries"]), 1)
+
+    def test_dump_writes_snapshot(self):
+        metrics.timed("dumped")(self.query)()
+        path = os.path.join(tempfile.mkdtemp(), "metrics.json")
+        metrics.metrics.dump(path)
+        with open(path) as f:
+            self.assertIn("dumped", json.load(f)["operations"])
+
+    def test_disabled_records_nothing(self):
+        metrics.disable()
+        metrics.timed("ignored")(self.query)()
+        snapshot = metrics.metrics.snapshot()
+        self.assertEqual(snapshot["operations"], {})
+        self.assertEqual(snapshot["unattributed"]["queries"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
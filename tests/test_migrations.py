@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import patch
+from sqlalchemy import create_engine, inspect, text
+from app.database.migrations import SCHEMA_VERSION, current_version, migrate
+from app.database.rollup import check_day_totals
+from app.database.search import search
+from sqlalchemy.orm import Session
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite:///:memory:')
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def index_names(self):
+        return {index["name"] for index in inspect(self.engine).get_indexes("mentorship_sessions")}
+
+    def test_new_database_is_created_current(self):
+        self.assertIsNone(current_version(self.engine))
+        migrate(self.engine)
+
+        self.assertEqual(current_version(self.engine), SCHEMA_VERSION)
+        self.assertTrue(inspect(self.engine).has_table("day_totals"))
+        self.assertIn("ix_mentorship_sessions_group_name_day_log_id", self.index_names())
+
+    def test_current_schema_skips_reflection(self):
+        migrate(self.engine)
+        with patch("app.database.migrations.inspect") as inspect_mock:
+            self.assertEqual(migrate(self.engine), [])
+        inspect_mock.assert_not_called()
+
+    def test_unversioned_database_is_upgraded(self):
+        # Schema as created by create_all before versioning: no rollups, no indexes
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE day_logs (id INTEGER PRIMARY KEY, date DATE NOT NULL UNIQUE, notes TEXT)"))
+            conn.execute(text(
+                "CREATE TABLE mentorship_sessions (id INTEGER PRIMARY KEY, "
+                "day_log_id INTEGER NOT NULL REFERENCES day_logs(id), group_name VARCHAR NOT NULL, "
+                "category VARCHAR NOT NULL, activity_description TEXT, "
+                "duration_hours INTEGER, duration_minutes INTEGER)"
+            ))
+            conn.execute(text("INSERT INTO day_logs (id, date) VALUES (1, '2024-01-02')"))
+            conn.execute(text(
+                "INSERT INTO mentorship_sessions "
+                "(day_log_id, group_name, category, activity_description, duration_hours, duration_minutes) "
+                "VALUES (1, 'G1', 'Code Review', 'Pairing on the importer', 0, 90)"
+            ))
+
+        self.assertEqual(migrate(self.engine), list(range(1, SCHEMA_VERSION + 1)))
+        self.assertEqual(current_version(self.engine), SCHEMA_VERSION)
+        self.assertIn("ix_mentorship_sessions_day_log_id_group_name", self.index_names())
+        with Session(self.engine) as db:
+            self.assertEqual(check_day_totals(db), [])
+            self.assertEqual([hit.group_name for hit in search(db, "import")], ["G1"])
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT session_count, total_minutes FROM day_totals")).all(), [(1, 90)])
+            self.assertEqual(
+                conn.execute(text(
+                    "SELECT duration_total_minutes, duration_hours, duration_minutes FROM mentorship_sessions"
+                )).all(),
+                [(90, 1, 30)]
+            )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from app.database import configure_engine, dispose_engine, init_db, session_scope, DayLog, MentorshipSession
+from populate_calendar import generate_day_sessions, parse_args, populate, split_range
+
+class TestPopulateCalendar(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        configure_engine(f"sqlite:///{os.path.join(self.tmp_dir, 'populate.db')}")
+        init_db()
+
+    def tearDown(self):
+        dispose_engine()
+        shutil.rmtree(self.tmp_dir)
+
+    def snapshot(self):
+        with session_scope() as db:
+            return sorted(db.query(
+                DayLog.date,
+                MentorshipSession.group_name,
+                MentorshipSession.category,
+                MentorshipSession.duration_hours,
+                MentorshipSession.duration_minutes
+            ).join(MentorshipSession.day_log).all())
+
+    def test_generation_is_deterministic(self):
+        day = date(2024, 3, 5)
+        groups = ["Group 1", "Group 2"]
+        self.assertEqual(
+            generate_day_sessions(42, day, 2.5, groups),
+            generate_day_sessions(42, day, 2.5, groups)
+        )
+
+    def test_split_range_covers_every_day(self):
+        shards = split_range(date(2024, 1, 1), date(2024, 1, 10), 3)
+        self.assertEqual(shards[0][0], date(2024, 1, 1))
+        self.assertEqual(shards[-1][1], date(2024, 1, 10))
+        for (_, prev_end), (next_start, _) in zip(shards, shards[1:]):
+            self.assertEqual(prev_end + timedelta(days=1), next_start)
+
+    def test_populate_replaces_range_reproducibly(self):
+        args = (date(2024, 1, 1), date(2024, 2, 29), {5, 6}, 2.0, ["Group 1", "Group 2"])
+        count = populate(*args, seed=7, chunk_size=10)
+        first = self.snapshot()
+        populate(*args, seed=7, chunk_size=1000)
+
+        self.assertEqual(len(first), count)
+        self.assertEqual(self.snapshot(), first)
+        self.assertTrue(all(d.weekday() < 5 for d, *_ in first))
+
+    def test_workers_match_single_process(self):
+        args = (date(2024, 1, 1), date(2024, 3, 31), {5, 6}, 2.0, ["Group 1", "Group 2"])
+        count = populate(*args, seed=7, workers=1)
+        single = self.snapshot()
+        self.assertEqual(populate(*args, seed=7, workers=3), count)
+
+        self.assertEqual(self.snapshot(), single)
+        self.assertFalse(os.path.exists("planner.db"))
+
+    def test_parse_args(self):
+        args = parse_args([
+            "--start", "2024-01-01", "--end", "2024-12-31",
+            "--groups", "3", "--sessions-per-day", "2-4", "--exclude-weekdays", "6"
+        ])
+        self.assertEqual(args.group_names, ["Group 1", "Group 2", "Group 3"])
+        self.assertEqual((args.min_sessions, args.max_sessions), (2, 4))
+        self.assertEqual(args.excluded_weekdays, {6})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from datetime import date
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.database.models import Base
+from app.database.crud import add_mentorship_session
+from app.reports import ReportRow, totals_by, overall_totals, summary_report, format_minutes
+
+class TestReports(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        add_mentorship_session(self.db, date(2023, 12, 31), "G1", "Code Review", "A", 1, 0)
+        add_mentorship_session(self.db, date(2024, 1, 1), "G1", "1:1 Mentoring", "B", 0, 30)
+        add_mentorship_session(self.db, date(2024, 1, 1), "G2", "Code Review", "C", 2, 15)
+        add_mentorship_session(self.db, date(2024, 2, 5), "G2", "Code Review", "D", 0, 45)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_totals_by_group(self):
+        self.assertEqual(totals_by(self.db, "group"), [
+            ReportRow("G1", 2, 90),
+            ReportRow("G2", 2, 180),
+        ])
+
+    def test_totals_by_category_with_range(self):
+        rows = totals_by(self.db, "category", date(2024, 1, 1), date(2024, 1, 31))
+        self.assertEqual(rows, [ReportRow("1:1 Mentoring", 1, 30), ReportRow("Code Review", 1, 135)])
+
+    def test_totals_by_period(self):
+        self.assertEqual(totals_by(self.db, "day")[1], ReportRow(date(2024, 1, 1), 2, 165))
+        self.assertEqual(
+            [row.key for row in totals_by(self.db, "week")],
+            ["2023-W52", "2024-W01", "2024-W06"]
+        )
+        self.assertEqual(totals_by(self.db, "month"), [
+            ReportRow("2023-12", 1, 60),
+            ReportRow("2024-01", 2, 165),
+            ReportRow("2024-02", 1, 45),
+        ])
+
+    def test_each_report_is_one_query(self):
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        for dimension in ("group", "category", "day", "week", "month"):
+            totals_by(self.db, dimension)
+        self.assertEqual(len(statements), 5)
+
+    def test_overall_totals(self):
+        overall = overall_totals(self.db)
+        self.assertEqual((overall.session_count, overall.total_minutes), (4, 270))
+        self.assertEqual(overall.average_minutes, 67.5)
+        self.assertEqual(overall_totals(self.db, date(2025, 1, 1)).average_minutes, 0.0)
+
+    def test_summary_report(self):
+        report = summary_report(self.db)
+        self.assertEqual(list(report), ["overall", "group", "category", "week"])
+
+    def test_unknown_dimension(self):
+        with self.assertRaises(ValueError):
+            totals_by(self.db, "year")
+
+    def test_format_minutes(self):
+        self.assertEqual(format_minutes(135), "2h 15m")
+        self.assertEqual(format_minutes(67.5), "1h 8m")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database.models import Base, DayTotal, DayCategoryTotal, MentorshipSession
+from app.database.crud import (
+    add_mentorship_session,
+    add_mentorship_sessions_bulk,
+    delete_session,
+    delete_sessions_bulk,
+    get_day_log,
+    update_mentorship_session
+)
+from app.database.cache import month_cache
+from app.database.rollup import rebuild_day_totals, check_day_totals
+
+class TestDayTotals(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        month_cache.clear()
+
+    def tearDown(self):
+        self.db.close()
+
+    def day_total(self, d):
+        log = get_day_log(self.db, d)
+        total = self.db.get(DayTotal, log.id)
+        return (total.session_count, total.total_minutes) if total else None
+
+    def category_totals(self, d):
+        log = get_day_log(self.db, d)
+        return {
+            t.category: (t.session_count, t.total_minutes)
+            for t in self.db.query(DayCategoryTotal).filter_by(day_log_id=log.id)
+        }
+
+    def test_every_write_path_keeps_totals_consistent(self):
+        d = date(2024, 3, 1)
+        first = add_mentorship_session(self.db, d, "G1", "Code Review", "A", 1, 0)
+        second = add_mentorship_session(self.db, d, "G2", "Code Review", "B", 0, 30)
+        self.assertEqual(self.day_total(d), (2, 90))
+
+        update_mentorship_session(self.db, second.id, "G2", "1:1 Mentoring", "B", 0, 45)
+        self.assertEqual(self.category_totals(d), {"Code Review": (1, 60), "1:1 Mentoring": (1, 45)})
+
+        update_mentorship_session(self.db, first.id, "G1", "Code Review", "A", 2, 0)
+        self.assertEqual(self.day_total(d), (2, 165))
+
+        delete_session(self.db, second.id)
+        self.assertEqual(self.category_totals(d), {"Code Review": (1, 120)})
+
+        ids = add_mentorship_sessions_bulk(self.db, [
+            {"log_date": d, "group_name": "G3", "category": "Other", "activity": "C", "hours": 0, "minutes": 15},
+            {"log_date": date(2024, 3, 2), "group_name": "G3", "category": "Other", "activity": "D", "hours": 1, "minutes": 0},
+        ])
+        self.assertEqual(self.day_total(d), (2, 135))
+
+        delete_sessions_bulk(self.db, session_ids=ids)
+        self.assertIsNone(self.day_total(date(2024, 3, 2)))
+
+        delete_sessions_bulk(self.db, start_date=d, end_date=d)
+        self.assertIsNone(self.day_total(d))
+        self.assertEqual(check_day_totals(self.db), [])
+
+    def test_deleting_day_log_removes_totals(self):
+        d = date(2024, 3, 4)
+        add_mentorship_session(self.db, d, "G1", "Code Review", "A", 1, 0)
+        self.db.delete(get_day_log(self.db, d))
+        self.db.commit()
+        self.assertEqual(self.db.query(DayTotal).count(), 0)
+        self.assertEqual(self.db.query(DayCategoryTotal).count(), 0)
+
+    def test_check_detects_drift_and_rebuild_repairs_it(self):
+        d = date(2024, 3, 5)
+        add_mentorship_session(self.db, d, "G1", "Code Review", "A", 1, 0)
+        # A write that bypasses the CRUD layer leaves the rollup stale
+        self.db.add(MentorshipSession(
+            day_log_id=get_day_log(self.db, d).id, group_name="G2", category="Other",
+            duration_total_minutes=20
+        ))
+        self.db.commit()
+        self.assertEqual(check_day_totals(self.db), [d])
+
+        self.assertEqual(rebuild_day_totals(self.db), 1)
+        self.assertEqual(check_day_totals(self.db), [])
+        self.assertEqual(self.day_total(d), (2, 80))
+
+if __name__ == '__main__':
+    unittest.main()
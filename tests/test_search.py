@@ -0,0 +1,63 @@
+import unittest
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database.models import Base
+from app.database.crud import (
+    add_mentorship_session,
+    add_mentorship_sessions_bulk,
+    delete_session,
+    update_day_log_notes,
+    update_mentorship_session
+)
+from app.database.cache import month_cache
+from app.database.search import search
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        month_cache.clear()
+
+    def tearDown(self):
+        self.db.close()
+        Base.metadata.drop_all(self.engine)
+
+    def test_matches_sessions_and_notes_by_prefix(self):
+        add_mentorship_session(self.db, date(2024, 1, 2), "Alpha Team", "Code Review", "Reviewed the parser refactor", 1, 0)
+        add_mentorship_session(self.db, date(2024, 1, 3), "Beta", "1:1 Mentoring", "Career chat", 0, 30)
+        update_day_log_notes(self.db, date(2024, 1, 3), "Parser design discussion")
+
+        hits = search(self.db, "pars")
+        self.assertEqual({(hit.kind, hit.date) for hit in hits}, {("session", date(2024, 1, 2)), ("note", date(2024, 1, 3))})
+        self.assertEqual([hit.group_name for hit in search(self.db, "alpha")], ["Alpha Team"])
+        # Every word must match
+        self.assertEqual(search(self.db, "alpha career"), [])
+        # Search syntax is treated as plain words
+        self.assertEqual(len(search(self.db, '"parser*')), 2)
+        self.assertEqual(search(self.db, "  "), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        session = add_mentorship_session(self.db, date(2024, 2, 1), "G1", "Other", "Planning sprint", 1, 0)
+        update_mentorship_session(self.db, session.id, "G1", "Other", "Retrospective", 1, 0)
+        self.assertEqual(search(self.db, "sprint"), [])
+        self.assertEqual([hit.id for hit in search(self.db, "retro")], [session.id])
+
+        delete_session(self.db, session.id)
+        self.assertEqual(search(self.db, "retro"), [])
+
+    def test_results_are_paginated(self):
+        add_mentorship_sessions_bulk(self.db, [
+            {"log_date": date(2024, 3, 1 + i), "group_name": f"G{i}", "category": "Other",
+             "activity": "Weekly standup", "hours": 0, "minutes": 15}
+            for i in range(25)
+        ])
+        first = search(self.db, "standup", limit=10)
+        second = search(self.db, "standup", limit=10, offset=10)
+        rest = search(self.db, "standup", limit=10, offset=20)
+        self.assertEqual((len(first), len(second), len(rest)), (10, 10, 5))
+        self.assertEqual(len({hit.id for hit in first + second + rest}), 25)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded only when an export runs
+DEFERRED_MODULES = {"openpyxl", "pyarrow", "pandas", "numpy"}
+
+def import_times(module: str) -> dict:
+    """
+    Imports module in a fresh interpreter with -X importtime.
+
+    Returns:
+        dict: Cumulative import time in microseconds per module name.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+class TestStartup(unittest.TestCase):
+    def test_heavy_export_dependencies_are_deferred(self):
+        times = import_times("main")
+        self.assertIn("app.gui", times)
+        self.assertFalse(DEFERRED_MODULES & times.keys(), "heavy modules imported at startup")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,8 @@
-from app.database import get_db
+from app.database import session_scope
 from app.database.models import DayLog, MentorshipSession
 
 def verify_group_names():
-    db_gen = get_db()
-    db = next(db_gen)
-    
-    try:
+    with session_scope() as db:
         # Get all sessions
         sessions = db.query(MentorshipSession).all()
         
@@ -19,9 +16,6 @@ def verify_group_names():
             print("✓ All sessions use 'Group 26'")
         else:
             print("✗ Some sessions use different group names!")
-            
-    finally:
-        db.close()
 
 if __name__ == "__main__":
     verify_group_names()